@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark
+    ~~~~~~~~~
+
+    Micro-benchmarks for Magrathea's performance critical code paths.
+
+    Each module named ``bench_<topic>`` provides a number of functions named ``bench_<case>``,
+    each returning a tuple of the measured value and its unit. Run them all using
+    ``scripts/runbench.py``.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import timeit
+
+
+def per_call(func, number=100000, repeat=5):
+    """
+    Measure the cost of calling a function.
+
+    :param func:       callable taking no arguments
+    :param int number: number of calls per measurement
+    :param int repeat: number of measurements
+    :returns: the cost of one call in nanoseconds (best of all measurements)
+    :rtype: float
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
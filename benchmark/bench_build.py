@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_build
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Full builds of a 10k-entry feed (see :py:mod:`benchmark.corpus`) into pages of
+    25 entries, rendered by the default theme.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import gc
+import shutil
+import tempfile
+import time
+import tracemalloc
+from feedparser import FeedParserDict
+from .corpus import make_entries
+from magrathea.core.build import Builder
+from magrathea.core.feed.feed import Feed
+from magrathea.core.theme import Theme
+from magrathea.core.timeline import Timeline
+
+#: number of entries in the corpus
+COUNT = 10000
+
+
+def _build(measure):
+    """
+    Build all pages of the corpus into a temporary directory.
+
+    :param measure: callable taking the build function and returning the figure of interest
+    :returns: the figure returned by *measure*
+    """
+    feed = Feed(uri='http://example.org/feed.xml')
+    feed._update(FeedParserDict(feed=FeedParserDict(title=u'Benchmark'), entries=make_entries(COUNT)))
+    # the feed counts as fetched already, just like after a run of the fetcher
+    feed._update_flag = True
+    directory = tempfile.mkdtemp()
+    try:
+        builder = Builder(directory, Theme(), paginate=25)
+        return measure(lambda: builder.build(Timeline([feed], policy='none'), force=True))
+    finally:
+        shutil.rmtree(directory)
+
+
+def _peak(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        build()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _duration(build):
+    start = time.time()
+    build()
+    return time.time() - start
+
+
+def bench_build_peak():
+    """Peak memory allocated while building 400 pages"""
+    return _build(_peak) / 1024.0, 'KiB'
+
+
+def bench_build_time():
+    """Time spent on building 400 pages"""
+    return _build(_duration) * 1000, 'ms'
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_convert
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Cost of converting the text values of a 10k-entry corpus (see :py:mod:`benchmark.corpus`).
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from . import per_call
+from .corpus import make_entries, make_values
+from magrathea.core.feed.entry import Entry
+from magrathea.utils.convert import to_str, to_bytes, to_str_list, to_bytes_list
+
+#: the corpus, created on first use
+_corpus = {}
+
+
+def _get_entries():
+    if 'entries' not in _corpus:
+        _corpus['entries'] = make_entries(10000)
+    return _corpus['entries']
+
+
+def _get_values():
+    if 'values' not in _corpus:
+        _corpus['values'] = make_values(_get_entries())
+    return _corpus['values']
+
+
+def bench_to_str():
+    """to_str() on all 40k values, one by one"""
+    values = _get_values()
+    return per_call(lambda: [to_str(value) for value in values], number=5, repeat=3) / 1e6, 'ms'
+
+
+def bench_to_bytes():
+    """to_bytes() on all 40k values, one by one"""
+    values = _get_values()
+    return per_call(lambda: [to_bytes(value) for value in values], number=5, repeat=3) / 1e6, 'ms'
+
+
+def bench_entry_fields():
+    """Entry title, author and body of 10k entries"""
+    entries = [Entry(entry) for entry in _get_entries()]
+
+    def read():
+        for entry in entries:
+            entry.title
+            entry.author
+            entry.body
+
+    return per_call(read, number=5, repeat=3) / 1e6, 'ms'
+
+
+def bench_to_str_list():
+    """to_str_list() on all 40k values at once"""
+    values = _get_values()
+    return per_call(lambda: to_str_list(values), number=5, repeat=3) / 1e6, 'ms'
+
+
+def bench_to_bytes_list():
+    """to_bytes_list() on all 40k values at once"""
+    values = _get_values()
+    return per_call(lambda: to_bytes_list(values), number=5, repeat=3) / 1e6, 'ms'
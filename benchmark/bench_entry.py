@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_entry
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Cost of creating and updating 10k entries (see :py:mod:`benchmark.corpus`), and of reading
+    their derived values the way a template does when rendering a page.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from . import per_call
+from .corpus import make_entries
+from magrathea.core.feed.entry import Entry
+
+#: the corpus, created on first use
+_corpus = {}
+
+
+def _get_entries():
+    if 'entries' not in _corpus:
+        _corpus['entries'] = [Entry(entry) for entry in make_entries(10000)]
+    return _corpus['entries']
+
+
+def bench_body():
+    """Entry body of 10k entries"""
+    entries = _get_entries()
+
+    def read():
+        for entry in entries:
+            entry.body
+
+    return per_call(read, number=5, repeat=3) / 1e6, 'ms'
+
+
+def bench_dates():
+    """Entry local pubdate and two formatted dates of 10k entries"""
+    entries = _get_entries()
+
+    def read():
+        for entry in entries:
+            entry.pubdate_local
+            entry.get_pubdate_local('%Y-%m-%d %H:%M')
+            entry.get_pubdate_gmt('%a, %d %b %Y %H:%M:%S GMT')
+
+    return per_call(read, number=5, repeat=3) / 1e6, 'ms'
+
+
+def bench_parse():
+    """Entry creation of 10k entries"""
+    raw = make_entries(10000)
+
+    def parse():
+        for entry in raw:
+            Entry(entry)
+
+    return per_call(parse, number=3, repeat=3) / 1e6, 'ms'
+
+
+def bench_update_unchanged():
+    """Entry update of 10k entries with unchanged information"""
+    raw = make_entries(10000)
+    entries = [Entry(entry) for entry in raw]
+    pairs = list(zip(entries, raw))
+
+    def update():
+        for entry, source in pairs:
+            entry.update(source)
+
+    return per_call(update, number=5, repeat=3) / 1e6, 'ms'
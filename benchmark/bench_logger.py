@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_logger
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Cost of logging a debug message into a file, as seen by the caller.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+import tempfile
+from . import per_call
+from magrathea.cli.logger import Logger
+
+
+def _log(background):
+    """
+    Measure the cost of logging a debug message into a temporary file.
+
+    :param bool background: whether to log in background mode
+    :returns: the cost of one call in nanoseconds
+    """
+    fd, name = tempfile.mkstemp()
+    os.close(fd)
+    logger = Logger.get_instance()
+    level = logger.level
+    logger.file = name
+    logger.type = 'file'
+    logger.level = 'debug'
+    logger.background = background
+    try:
+        return per_call(lambda: logger.log_debug("fetched http://example.org/feed.xml"), number=20000, repeat=3)
+    finally:
+        logger.background = False
+        logger.type = 'term'
+        logger.level = level
+        os.unlink(name)
+
+
+def bench_log():
+    """Logging a debug message into a file"""
+    return _log(False), 'ns'
+
+
+def bench_log_background():
+    """Logging a debug message into a file in background mode"""
+    return _log(True), 'ns'
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_lookup
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Per-lookup cost of :py:class:`~magrathea.utils.dynamic.DynamicIterable` and its
+    descendants :py:class:`~magrathea.conf.ApplicationConf` and :py:class:`~magrathea.core.cache.Cache`.
+
+    As a baseline, the same lookups are measured with the hooks run as before hook chains were
+    composed upon registration: on each access, the hook list is looked up and looped over, and
+    the item is accessed through :py:class:`UserDict`.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+from . import per_call
+from magrathea.conf import get_conf, ApplicationConf
+from magrathea.core.cache import Cache
+from magrathea.utils.dynamic import DynamicIterable
+
+try:
+    from collections import UserDict
+except ImportError:
+    from UserDict import UserDict
+
+
+class LinearHooks(object):
+    """
+    Mix-in running hooks by scanning their lists on each access, as done before hook chains were composed
+    """
+
+    def _run_hooks(self, hook_type, key, value):
+        chain = None
+        if hook_type in self._hooks.keys():
+            chain = self._hooks[hook_type]
+        if chain:
+            for hook in chain:
+                key, value = hook(key, value)
+        return key, value
+
+    def __setitem__(self, key, item, **kwargs):
+        key, item = self._run_hooks('pre-set', key, item)
+        UserDict.__setitem__(self, key, item)
+        self._run_hooks('post-set', key, item)
+
+    def __getitem__(self, key):
+        key, item = self._run_hooks('pre-get', key, None)
+        item = UserDict.__getitem__(self, key)
+        key, item = self._run_hooks('post-get', key, item)
+        return item
+
+    def __contains__(self, key):
+        key, item = self._run_hooks('pre-get', key, None)
+        return UserDict.__contains__(self, key)
+
+
+class LinearDynamicIterable(LinearHooks, DynamicIterable):
+    """:py:class:`~magrathea.utils.dynamic.DynamicIterable` running its hooks by scanning their lists"""
+
+
+class LinearConf(LinearHooks, ApplicationConf._decorated):
+    """:py:class:`~magrathea.conf.ApplicationConf` running its hooks by scanning their lists"""
+
+
+class LinearCache(LinearHooks, Cache._decorated):
+    """:py:class:`~magrathea.core.cache.Cache` running its hooks by scanning their lists"""
+
+
+def _get_directory():
+    """
+    Get a temporary directory, removed on exit
+    """
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, True)
+    return directory
+
+
+def _get_cache():
+    """
+    Get the cache, backed by a temporary database
+    """
+    if not Cache.has_instance():
+        Cache.get_instance(os.path.join(_get_directory(), 'cache'))
+    cache = Cache.get_instance()
+    cache['bench'] = 'bench data'
+    return cache
+
+
+def _get_linear_cache():
+    """
+    Get a cache running its hooks by scanning their lists, backed by a temporary database
+    """
+    cache = LinearCache(os.path.join(_get_directory(), 'cache'))
+    atexit.register(cache.close)
+    cache['bench'] = 'bench data'
+    return cache
+
+
+def bench_get_conf():
+    """get_conf('CHARSET')"""
+    return per_call(lambda: get_conf('CHARSET')), 'ns'
+
+
+def bench_conf_getitem():
+    """ApplicationConf['CHARSET']"""
+    conf = ApplicationConf.get_instance()
+    return per_call(lambda: conf['CHARSET']), 'ns'
+
+
+def bench_conf_contains():
+    """'CHARSET' in ApplicationConf"""
+    conf = ApplicationConf.get_instance()
+    return per_call(lambda: 'CHARSET' in conf), 'ns'
+
+
+def bench_cache_getitem():
+    """Cache['bench'] (held in memory)"""
+    cache = _get_cache()
+    return per_call(lambda: cache['bench']), 'ns'
+
+
+def bench_cache_contains():
+    """'bench' in Cache (held in memory)"""
+    cache = _get_cache()
+    return per_call(lambda: 'bench' in cache), 'ns'
+
+
+def bench_dynamic_getitem():
+    """DynamicIterable['key'] (no hooks)"""
+    obj = DynamicIterable({'key': 'value'})
+    return per_call(lambda: obj['key']), 'ns'
+
+
+def bench_dynamic_setitem():
+    """DynamicIterable['key'] = value (no hooks)"""
+    obj = DynamicIterable()
+    return per_call(lambda: obj.__setitem__('key', 'value')), 'ns'
+
+
+def bench_get_conf_baseline():
+    """get_conf('CHARSET') (baseline)"""
+    conf = LinearConf()
+
+    def get_conf_baseline(key):
+        # get_conf as implemented before configuration snapshots
+        if key.upper() in conf:
+            return conf[key.upper()]
+        return None
+
+    return per_call(lambda: get_conf_baseline('CHARSET')), 'ns'
+
+
+def bench_conf_getitem_baseline():
+    """ApplicationConf['CHARSET'] (baseline)"""
+    conf = LinearConf()
+    return per_call(lambda: conf['CHARSET']), 'ns'
+
+
+def bench_conf_contains_baseline():
+    """'CHARSET' in ApplicationConf (baseline)"""
+    conf = LinearConf()
+    return per_call(lambda: 'CHARSET' in conf), 'ns'
+
+
+def bench_cache_getitem_baseline():
+    """Cache['bench'] (held in memory, baseline)"""
+    cache = _get_linear_cache()
+    return per_call(lambda: cache['bench']), 'ns'
+
+
+def bench_cache_contains_baseline():
+    """'bench' in Cache (held in memory, baseline)"""
+    cache = _get_linear_cache()
+    return per_call(lambda: 'bench' in cache), 'ns'
+
+
+def bench_dynamic_getitem_baseline():
+    """DynamicIterable['key'] (no hooks, baseline)"""
+    obj = LinearDynamicIterable({'key': 'value'})
+    return per_call(lambda: obj['key']), 'ns'
+
+
+def bench_dynamic_setitem_baseline():
+    """DynamicIterable['key'] = value (no hooks, baseline)"""
+    obj = LinearDynamicIterable()
+    return per_call(lambda: obj.__setitem__('key', 'value')), 'ns'
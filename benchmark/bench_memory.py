@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_memory
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Memory held by feed entries, measured with :py:mod:`tracemalloc` over a 10k-entry
+    corpus (see :py:mod:`benchmark.corpus`). Since the corpus' strings are shared with the
+    entries, the figures of parsed entries reflect the overhead of the entry representation
+    itself. Entries loaded from the cache own copies of their texts, which account for
+    most of their memory.
+
+    As a baseline, the same entries are measured in the representation used before entries
+    kept their attributes in ``__slots__``: attributes in a per-instance ``__dict__``, and
+    one feed information object per entry.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import gc
+import pickle
+import tracemalloc
+from feedparser import FeedParserDict
+from .corpus import make_entries
+from magrathea.core.feed.feed import Feed
+
+#: number of entries in the corpus
+COUNT = 10000
+
+
+def _measure(build):
+    """
+    Measure the memory allocated by a function and kept alive by its result.
+
+    :param build: callable taking no arguments
+    :returns: tuple of the result and the number of bytes allocated for it
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+class DictFeedInfo(object):
+    """Feed information, represented as before :py:class:`~magrathea.core.feed.info.FeedInfo` used slots"""
+
+    def __init__(self, info):
+        self._author = info.author
+        self._title = info.title
+        self._uri = info.uri
+        self._type = info.type
+
+
+class DictEntry(object):
+    """Entry, represented as before :py:class:`~magrathea.core.feed.entry.Entry` used slots"""
+
+    def __init__(self, entry):
+        for name in ('_id', '_key', '_updated', '_expired', '_link', '_content', '_description', '_title',
+                     '_author', '_fingerprint'):
+            setattr(self, name, getattr(entry, name))
+        self._feed = DictFeedInfo(entry.feed)
+
+
+def _build_feed(entries):
+    feed = Feed(uri='http://example.org/feed.xml')
+    feed._update(FeedParserDict(feed=FeedParserDict(title=u'Benchmark', author=u'Arthur Dent'), entries=entries))
+    return feed
+
+
+def _build_dict_entries(entries):
+    return [DictEntry(entry) for entry in _build_feed(entries)._entries]
+
+
+def bench_feed_entries():
+    """Memory per entry of a feed with 10k entries"""
+    entries = make_entries(COUNT)
+    feed, size = _measure(lambda: _build_feed(entries))
+    return float(size) / COUNT, 'bytes'
+
+
+def bench_feed_entries_unpickled():
+    """Memory per entry of 10k entries from the cache"""
+    data = pickle.dumps(_build_feed(make_entries(COUNT))._entries, 2)
+    loaded, size = _measure(lambda: pickle.loads(data))
+    return float(size) / COUNT, 'bytes'
+
+
+def bench_feed_entries_baseline():
+    """Memory per entry of a feed with 10k entries (baseline)"""
+    entries = make_entries(COUNT)
+    feed, size = _measure(lambda: _build_dict_entries(entries))
+    return float(size) / COUNT, 'bytes'
+
+
+def bench_feed_entries_unpickled_baseline():
+    """Memory per entry of 10k entries from the cache (baseline)"""
+    data = pickle.dumps(_build_dict_entries(make_entries(COUNT)), 2)
+    loaded, size = _measure(lambda: pickle.loads(data))
+    return float(size) / COUNT, 'bytes'
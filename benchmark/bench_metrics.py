@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_metrics
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Cost of instrumentation (see :py:mod:`magrathea.utils.metrics`) added to a trivial function.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from . import per_call
+from magrathea.utils.metrics import Metrics
+
+
+def _plain():
+    pass
+
+
+def _measure(enabled):
+    """
+    Measure the cost a span and a timed function add to a call.
+
+    :param bool enabled: whether metrics are enabled
+    :returns: tuple of the cost of a span and of a timed function in nanoseconds
+    """
+    metrics = Metrics()
+    metrics.enabled = enabled
+    timed = metrics.timed('phase')(_plain)
+
+    def spanned():
+        with metrics.span('phase'):
+            _plain()
+
+    base = per_call(_plain)
+    return per_call(spanned) - base, per_call(timed) - base
+
+
+def bench_span_disabled():
+    """Overhead of a span while metrics are disabled"""
+    return _measure(False)[0], 'ns'
+
+
+def bench_timed_disabled():
+    """Overhead of a timed function while metrics are disabled"""
+    return _measure(False)[1], 'ns'
+
+
+def bench_span_enabled():
+    """Overhead of a span while metrics are enabled"""
+    return _measure(True)[0], 'ns'
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_startup
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Start-up cost of the command line interface, running the ``version`` command in a new
+    interpreter. Import times are taken from the interpreter's ``-X importtime`` output
+    (Python 3.7 or newer).
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+import subprocess
+import sys
+import timeit
+
+#: Magrathea's executable
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'scripts', 'magrathea.py')
+
+#: Command line running the ``version`` command
+COMMAND = [sys.executable, SCRIPT, 'version']
+
+
+def import_times(command=None, repeat=5):
+    """
+    Run a command line with ``-X importtime`` and collect the import times.
+
+    :param list command: command line to run (defaults to :py:data:`COMMAND`)
+    :param int repeat:   number of runs
+    :returns: dictionary mapping each imported module to its cumulative import time
+              in microseconds (best of all runs)
+    """
+    command = list(command or COMMAND)
+    command.insert(1, '-X')
+    command.insert(2, 'importtime')
+    best = {}
+    for __ in range(repeat):
+        output = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE).communicate()[1]
+        for line in output.decode('utf-8', 'replace').splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            __, cumulative, name = line[12:].split('|')
+            name = name.strip()
+            best[name] = min(best.get(name, float('inf')), int(cumulative))
+    return best
+
+
+def bench_import_cli():
+    """Importing magrathea.cli"""
+    return import_times().get('magrathea.cli', 0) / 1000.0, 'ms'
+
+
+def bench_import_modules():
+    """Modules imported running the version command"""
+    return len(import_times(repeat=1)), 'modules'
+
+
+def bench_run_version():
+    """Running the version command"""
+    def run():
+        subprocess.Popen(COMMAND, stdout=subprocess.PIPE, stderr=subprocess.PIPE).communicate()
+    return min(timeit.repeat(run, number=1, repeat=5)) * 1000, 'ms'
+
+
+if __name__ == '__main__':
+    # print the modules taking most of the time, just like -X importtime does
+    times = import_times()
+    for module in sorted(times, key=times.get, reverse=True)[:20]:
+        print("{: >10d} us | {}".format(times[module], module))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.bench_theme
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Cost of setting up the default theme and rendering a first page of 25 entries (see
+    :py:mod:`benchmark.corpus`), as paid once by each process running a build.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import shutil
+import tempfile
+from . import per_call
+from .corpus import make_entries
+from magrathea.core import theme
+from magrathea.core.build import paginate
+from magrathea.core.feed.entry import Entry
+
+
+def _first_render(cache_dir):
+    """
+    Measure setting up a theme and rendering a first page, as a new process would.
+
+    :param str cache_dir: directory for the bytecode cache, or ``None``
+    :returns: cost in milliseconds
+    """
+    page = paginate([Entry(entry) for entry in make_entries(25)], 25)[0]
+
+    def render():
+        # forget the environments set up before, just like a new process
+        theme._environments.clear()
+        theme.Theme(cache_dir=cache_dir).render(page)
+
+    return per_call(render, number=20, repeat=3) / 1e6
+
+
+def bench_compile():
+    """First page rendering, compiling the templates"""
+    return _first_render(None), 'ms'
+
+
+def bench_bytecode_cache():
+    """First page rendering, loading the templates from the bytecode cache"""
+    cache_dir = tempfile.mkdtemp()
+    try:
+        return _first_render(cache_dir), 'ms'
+    finally:
+        shutil.rmtree(cache_dir)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmark.corpus
+    ~~~~~~~~~~~~~~~~
+
+    Synthetic, but realistic corpus of feed entries for benchmarks: titles, authors and
+    HTML contents of typical length, including non-ASCII characters.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import random
+import time
+from feedparser import FeedParserDict
+
+#: words the corpus is made of
+WORDS = (
+    u'planet', u'magrathea', u'feed', u'entry', u'über', u'straße', u'naïve', u'café', u'release',
+    u'python', u'unicode', u'cache', u'build', u'theme', u'größe', u'déjà', u'vu', u'the', u'a', u'of',
+    u'and', u'to', u'in', u'is', u'for', u'on', u'with', u'as', u'by', u'at', u'from', u'über', u'mañana'
+)
+
+#: authors the entries are attributed to
+AUTHORS = (u'Arthur Dent', u'Ford Prefect', u'Zaphod Beeblebrox', u'Trillian', u'Slartibartfast', u'Marvin')
+
+
+def _sentence(rng, length):
+    return u' '.join(rng.choice(WORDS) for __ in range(length))
+
+
+def make_entries(count=10000, seed=42):
+    """
+    Create a corpus of :py:mod:`feedparser` entry objects.
+
+    :param int count: number of entries
+    :param int seed:  seed of the random number generator, so the corpus is reproducible
+    :returns: list of :py:class:`feedparser.FeedParserDict` instances
+    """
+    rng = random.Random(seed)
+    start = time.mktime((2014, 1, 1, 0, 0, 0, 0, 0, 0))
+    entries = []
+    for number in range(count):
+        paragraphs = [u'<p>{}</p>'.format(_sentence(rng, rng.randint(40, 120))) for __ in range(rng.randint(1, 4))]
+        entry = FeedParserDict()
+        entry['id'] = u'urn:magrathea:benchmark:{}'.format(number)
+        entry['link'] = u'http://example.org/{}'.format(number)
+        entry['title'] = _sentence(rng, rng.randint(4, 12))
+        entry['author'] = rng.choice(AUTHORS)
+        entry['updated_parsed'] = time.gmtime(start + rng.randint(0, 365 * 86400))
+        entry['content'] = [FeedParserDict(value=u'\n'.join(paragraphs))]
+        entry['summary'] = paragraphs[0]
+        entries.append(entry)
+    return entries
+
+
+def make_values(entries):
+    """
+    Extract all text values from a corpus, as passed to the conversion functions.
+    Every tenth value is encoded, mimicking data read from raw sources.
+
+    :param entries: list of entry objects, as returned by :py:func:`make_entries`
+    :returns: list of text and byte values
+    """
+    values = []
+    for entry in entries:
+        values.extend((entry['title'], entry['author'], entry['content'][0]['value'], entry['summary']))
+    return [value.encode('utf-8') if index % 10 == 0 else value for index, value in enumerate(values)]
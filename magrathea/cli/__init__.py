@@ -6,6 +6,7 @@
     :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
     :license: MIT License, see LICENSE for details.
 """
+import sys
 from .dispatch import CommandDispatcher
 
 
@@ -22,8 +23,17 @@ def execute(argv=None):
 
        sys.exit(execute(sys.argv))
 
+    The planet cache, if used by the command, is closed before returning, so all
+    pending changes are written to disk. Commands not using the cache do not
+    even import it.
+
     :param list argv: list of (command line) arguments
     """
     dispatcher = CommandDispatcher(argv)
-    dispatcher.execute()
+    try:
+        dispatcher.execute()
+    finally:
+        cache = sys.modules.get('magrathea.core.cache')
+        if cache is not None and cache.Cache.has_instance():
+            cache.Cache.get_instance().close()
     return dispatcher.status
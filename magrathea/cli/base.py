@@ -67,9 +67,9 @@ class BaseCommand(object):
         else:
             return None
 
-    def log(self, level, message):
+    def log(self, level, message, **fields):
         """Logging shortcut for convenience"""
-        self._logger.log(level, message)
+        self._logger.log(level, message, **fields)
 
     def log_error(self, message):
         """Error logging short cut method for convenience"""
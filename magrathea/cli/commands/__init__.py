@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.cli.commands
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from collections import namedtuple
+
+#: Registry entry of a command line command: the command's name, the module and the class
+#: implementing it, its aliases and its help text
+Command = namedtuple('Command', ('name', 'module', 'member', 'aliases', 'help'))
+
+#: Registry of all command line commands. Name, aliases and help text must match the
+#: attributes of the command's class (see :py:class:`~magrathea.cli.base.BaseCommand`).
+#: Since the dispatcher knows all commands from this registry, it only imports the module
+#: of the command actually invoked.
+COMMANDS = (
+    Command(
+        'build', 'magrathea.cli.commands.build', 'BuildCommand', (),
+        'Update all feeds and render the pages that have changed.'
+    ),
+    Command(
+        'init', 'magrathea.cli.commands.init', 'InitCommand', (),
+        'Initialise an empty planet structure.'
+    ),
+    Command(
+        'version', 'magrathea.cli.commands.version', 'VersionCommand', ('--version', '-v'),
+        'Show version and copyright information'
+    ),
+)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.cli.commands.build
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+from ..base import BaseCommand
+from ...core.planet import Planet
+
+
+class BuildCommand(BaseCommand):
+    """
+    Command class implementing the build command.
+    """
+
+    name = 'build'
+    aliases = ()
+    help = 'Update all feeds and render the pages that have changed.'
+    arguments = (
+        (
+            ('-F', '--force'),
+            {'help': 'render all pages, whether they have changed or not', 'action': 'store_true'}
+        ),
+    )
+
+    def handle(self):
+        """Command handler for the build command"""
+        planet = Planet.get_instance(self._working_directory)
+        result = planet.build(force=bool(self.get_command_argument('force')))
+        for level, message, fields in result.records:
+            self.log(level, message, **fields)
+        if not result:
+            self._status = os.EX_IOERR
+        else:
+            self._status = os.EX_OK
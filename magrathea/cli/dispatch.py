@@ -9,9 +9,12 @@
 import argparse
 import sys
 import os
+from ..conf import get_conf
 from ..utils import loader
+from ..utils.metrics import metrics
 from .logger import Logger, Levels
-from .base import BaseCommand
+from .profiler import Profiler
+from .commands import COMMANDS
 
 
 class CommandDispatcher(object):
@@ -22,6 +25,14 @@ class CommandDispatcher(object):
     """
 
     _arguments = (
+        (
+            ('-c', '--cprofile'),
+            {
+                'help': 'profile the command and save the statistics to file',
+                'action': 'store',
+                'metavar': '<file>'
+            }
+        ),
         (
             ('-d', '--dir'),
             {
@@ -46,6 +57,14 @@ class CommandDispatcher(object):
                 'action': 'store_true',
             }
         ),
+        (
+            ('-j', '--json'),
+            {
+                'help': 'log JSON lines into file instead of the terminal',
+                'action': 'store',
+                'metavar': '<file>'
+            }
+        ),
         (
             ('-l', '--loglevel'),
             {
@@ -55,6 +74,14 @@ class CommandDispatcher(object):
                 'choices': Levels
             }
         ),
+        (
+            ('-m', '--tracemalloc'),
+            {
+                'help': 'trace memory allocations and save them to file',
+                'action': 'store',
+                'metavar': '<file>'
+            }
+        ),
         (
             ('-n', '--no-color'),
             {
@@ -62,6 +89,13 @@ class CommandDispatcher(object):
                 'action': 'store_true'
             }
         ),
+        (
+            ('-p', '--profile'),
+            {
+                'help': 'show the time spent per phase when done',
+                'action': 'store_true'
+            }
+        ),
         (
             ('-s', '--syslog'),
             {
@@ -78,6 +112,7 @@ class CommandDispatcher(object):
         self._status = os.EX_OK
         self._commands = {}
         self._aliases = {}
+        self._classes = {}
         self._get_commands()
         self._global_args = []
         self._command = ''
@@ -86,16 +121,27 @@ class CommandDispatcher(object):
 
     def _get_commands(self):
         """
-        Detect available command modules or packages and their alias names
+        Register the available commands and their alias names (see :py:data:`~magrathea.cli.commands.COMMANDS`).
+        The command modules are not imported before a command is actually used.
         """
-        cmds = loader.detect_class_modules('magrathea.cli.commands', BaseCommand)
-        for cmd in cmds:
-            cmd_class = loader.load_member(cmds[cmd], cmd)
-            self._commands[cmd_class.name] = cmd_class
-            for alias in cmd_class.aliases:
+        for command in COMMANDS:
+            self._commands[command.name] = command
+            for alias in command.aliases:
                 if alias in self._aliases or alias in self._commands:
                     raise AttributeError("command alias {} already exists".format(alias))
-                self._aliases[alias] = cmd_class.name
+                self._aliases[alias] = command.name
+
+    def _get_command_class(self, name):
+        """
+        Import the module of a command and get the command's class
+
+        :param str name: name of the command
+        :returns: class implementing the command
+        """
+        command = self._commands[name]
+        if command.name not in self._classes:
+            self._classes[command.name] = loader.load_member(command.module, command.member)
+        return self._classes[command.name]
 
     def _set_command(self):
         """
@@ -136,7 +182,7 @@ class CommandDispatcher(object):
                     if result:
                         result += ("\n" + indent * " ")
                     result += argline
-                    argline = ""
+                    argline = argtext
                 else:
                     argline += argtext
         if result:
@@ -193,18 +239,19 @@ class CommandDispatcher(object):
         """
         usage_message = "usage: {prog} {command}".format(prog=self._prog, command=self._command)
         indent = len(usage_message)
-        if self._commands[self._command].arguments:
+        command_class = self._get_command_class(self._command)
+        if command_class.arguments:
             usage_message += "{arguments}".format(
-                arguments=self._assemble_args(self._commands[self._command].arguments, indent)
+                arguments=self._assemble_args(command_class.arguments, indent)
             )
-        if self._commands[self._command].aliases:
+        if command_class.aliases:
             usage_message += "\n\nAliases: "
-            for alias in self._commands[self._command].aliases:
+            for alias in command_class.aliases:
                 usage_message += (alias + ", ")
             usage_message = usage_message[:-2]
-        if self._commands[self._command].arguments:
+        if command_class.arguments:
             usage_message += "\n\nAvailable command options:\n"
-            usage_message += self._assemble_options(self._commands[self._command].arguments)
+            usage_message += self._assemble_options(command_class.arguments)
         return usage_message
 
     def help(self):
@@ -241,7 +288,8 @@ class CommandDispatcher(object):
             global_parser.add_argument(*arg[0], **arg[1])
         global_args = global_parser.parse_args(self._global_args)
         command_parser = argparse.ArgumentParser(prog=self._prog, usage=self.command_usage()[7:], add_help=False)
-        for arg in self._commands[self._command].arguments:
+        command_class = self._get_command_class(self._command)
+        for arg in command_class.arguments:
             command_parser.add_argument(*arg[0], **arg[1])
         command_args = command_parser.parse_args(self._command_args)
 
@@ -249,6 +297,10 @@ class CommandDispatcher(object):
             self._logger.file = global_args.file
             self._logger.type = 'file'
 
+        if 'json' in global_args and global_args.json:
+            self._logger.file = global_args.json
+            self._logger.type = 'json'
+
         if 'loglevel' in global_args and global_args.loglevel:
             self._logger.level = global_args.loglevel
 
@@ -258,10 +310,27 @@ class CommandDispatcher(object):
         if 'syslog' in global_args and global_args.syslog:
             self._logger.type = 'syslog'
 
-        # Create an instance of the called command and execute it
-        command_class = self._commands[self._command]
+        if 'profile' in global_args and global_args.profile:
+            metrics.reset()
+            metrics.enabled = True
+
+        # Create an instance of the called command and execute it,
+        # with all its messages written once it has finished
         command = command_class(global_args=global_args, cmd_args=command_args, logger=self._logger)
-        command.execute()
+        profiler = Profiler(
+            stats_file=global_args.cprofile if 'cprofile' in global_args else None,
+            snapshot_file=global_args.tracemalloc if 'tracemalloc' in global_args else None
+        )
+        self._logger.background = get_conf('DEFAULT_LOG_BACKGROUND')
+        try:
+            profiler.run(command.execute)
+        finally:
+            if profiler.summary:
+                self._logger.log_notice(profiler.summary)
+            if metrics.enabled:
+                metrics.enabled = False
+                self._logger.log_notice(metrics.report())
+            self._logger.background = False
         self._status = command.status
 
     @property
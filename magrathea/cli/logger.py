@@ -8,11 +8,17 @@
 """
 from __future__ import print_function
 from __future__ import unicode_literals
+import atexit
+import io
+import json
 import sys
 import syslog
-from datetime import datetime
+import threading
+import time
+from collections import deque
 from ..conf import get_conf
 from ..utils.compat import comp_open
+from ..utils.convert import to_bytes, to_str
 from ..utils.singleton import Singleton
 from ..utils import termcolor
 from ..utils.timer import counter
@@ -27,6 +33,8 @@ Levels = {
     'debug': (5, 'DEBUG', 'LOG_DEBUG')
 }
 
+Types = ('term', 'file', 'syslog', 'json')
+
 
 @Singleton
 class Logger(object):
@@ -37,6 +45,15 @@ class Logger(object):
     * the terminal (stdout and stderr)
     * files accessible through the local file system
     * the syslog service
+    * files of JSON objects, one per line (see below)
+
+    By default, each message is written immediately. In background mode, messages are
+    appended to a queue instead, and a writer thread writes them in batches, as soon as
+    :py:data:`~magrathea.conf.default.DEFAULT_LOG_BATCH_SIZE` messages are pending or
+    :py:data:`~magrathea.conf.default.DEFAULT_LOG_FLUSH_INTERVAL` seconds have passed.
+    Thus, logging costs the caller no more than appending to the queue. Pending messages
+    are written by :py:meth:`flush`, and no message is lost when the background mode is
+    left or the interpreter exits.
 
     .. note::
 
@@ -47,11 +64,21 @@ class Logger(object):
 
     The following key word arguments are understood:
 
-    :param str type:     Type of this logger. Must be one of `file`, `syslog` or `term`.
+    Besides level and message, log messages may carry any number of fields, passed as
+    keyword arguments (e. g. ``feed`` or ``duration``). Fields are ignored by all types
+    but `json`, which writes each message as one JSON object holding the ``level``, the
+    ``message``, the performance counter value (``monotonic``, see
+    :py:func:`~magrathea.utils.timer.counter`) and the wall clock time (``time``, in
+    seconds since the epoch) of logging, and all fields::
+
+       >>> logger.log_debug("fetched", feed='http://example.org/feed.xml', duration=0.25)
+
+    :param str type:     Type of this logger. Must be one of `file`, `syslog`, `term` or `json`.
     :param str level:    Minimum level for logging. Must be one of `mute`, `error`, `warning`, `info` or `debug`.
-    :param str file:     Path of the log file to log into if type is set to `file`.
+    :param str file:     Path of the log file to log into if type is set to `file` or `json`.
     :param str facility: Name of the syslog facility to log into if type is set to `syslog`
     :param bool color:   Allow colored logging (only effective if type is set to `term`)
+    :param bool background: Write messages in a background thread
     """
 
     def __init__(self, *args, **kwargs):
@@ -60,15 +87,21 @@ class Logger(object):
         self._type = get_conf('DEFAULT_LOG_TYPE')
         self._logfile = get_conf('DEFAULT_LOG_FILE')
         self._facility = get_conf('DEFAULT_LOG_FACILITY')
-        self._queue = None
-        self._init_queue()
+        self._records = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._writer = None
+        self._background = False
+        self._batch_size = get_conf('DEFAULT_LOG_BATCH_SIZE')
+        self._interval = get_conf('DEFAULT_LOG_FLUSH_INTERVAL')
         self._fp_std = None
         self._fp_err = None
 
         color_candidate = get_conf('DEFAULT_LOG_COLOR')
 
         # Check for positional arguments
-        if len(args) > 0 and args[0] in ('file', 'term', 'syslog'):
+        if len(args) > 0 and args[0] in Types:
             self._type = args[0]
         if len(args) > 1 and args[1] in self._levels:
             self._level = args[1]
@@ -80,7 +113,7 @@ class Logger(object):
             color_candidate = args[4]
 
         # Check for keyword arguments
-        if 'type' in kwargs and kwargs['type'] in ('file', 'term', 'syslog'):
+        if 'type' in kwargs and kwargs['type'] in Types:
             self._type = kwargs['type']
         if 'level' in kwargs and kwargs['level'] in self._levels:
             self._level = kwargs['level']
@@ -90,6 +123,8 @@ class Logger(object):
             self._facility = kwargs['facility']
         if 'color' in kwargs and type(kwargs['color']) == bool:
             color_candidate = kwargs['color']
+        if 'background' in kwargs and type(kwargs['background']) == bool:
+            self._background = kwargs['background']
 
         # finally decide about color support and open the log channel
         if termcolor.supports_color() and self._type == 'term':
@@ -97,13 +132,16 @@ class Logger(object):
         else:
             self._color = False
         self._open()
+        if self._background:
+            self._start()
+        atexit.register(self.shutdown)
 
     def _open(self):
         """Open the log channel"""
         if self._type == 'term':
             self._fp_std = sys.stdout
             self._fp_err = sys.stderr
-        elif self._type == 'file':
+        elif self._type in ('file', 'json'):
             # enforce lazy behaviour
             self._fp_std = None
             self._fp_err = None
@@ -112,111 +150,161 @@ class Logger(object):
 
     def _close(self):
         """Close the current log channel"""
+        self.flush()
         if self._type == 'term':
             self._fp_std = None
             self._fp_err = None
-        elif self._type == 'file':
-            self._fp_std.close()
+        elif self._type in ('file', 'json'):
+            if self._fp_std:
+                self._fp_std.close()
+            self._fp_std = None
             self._fp_err = None
         elif self._type == 'syslog':
             syslog.closelog()
 
-    def _init_queue(self):
-        """Initialise message queue"""
-        self._queue = {
-            'std': {},
-            'err': {}
-        }
+    def _start(self):
+        """Start the background writer thread"""
+        if self._writer is None:
+            self._stop.clear()
+            self._writer = threading.Thread(target=self._run, name='magrathea-logger')
+            self._writer.daemon = True
+            self._writer.start()
+
+    def _run(self):
+        """Main loop of the background writer thread"""
+        while not self._stop.is_set():
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def shutdown(self):
+        """Stop the background writer thread, if running, and write all pending messages"""
+        writer = self._writer
+        if writer is not None:
+            self._writer = None
+            self._stop.set()
+            self._wakeup.set()
+            writer.join()
+        self.flush()
+
+    def flush(self):
+        """Write all pending messages to the log channel"""
+        with self._lock:
+            records = []
+            try:
+                while True:
+                    records.append(self._records.popleft())
+            except IndexError:
+                pass
+            if records:
+                self._write(records)
+
+    def _write(self, records):
+        """
+        Write messages to the log channel.
 
-    def _flush(self):
-        """Flush log queue to the log channel"""
+        :param list records: tuples of the performance counter and wall clock time of logging,
+                             the level, the message and the fields
+        """
         if self._type == 'term':
-            self._flush_term()
+            self._write_term(records)
         elif self._type == 'file':
-            self._flush_file()
-        self._init_queue()
-
-    def _flush_term(self):
-        """Flush implementation for terminal logging"""
-        self._flush_term_err(self._queue['err'])
-        self._flush_term_std(self._queue['std'])
-
-    def _flush_term_std(self, queue):
-        """Flushes the stdout message queue on a terminal"""
-        for msg in sorted(queue.keys()):
-            print(queue[msg][1], file=self._fp_std)
-
-    def _flush_term_err(self, queue):
-        """Flushes the stderr message queue on a terminal"""
-        for msg in sorted(queue.keys()):
-            print(queue[msg][1], file=self._fp_err)
-
-    def _flush_file(self):
-        """Flush implementation for file logging (lazy)"""
+            self._write_file(records)
+        elif self._type == 'syslog':
+            self._write_syslog(records)
+        elif self._type == 'json':
+            self._write_json(records)
+
+    def _write_term(self, records):
+        """Write implementation for terminal logging"""
+        err = [message for __, __, level, message, __ in records if level in ('error', 'usage')]
+        std = [message for __, __, level, message, __ in records if level not in ('error', 'usage')]
+        for messages, fp in ((err, self._fp_err), (std, self._fp_std)):
+            if messages:
+                print(*messages, sep='\n', file=fp)
+                fp.flush()
+
+    def _write_file(self, records):
+        """Write implementation for file logging (lazy)"""
         if not self._fp_std:
             self._fp_std = comp_open(self._logfile, encoding=get_conf('DEFAULT_CHARSET'), mode='a+')
-        padding = len("[{}] [     ]".format(datetime.now().strftime(get_conf('DEFAULT_LOG_TIMESTAMP')))) * " "
-        queue = dict(self._queue['err'])
-        queue.update(self._queue['std'])
-        for msg in sorted(queue.keys()):
-            # noinspection PyTypeChecker
-            msg_lines = queue[msg][1].splitlines()
-            # noinspection PyTypeChecker
-            print(
-                "[{date}] [{level}] {message}".format(
-                    date=datetime.now().strftime(get_conf('DEFAULT_LOG_TIMESTAMP')),
-                    level=self._levels[queue[msg][0]][1],
-                    message=msg_lines[0]
-                ),
-                file=self._fp_std
-            )
+        lines = []
+        second = None
+        date = padding = None
+        for __, wall, level, message, __ in records:
+            # timestamps have a resolution of seconds, so they are formatted once per second only
+            if int(wall) != second:
+                second = int(wall)
+                date = time.strftime(get_conf('DEFAULT_LOG_TIMESTAMP'), time.localtime(second))
+                padding = len("[{}] [     ]".format(date)) * " "
+            msg_lines = "{}".format(message).splitlines() or ['']
+            lines.append("[{date}] [{level}] {message}".format(
+                date=date,
+                level=self._levels[level][1],
+                message=msg_lines[0]
+            ))
             for msg_line in msg_lines[1:]:
-                print("{padding} {message}".format(padding=padding, message=msg_line), file=self._fp_std)
-
-    def _flush_syslog(self):
-        """Flush implementation for syslog logging"""
-        queue = dict(**self._queue['err'])
-        queue.update(self._queue['std'])
-        for msg in sorted(queue.keys()):
-            syslog.syslog(getattr(syslog, self._levels[queue[msg][0]][2]), queue[msg][1])
-
-    def log(self, level, message):
+                lines.append("{padding} {message}".format(padding=padding, message=msg_line))
+        print(*lines, sep='\n', file=self._fp_std)
+        self._fp_std.flush()
+
+    def _write_syslog(self, records):
+        """Write implementation for syslog logging"""
+        for __, __, level, message, __ in records:
+            if self._levels[level][2]:
+                syslog.syslog(getattr(syslog, self._levels[level][2]), "{}".format(message))
+
+    def _write_json(self, records):
+        """Write implementation for JSON logging (lazy)"""
+        if not self._fp_std:
+            self._fp_std = io.open(self._logfile, mode='ab')
+        lines = []
+        for count, wall, level, message, fields in records:
+            record = dict(fields) if fields else {}
+            record.update(level=level, message=message, monotonic=count, time=wall)
+            lines.append(to_bytes(json.dumps(record, ensure_ascii=False, sort_keys=True, default=to_str)))
+        lines.append(b'')
+        self._fp_std.write(b'\n'.join(lines))
+        self._fp_std.flush()
+
+    def log(self, level, message, **fields):
         """Register a log message within the logging queue"""
         # log usage messages only on a terminal
         if level == 'usage':
-            if self._type == 'term':
-                self._queue['err'][counter()] = (level, message)
+            if self._type != 'term':
+                return
         # otherwise, log messages if their level is appropriate
-        if level in self._levels and self._levels[self._level][0] >= self._levels[level][0]:
-            if level == 'error':
-                self._queue['err'][counter()] = (level, message)
-            else:
-                self._queue['std'][counter()] = (level, message)
-        self._flush()
-
-    def log_error(self, message):
+        elif level not in self._levels or self._levels[self._level][0] < self._levels[level][0]:
+            return
+        self._records.append((counter(), time.time(), level, message, fields))
+        if self._writer is None:
+            self.flush()
+        elif len(self._records) >= self._batch_size:
+            self._wakeup.set()
+
+    def log_error(self, message, **fields):
         """Convenience shortcut for registering messages with log level `error`"""
-        self.log('error', message)
+        self.log('error', message, **fields)
 
-    def log_warning(self, message):
+    def log_warning(self, message, **fields):
         """Convenience shortcut for registering messages with log level `warning`"""
-        self.log('warning', message)
+        self.log('warning', message, **fields)
 
-    def log_notice(self, message):
+    def log_notice(self, message, **fields):
         """Convenience shortcut for registering messages with log level `notice`"""
-        self.log('notice', message)
+        self.log('notice', message, **fields)
 
-    def log_info(self, message):
+    def log_info(self, message, **fields):
         """Convenience shortcut for registering messages with log level `info`"""
-        self.log('info', message)
+        self.log('info', message, **fields)
 
-    def log_debug(self, message):
+    def log_debug(self, message, **fields):
         """Convenience shortcut for registering messages with log level `debug`"""
-        self.log('debug', message)
+        self.log('debug', message, **fields)
 
-    def log_usage(self, message):
+    def log_usage(self, message, **fields):
         """Convenience shortcut for registering messages with log level `usage`"""
-        self.log('usage', message)
+        self.log('usage', message, **fields)
 
     @property
     def color(self):
@@ -230,6 +318,22 @@ class Logger(object):
         if termcolor.supports_color() and self._type == 'term' and type(value) == bool:
             self._color = value
 
+    @property
+    def background(self):
+        """
+        Boolean switch indicating whether messages are written by a background thread.
+        """
+        return self._background
+
+    @background.setter
+    def background(self, value):
+        if type(value) == bool:
+            self._background = value
+            if value:
+                self._start()
+            else:
+                self.shutdown()
+
     @property
     def facility(self):
         """
@@ -248,16 +352,19 @@ class Logger(object):
     @property
     def file(self):
         """
-        The log file used when run as file logger.
+        The log file used when run as file or JSON lines logger.
         """
         return self._logfile
 
     @file.setter
     def file(self, value):
-        self._logfile = value
-        if self._type == 'file':
+        if self._type in ('file', 'json'):
+            # pending messages still go to the previous file
             self._close()
+            self._logfile = value
             self._open()
+        else:
+            self._logfile = value
 
     @property
     def level(self):
@@ -274,15 +381,15 @@ class Logger(object):
     @property
     def type(self):
         """
-        The logger type. Expected to be one of `term`, `file` or `syslog`.
+        The logger type. Expected to be one of `term`, `file`, `syslog` or `json`.
         """
         return self._type
 
     @type.setter
     def type(self, value):
-        if value in ('file', 'term', 'syslog'):
+        if value in Types:
             self._close()
             self._type = value
             self._open()
-        if value in ('file', 'syslog'):
+        if value in ('file', 'syslog', 'json'):
             self._color = False
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.cli.profiler
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from ..conf import get_conf
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+try:
+    import tracemalloc
+except ImportError:
+    # tracemalloc is available with Python 3.4 or newer
+    tracemalloc = None
+
+
+class Profiler(object):
+    """
+    Run a callable under :py:mod:`cProfile` and/or :py:mod:`tracemalloc`, so commands can be
+    profiled on any host, without changing the code::
+
+       >>> profiler = Profiler(stats_file='build.prof')
+       >>> profiler.run(command.execute)
+       >>> print(profiler.summary)
+
+    The statistics collected by :py:mod:`cProfile` are saved to *stats_file*, to be examined
+    with :py:mod:`pstats` or any other profile viewer. The memory allocations traced by
+    :py:mod:`tracemalloc` are saved to *snapshot_file*, to be loaded with
+    :py:meth:`tracemalloc.Snapshot.load`. In addition, the :py:attr:`summary` lists the
+    functions taking most of the time and the source lines allocating most of the memory.
+
+    .. note::
+
+       :py:mod:`cProfile` only profiles the thread calling the function. Time spent in other
+       threads (e. g. fetching feeds, see :py:class:`~magrathea.core.feed.fetch.Fetcher`)
+       shows up as waiting for these threads. Memory allocations are traced in all threads.
+
+    :param str stats_file:    file to save the :py:mod:`cProfile` statistics to, or ``None``
+    :param str snapshot_file: file to save the :py:mod:`tracemalloc` snapshot to, or ``None``
+    :param int limit:         number of functions and allocation sites listed in the summary
+                              (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PROFILE_LIMIT`)
+    """
+
+    def __init__(self, stats_file=None, snapshot_file=None, limit=None):
+        self._stats_file = stats_file
+        self._snapshot_file = snapshot_file
+        self._limit = limit or get_conf('DEFAULT_PROFILE_LIMIT')
+        self._summary = []
+
+    @property
+    def enabled(self):
+        """``True`` if any profiling takes place"""
+        return bool(self._stats_file or self._snapshot_file)
+
+    @property
+    def summary(self):
+        """Summary of the most recent run, or an empty string"""
+        return '\n'.join(self._summary)
+
+    def run(self, func):
+        """
+        Call a function, profiling it as requested. The results are saved even if the
+        function raises an exception.
+
+        :param func: callable taking no arguments
+        :returns: the function's return value
+        """
+        self._summary = []
+        if not self.enabled:
+            return func()
+        profile = None
+        if self._stats_file:
+            # imported on demand, as pstats is expensive to import
+            import cProfile
+            profile = cProfile.Profile()
+        tracing = bool(self._snapshot_file)
+        if tracing and tracemalloc is None:
+            self._summary.append("tracemalloc is not available with this Python version")
+            tracing = False
+        if tracing:
+            tracemalloc.start()
+        try:
+            if profile is not None:
+                return profile.runcall(func)
+            return func()
+        finally:
+            if tracing:
+                self._save_snapshot()
+            if profile is not None:
+                self._save_stats(profile)
+
+    def _save_stats(self, profile):
+        """
+        Save the statistics collected by :py:mod:`cProfile` and summarise them.
+
+        :param profile: :py:class:`cProfile.Profile` instance
+        """
+        import pstats
+        profile.dump_stats(self._stats_file)
+        stream = StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(self._limit)
+        self._summary.append("Profile saved to {}".format(self._stats_file))
+        self._summary.extend(line for line in stream.getvalue().splitlines() if line.strip())
+
+    def _save_snapshot(self):
+        """
+        Save the memory allocations traced by :py:mod:`tracemalloc` and summarise them.
+        Tracing is stopped afterwards.
+        """
+        try:
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__)
+            ))
+        finally:
+            tracemalloc.stop()
+        snapshot.dump(self._snapshot_file)
+        self._summary.append("Memory snapshot saved to {}, peak {:.1f} KiB".format(
+            self._snapshot_file, peak / 1024.0
+        ))
+        for statistic in snapshot.statistics('lineno')[:self._limit]:
+            self._summary.append("  {}".format(statistic))
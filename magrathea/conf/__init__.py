@@ -11,19 +11,56 @@ from . import default
 from ..utils.dynamic import DynamicIterable
 from ..utils.singleton import Singleton
 
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python < 3.3 lacks MappingProxyType
+    from collections import Mapping
+
+    class MappingProxyType(Mapping):
+        """
+        Read-only view of a dictionary, standing in for :py:class:`types.MappingProxyType`.
+        """
+
+        __slots__ = ('_mapping',)
+
+        def __init__(self, mapping):
+            self._mapping = mapping
+
+        def __getitem__(self, key):
+            return self._mapping[key]
+
+        def __iter__(self):
+            return iter(self._mapping)
+
+        def __len__(self):
+            return len(self._mapping)
+
+        def __repr__(self):
+            return 'MappingProxyType({!r})'.format(self._mapping)
+
+#: Frozen snapshot of the configuration (see :py:meth:`ApplicationConf.freeze`), or ``None`` if outdated
+_frozen = None
+
 
 def get_conf(key):
     """
     Get a global configuration value by its key.
 
+    Values are looked up in the frozen configuration snapshot (see
+    :py:meth:`~magrathea.conf.ApplicationConf.freeze`), so a lookup usually
+    costs one dictionary access.
+
     :param str key: string identifying the requested configuration value
     :returns: the requested configuration value or None
     """
-    configuration = ApplicationConf.get_instance()
-    if key.upper() in configuration:
-        return configuration[key.upper()]
-    else:
-        return None
+    frozen = _frozen
+    if frozen is None:
+        frozen = ApplicationConf.get_instance().freeze()
+    try:
+        return frozen[key]
+    except KeyError:
+        return frozen.get(str(key).upper())
 
 
 @Singleton
@@ -60,6 +97,9 @@ class ApplicationConf(DynamicIterable):
     Example::
 
        configuration = ApplicationConf.get_instance()
+
+    For fast lookups, :py:meth:`~magrathea.conf.ApplicationConf.freeze` provides a read-only
+    snapshot of the configuration. The snapshot is kept until any value is set or deleted.
     """
 
     def __init__(self):
@@ -73,12 +113,39 @@ class ApplicationConf(DynamicIterable):
         self.register_hook('pre-del', self._hook_defaults_not_mutable)
         self.register_hook('pre-set', self._hook_default_create_mirror)
         self.register_hook('pre-del', self._hook_default_mirror_reset)
+        self.register_hook('post-set', self._hook_thaw)
+        self.register_hook('post-del', self._hook_thaw)
 
         # convert all upper case configuration values from :py:module:`~magrathea.conf.default`
         for setting in dir(default):
             if setting.isupper():
                 self[setting] = getattr(default, setting)
 
+    def freeze(self):
+        """
+        Get a frozen snapshot of the configuration: a read-only mapping of all (upper case) keys to
+        their values. The snapshot is built once and reused until any value is set or deleted.
+
+        :returns: read-only mapping
+        """
+        global _frozen
+        frozen = _frozen
+        if frozen is None:
+            frozen = MappingProxyType(dict(self.data))
+            _frozen = frozen
+        return frozen
+
+    @staticmethod
+    def _hook_thaw(key, value):
+        """
+        Hook method discarding the frozen snapshot of the configuration.
+
+        To be applied as post-set and post-del hook.
+        """
+        global _frozen
+        _frozen = None
+        return key, value
+
     @staticmethod
     def _hook_uppercase(key, value):
         """
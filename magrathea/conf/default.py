@@ -32,6 +32,9 @@ DEFAULT_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__))
 #: Default planet template
 DEFAULT_PLANET_TEMPLATE = 'planet'
 
+#: Default location for themes shipped with Magrathea
+DEFAULT_THEME_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'themes')
+
 #: Default :py:mod:`pickle` protocol to be used
 DEFAULT_PICKLE_PROTOCOL = 2
 
@@ -60,6 +63,34 @@ DEFAULT_LOG_TIMESTAMP = '%Y-%m-%d %H:%M:%S'
 #: By default, use colors for logging where available
 DEFAULT_LOG_COLOR = True
 
+#: By default, commands write their log messages in a background thread
+DEFAULT_LOG_BACKGROUND = True
+
+#: Number of pending log messages making the background thread write them at once
+DEFAULT_LOG_BATCH_SIZE = 100
+
+#: Maximum time (in seconds) log messages are pending in background mode
+DEFAULT_LOG_FLUSH_INTERVAL = 0.5
+
+#: Number of functions and allocation sites listed when profiling commands
+DEFAULT_PROFILE_LIMIT = 20
+
+
+# FEED FETCHING
+###############
+
+#: Default number of feeds being fetched concurrently
+DEFAULT_FEED_FETCH_WORKERS = 8
+
+#: Default socket timeout (in seconds) applied when fetching a feed
+DEFAULT_FEED_FETCH_TIMEOUT = 30
+
+#: Default number of concurrent connections per host for asynchronous fetching
+DEFAULT_FEED_FETCH_HOST_LIMIT = 2
+
+#: Default user agent string sent when fetching a feed
+DEFAULT_FEED_USER_AGENT = 'Magrathea (+https://github.com/RootForum/magrathea)'
+
 
 # PLANET STRUCTURE
 ##################
@@ -70,12 +101,27 @@ DEFAULT_PLANET_THEME_DIR = 'themes'
 #: Default build directory
 DEFAULT_PLANET_BUILD_DIR = 'build'
 
+#: Default directory for caching compiled theme templates
+DEFAULT_PLANET_THEME_CACHE_DIR = '.theme-cache'
+
 #: Default planet configuration file
 DEFAULT_PLANET_CONF_FILE = 'planet.ini'
 
 #: Default planet cache file (indicated without suffix)
 DEFAULT_PLANET_CACHE_FILE = 'cache'
 
+#: Planet cache backend based on :py:mod:`shelve`
+DEFAULT_PLANET_CACHE_BACKEND_SHELVE = 'shelve'
+
+#: Planet cache backend based on :py:mod:`sqlite3`
+DEFAULT_PLANET_CACHE_BACKEND_SQLITE = 'sqlite'
+
+#: Default planet cache backend
+DEFAULT_PLANET_CACHE_BACKEND = DEFAULT_PLANET_CACHE_BACKEND_SHELVE
+
+#: Default maximum number of planet cache items held in memory (``None`` for no limit)
+DEFAULT_PLANET_CACHE_MEMORY_LIMIT = 1024
+
 
 # PLANET CONFIGURATION
 ######################
@@ -143,6 +189,12 @@ DEFAULT_PLANET_CONF_CACHE_FILE_KEY = 'cache_file'
 #: Default planet configuration cache file value (without suffix)
 DEFAULT_PLANET_CONF_CACHE_FILE_VAL = DEFAULT_PLANET_CACHE_FILE
 
+#: Default planet configuration cache backend key
+DEFAULT_PLANET_CONF_CACHE_BACKEND_KEY = 'cache_backend'
+
+#: Default planet configuration cache backend value
+DEFAULT_PLANET_CONF_CACHE_BACKEND_VAL = DEFAULT_PLANET_CACHE_BACKEND
+
 #: Default planet configuration per feed author key
 DEFAULT_PLANET_CONF_FEED_AUTHOR_KEY = 'author'
 
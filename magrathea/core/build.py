@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.core.build
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import itertools
+import os
+import threading
+from .exceptions import RenderError
+from .result import Result
+from ..conf import get_conf
+from ..utils.compat import comp_makedirs, comp_open, comp_replace
+from ..utils.convert import to_str, to_str_list
+from ..utils.digest import compact_key
+from ..utils.metrics import span
+from ..utils.timer import counter
+
+try:
+    from html import escape
+except ImportError:
+    from cgi import escape
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+#: Prefix of the cache keys holding the page dependencies of a build directory
+PAGES_PREFIX = 'build-pages:'
+
+#: Prefix of the cache keys holding the pagination anchor of a build directory
+ANCHOR_PREFIX = 'build-anchor:'
+
+
+#: File name of the planet's index page, holding a copy of the most recent page
+INDEX_NAME = 'index.html'
+
+
+def get_page_name(number):
+    """
+    Get the file name of a page.
+
+    :param int number: number of the page, counted from the oldest page
+    :returns: file name of the page
+    """
+    return 'page{}.html'.format(number)
+
+
+class Page(object):
+    """
+    A page of the planet, holding a slice of the planet's entries.
+
+    Pages are numbered by the position of their entries, counted from the oldest entry ever
+    built (see :py:class:`Builder`). All pages hold the same number of entries, except for the
+    most recent one, which holds the remainder and is copied to the planet's index page, and
+    the oldest one, whose older entries may have expired. Thus, a new entry only affects the
+    most recent page (and, once it is full, the page preceding it), and an expired entry only
+    the oldest page, while the other pages keep both their number and content.
+
+    :param int number: number of the page
+    :param int count:  total number of pages
+    :param list entries: the page's :py:class:`~magrathea.core.feed.entry.Entry` instances, in descending order
+    :param int first:  number of the oldest page
+    """
+
+    def __init__(self, number, count, entries, first=1):
+        self._number = number
+        self._count = count
+        self._entries = entries
+        self._first = first
+
+    @property
+    def number(self):
+        """Number of the page"""
+        return self._number
+
+    @property
+    def count(self):
+        """Total number of pages"""
+        return self._count
+
+    @property
+    def first(self):
+        """Number of the oldest page"""
+        return self._first
+
+    @property
+    def entries(self):
+        """List of the page's entries, in descending order"""
+        return self._entries
+
+    @property
+    def name(self):
+        """File name of the page"""
+        return get_page_name(self._number)
+
+    @property
+    def is_index(self):
+        """``True`` if this is the most recent page, copied to the index page"""
+        return self._number == self._first + self._count - 1
+
+    @property
+    def newer(self):
+        """File name of the page holding more recent entries, or ``None``"""
+        if self.is_index:
+            return None
+        return get_page_name(self._number + 1)
+
+    @property
+    def older(self):
+        """File name of the page holding older entries, or ``None``"""
+        if self._number == self._first:
+            return None
+        return get_page_name(self._number - 1)
+
+
+def iter_pages(entries, size, total, offset=0):
+    """
+    Split entries into pages (see :py:class:`Page`) lazily. Entries are only pulled from
+    the iterable once the page holding them is requested, so no more than a single page's
+    entries are held at any time.
+
+    :param entries:    iterable of :py:class:`~magrathea.core.feed.entry.Entry` instances, in descending order
+    :param int size:   number of entries per page
+    :param int total:  total number of entries; further entries are ignored
+    :param int offset: position of the oldest entry, i. e. number of older entries gone before
+    :returns: iterator over :py:class:`Page` instances, from the most recent to the oldest page
+    """
+    entries = iter(entries)
+    first = offset // size + 1
+    last = max(first, (offset + total - 1) // size + 1)
+    for number in range(last, first - 1, -1):
+        length = min(number * size, offset + total) - max((number - 1) * size, offset)
+        with span('merge'):
+            page = Page(number, last - first + 1, list(itertools.islice(entries, max(0, length))), first)
+        yield page
+
+
+def paginate(entries, size):
+    """
+    Split entries into pages (see :py:class:`Page`).
+
+    :param list entries: :py:class:`~magrathea.core.feed.entry.Entry` instances, in descending order
+    :param int size:     number of entries per page
+    :returns: list of :py:class:`Page` instances, from the most recent to the oldest page
+    """
+    return list(iter_pages(entries, size, len(entries)))
+
+
+def prefetch(iterable, depth=1):
+    """
+    Iterate over an iterable, while a background thread retrieves up to *depth* items in
+    advance. Thus, the consumer may process an item while the next one is being retrieved::
+
+       >>> for page in prefetch(iter_pages(timeline, 25, total)):
+       ...     write(page)
+
+    Exceptions raised while retrieving an item are raised by the iterator instead of
+    returning that item. Once the iterator is closed, the background thread stops as well.
+
+    :param iterable:  iterable the items are retrieved from
+    :param int depth: maximum number of items retrieved in advance
+    :returns: iterator over the items
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item, error=None):
+        while not stop.is_set():
+            try:
+                items.put((item, error), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(done, e)
+        else:
+            put(done)
+
+    thread = threading.Thread(target=producer)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+class SimpleRenderer(object):
+    """
+    Renderer writing pages as plain HTML documents.
+
+    Renderers provide a :py:meth:`render` method, turning a :py:class:`Page` into a string
+    (or raising :py:exc:`~magrathea.core.exceptions.RenderError`), and a ``signature``, which
+    changes whenever the renderer's templates change.
+    """
+
+    #: Signature of this renderer, changing whenever its output changes
+    signature = ('simple', 1)
+
+    #: Format of an entry
+    entry_format = '<article>\n<h2><a href="{link}">{title}</a></h2>\n<p>{author}, {date}</p>\n{body}\n</article>\n'
+
+    def render(self, page):
+        """
+        Render a page.
+
+        :param page: :py:class:`Page` instance
+        :returns: the rendered page
+        """
+        parts = ['<!DOCTYPE html>\n<html>\n<head><meta charset="{}"></head>\n<body>\n'.format(
+            get_conf('CHARSET')
+        )]
+        for entry in page.entries:
+            parts.append(self.entry_format.format(
+                link=escape(entry.link, True),
+                title=escape(entry.title),
+                author=escape(entry.author or (entry.feed.author if entry.feed else '') or ''),
+                date=entry.get_pubdate_gmt('%Y-%m-%d %H:%M') if entry.pubdate_gmt else '',
+                body=entry.body
+            ))
+        if page.newer:
+            parts.append('<a href="{}">newer</a>\n'.format(page.newer))
+        if page.older:
+            parts.append('<a href="{}">older</a>\n'.format(page.older))
+        parts.append('</body>\n</html>\n')
+        return ''.join(parts)
+
+
+class Builder(object):
+    """
+    Incremental page builder.
+
+    For each page, the builder records its dependencies: the identifiers and fingerprints
+    (see :py:attr:`~magrathea.core.feed.entry.Entry.fingerprint`) of its entries, the
+    information of their feeds and the renderer's signature. A page is only rendered again
+    if its dependencies have changed since the previous build::
+
+       >>> builder = Builder('/srv/planet/build', SimpleRenderer(), cache=cache)
+       >>> result = builder.build(Timeline(feeds))
+       >>> builder.written
+       ['page4.html', 'index.html']
+
+    Pages that do not exist anymore are removed from the build directory.
+
+    Pages are numbered by the position of their entries, counted from the oldest entry ever
+    built. Therefore, the builder keeps an anchor: the position of the oldest entry, the number
+    of entries and the sort key of the most recent one. Entries missing from the next build,
+    apart from those newer than the anchor, are taken as expired from the old end (as done by
+    time based policies), so expiring entries only empties the oldest pages instead of
+    shifting the entries of all pages.
+
+    Entries are streamed rather than collected: the builder counts the entries first, then
+    renders the pages one by one, while a background thread pulls the entries of the next
+    page (see :py:func:`prefetch`). Thus, peak memory is bounded by a few pages instead of
+    the whole archive. Each page is written to a temporary file first and renamed afterwards,
+    so the build directory never holds partially written pages.
+
+    :param str build_dir: directory the pages are written into
+    :param renderer:      renderer object (see :py:class:`SimpleRenderer`)
+    :param cache:         :py:class:`~magrathea.core.cache.Cache` instance (or any other dictionary-like
+                          object) keeping the dependencies across builds, or ``None``
+    :param int paginate:  number of entries per page
+                          (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CONF_PAGINATE_VAL`)
+    :raises ValueError:   if paginate is not a positive number
+    """
+
+    def __init__(self, build_dir, renderer, cache=None, paginate=None):
+        self._build_dir = build_dir
+        self._renderer = renderer
+        self._cache = cache if cache is not None else {}
+        self._paginate = int(paginate if paginate is not None else get_conf('PLANET_CONF_PAGINATE_VAL'))
+        if self._paginate < 1:
+            raise ValueError("paginate must be a positive number: {}".format(paginate))
+        # keys are kept as native strings, as dbm modules on Python 2 reject unicode keys
+        key = to_str(compact_key(os.path.abspath(build_dir)))
+        self._key = '{}{}'.format(PAGES_PREFIX, key)
+        self._anchor_key = '{}{}'.format(ANCHOR_PREFIX, key)
+        self._written = []
+
+    @property
+    def written(self):
+        """File names of the pages written by the most recent build"""
+        return self._written[:]
+
+    def build(self, entries, force=False):
+        """
+        Build the pages holding the given entries.
+
+        :param entries:    iterable of :py:class:`~magrathea.core.feed.entry.Entry` instances,
+                           in descending order (e. g. a :py:class:`~magrathea.core.timeline.Timeline`).
+                           Iterables other than plain iterators are iterated twice.
+        :param bool force: if true, render all pages regardless of their dependencies
+        :returns: :py:class:`~magrathea.core.result.Result` instance
+        """
+        op_result = Result()
+        previous = self._cache.get(self._key) or {}
+        current = {}
+        rendered = 0
+        newest = None
+        self._written = []
+        pages = None
+        try:
+            comp_makedirs(self._build_dir, exist_ok=True)
+            entries, total = self._count(entries)
+            anchor = self._cache.get(self._anchor_key)
+            offset = self._get_offset(entries, total, anchor)
+            if anchor:
+                # kept, in case there are no entries at all
+                newest = anchor[2]
+            pages = prefetch(iter_pages(entries, self._paginate, total, offset))
+            for page in pages:
+                if page.is_index and page.entries:
+                    newest = page.entries[0].key or ''
+                dependencies = self._get_dependencies(page)
+                current[page.number] = (page.name, dependencies)
+                names = [page.name, INDEX_NAME] if page.is_index else [page.name]
+                if not force and previous.get(page.number) == current[page.number] and \
+                        all(os.path.exists(os.path.join(self._build_dir, name)) for name in names):
+                    continue
+                start = counter()
+                self._write(page, names)
+                op_result.debug("rendered {}".format(page.name), page=page.name, duration=counter() - start)
+                self._written.extend(names)
+                for entry in page.entries:
+                    entry.forget()
+                rendered += 1
+            names = set(name for name, __ in current.values())
+            for name, __ in previous.values():
+                path = os.path.join(self._build_dir, name)
+                if name not in names and os.path.exists(path):
+                    os.unlink(path)
+        except (EnvironmentError, UnicodeError, RenderError) as e:
+            op_result.fail("Error {}".format(e))
+            return op_result
+        finally:
+            if pages is not None:
+                pages.close()
+        self._cache[self._key] = current
+        self._cache[self._anchor_key] = (offset, total, newest)
+        op_result.succeed("rendered {} of {} pages into {}".format(rendered, len(current), self._build_dir))
+        return op_result
+
+    @staticmethod
+    def _count(entries):
+        """
+        Count entries without keeping them, unless they can be iterated only once.
+
+        :param entries: iterable of :py:class:`~magrathea.core.feed.entry.Entry` instances
+        :returns: tuple of an iterable over the entries and their number
+        """
+        if hasattr(entries, '__len__'):
+            return entries, len(entries)
+        with span('merge'):
+            if iter(entries) is entries:
+                entries = list(entries)
+                return entries, len(entries)
+            return entries, sum(1 for __ in entries)
+
+    @staticmethod
+    def _get_offset(entries, total, anchor):
+        """
+        Get the position of the oldest entry, counted from the oldest entry ever built.
+
+        :param entries:   iterable of :py:class:`~magrathea.core.feed.entry.Entry` instances, in descending order
+        :param int total: number of entries
+        :param anchor:    tuple of the previous build's offset, number of entries and most recent
+                          entry's sort key, or ``None``
+        :returns: the offset
+        """
+        if not anchor or anchor[2] is None:
+            return 0
+        offset, previous, newest = anchor
+        added = 0
+        with span('merge'):
+            for entry in entries:
+                if (entry.key or '') <= newest:
+                    break
+                added += 1
+        return offset + max(0, previous + added - total)
+
+    def _get_dependencies(self, page):
+        """
+        Get the dependencies of a page.
+
+        :param page: :py:class:`Page` instance
+        :returns: digest of the renderer's signature, the page's neighbours and its entries' identities
+        """
+        values = [repr(self._renderer.signature), page.newer, page.older]
+        for entry in page.entries:
+            info = entry.feed
+            values.extend((entry.id, entry.fingerprint))
+            if info is not None:
+                values.extend((info.author, info.title, info.uri))
+            else:
+                values.extend((None, None, None))
+        return compact_key('\0'.join(to_str_list(values)))
+
+    def _write(self, page, names):
+        """
+        Render a page and write it into the build directory. Each file is written to a
+        temporary file first, which then replaces the file atomically.
+
+        :param page:       :py:class:`Page` instance
+        :param list names: file names the page is written to
+        """
+        with span('render'):
+            content = to_str(self._renderer.render(page))
+        for name in names:
+            path = os.path.join(self._build_dir, name)
+            temp = os.path.join(self._build_dir, '.{}.{}.tmp'.format(name, os.getpid()))
+            try:
+                with span('write'), comp_open(temp, mode='w', encoding=get_conf('CHARSET')) as fp:
+                    fp.write(content)
+                comp_replace(temp, path)
+            finally:
+                if os.path.exists(temp):
+                    os.unlink(temp)
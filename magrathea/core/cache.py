@@ -6,11 +6,16 @@
     :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
     :license: MIT License, see LICENSE for details.
 """
+import atexit
 import os
-import shelve
+import threading
+from contextlib import contextmanager
+from .storage import open_storage, migrate_keys
 from ..conf import get_conf
 from ..utils.singleton import Singleton
 from ..utils.dynamic import DynamicIterable
+from ..utils.lru import LRUDict
+from ..utils.metrics import span
 
 
 @Singleton
@@ -61,7 +66,7 @@ class Cache(DynamicIterable):
        >>> cache['foo']
        'baz'
 
-    All insert, update and delete operations are synchronized into a :py:mod:`shelve` persistence
+    All insert, update and delete operations are synchronized into a persistence
     storage. This storage is also consulted when asked for a specific item::
 
        >>> cache = Cache.get_instance('/tmp/my_cache')
@@ -79,15 +84,71 @@ class Cache(DynamicIterable):
        method) is hugely expensive, since the full content of the database is synchronized into
        the cache container object.
 
+    The backing database is opened once and kept open for the lifetime of the cache object
+    (or until :py:meth:`~magrathea.core.cache.Cache.close` is called, see below). Outside of
+    a batch, each write operation is flushed to disk right away. Many write operations can be
+    grouped into a batch, being flushed only once when the batch has been completed::
+
+       >>> cache = Cache.get_instance('/tmp/my_cache')
+       >>> with cache.batch():
+       ...     for number in range(10000):
+       ...         cache['item-{}'.format(number)] = number
+
+    Batches can be nested; only the outermost batch flushes. The database is closed
+    automatically on interpreter exit, but may be closed explicitly using
+    :py:meth:`~magrathea.core.cache.Cache.close`. Any later access re-opens it.
+
+    Two storage backends are available (see :py:mod:`magrathea.core.storage`): the default one
+    based on :py:mod:`shelve`, and one based on :py:mod:`sqlite3`, which keeps feed entries in
+    an indexed table. The latter answers :py:meth:`~magrathea.core.cache.Cache.query_entries`
+    without loading any entries but the ones requested::
+
+       >>> cache = Cache.get_instance('/tmp/my_cache', backend='sqlite')
+       >>> latest = cache.query_entries(limit=10, since='20140101000000')
+
+    Items loaded from or written to the database are kept in memory, but only up to a limit:
+    when it has been reached, the least recently used item is dropped from memory (it remains
+    in the database, of course). The cache's :py:attr:`~magrathea.core.cache.Cache.stats` tell
+    how well the in-memory tier performs::
+
+       >>> cache = Cache.get_instance('/tmp/my_cache', memory_limit=1000)
+       >>> cache.stats
+       {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'limit': 1000}
+
     :param str db_file: Path to the database file to be used for backing this cache object
+    :param str backend: Storage backend to be used
+                        (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CACHE_BACKEND`)
+    :param int memory_limit: Maximum number of items kept in memory, or ``None`` for no limit
+                             (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CACHE_MEMORY_LIMIT`)
     """
 
     #: name of the database file to be used
     _db_file = None
 
+    #: storage backend to be used
+    _backend = None
+
     #: protocol version to use for :py:mod:`pickle`
     _protocol = 0
 
+    #: handle of the open database, or ``None``
+    _db = None
+
+    #: nesting depth of running batches
+    _batch_depth = 0
+
+    #: true while items loaded from the database are inserted into the cache object
+    _loading = False
+
+    #: true once :py:meth:`close` has been registered to run on interpreter exit
+    _registered = False
+
+    #: number of lookups answered from memory
+    _hits = 0
+
+    #: number of lookups that had to consult the database
+    _misses = 0
+
     def __init__(self, *args, **kwargs):
         if len(args) > 0:
             self._db_file = args[0]
@@ -97,10 +158,18 @@ class Cache(DynamicIterable):
             self._db_file = kwargs['db_file']
         if not self._db_file:
             self._db_file = get_conf('PLANET_CACHE_FILE')
+        if 'backend' in kwargs:
+            self._backend = kwargs['backend']
+        if not self._backend:
+            self._backend = get_conf('PLANET_CACHE_BACKEND')
+
+        memory_limit = kwargs.get('memory_limit', get_conf('PLANET_CACHE_MEMORY_LIMIT'))
 
         self._protocol = get_conf('PICKLE_PROTOCOL')
+        self._lock = threading.RLock()
 
         DynamicIterable.__init__(self)
+        self.data = LRUDict(memory_limit)
         self.register_hook('pre-get', self._hook_get_sync)
         self.register_hook('post-set', self._hook_set_sync)
         self.register_hook('post-del', self._hook_del_sync)
@@ -119,11 +188,89 @@ class Cache(DynamicIterable):
            cache object usually behaves lazily. Therefore, data only present
            within the database and not yet loaded will be lost.
         """
-        os.unlink(self._db_file)
-        db = shelve.open(self._db_file, flag='n', protocol=self._protocol, writeback=True)
-        for key, value in self.data.items():
-            db[key] = value
-        db.close()
+        with self._lock:
+            self.close()
+            # flag 'n' always creates a new, empty database, whatever implementation is used
+            db = open_storage(self._db_file, backend=self._backend, flag='n', protocol=self._protocol)
+            for key, value in self.data.items():
+                db[key] = value
+            db.close()
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager grouping write operations. Writes within a batch are not flushed
+        individually, but only once when the (outermost) batch is left::
+
+           with cache.batch():
+               cache['foo'] = 'bar'
+               cache['baz'] = 'qux'
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.flush()
+
+    @property
+    def stats(self):
+        """
+        Statistics of the in-memory tier: a dictionary holding the number of lookups answered
+        from memory (``hits``), the number of lookups that had to consult the database (``misses``),
+        the number of items dropped from memory (``evictions``), the number of items currently held
+        in memory (``size``) and the maximum number of items held in memory (``limit``).
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self.data.evictions,
+            'size': len(self.data),
+            'limit': self.data.limit
+        }
+
+    def flush(self):
+        """
+        Write all pending changes to the backing database file.
+        """
+        with self._lock, span('cache-write'):
+            if self._db is not None:
+                self._db.sync()
+
+    def query_entries(self, limit=None, since=None, feeds=None):
+        """
+        Query the most recent feed entries directly from the backing database,
+        in descending order.
+
+        :param int limit: maximum number of entries, or ``None`` for all
+        :param str since: sort key (see :py:attr:`~magrathea.core.feed.entry.Entry.key`) of the oldest
+                          entries to be included, or ``None``
+        :param feeds:     keys of the feeds to be included (as :py:class:`str`), or ``None`` for all
+        :returns: list of :py:class:`~magrathea.core.feed.entry.Entry` instances
+        """
+        with self._lock:
+            return self._get_db().query_entries(limit=limit, since=since, feeds=feeds)
+
+    def close(self):
+        """
+        Flush all pending changes and close the backing database file. The cache object
+        remains usable; the database is re-opened on the next access. Closing a cache that
+        is not open does nothing, and so does closing a cache whose database has been
+        removed together with its directory.
+        """
+        with self._lock:
+            db, self._db = self._db, None
+            if db is None:
+                return
+            try:
+                db.close()
+            except EnvironmentError:
+                # pending changes cannot be flushed anywhere, once the directory has gone
+                if os.path.isdir(os.path.dirname(os.path.abspath(self._db_file))):
+                    raise
 
     def erase(self):
         """
@@ -159,46 +306,86 @@ class Cache(DynamicIterable):
         external :py:func:`del` interface. However, this also means this
         method will fail in cases the database file is damaged or otherwise
         not properly accessible (e. g. due to format changes).
+
+        Items only present in the database (i. e. not held in memory) are deleted as well.
         """
-        items = [item for item in self.keys()]
-        for item in items:
-            del self[item]
+        with self._lock:
+            items = set(self.data.keys()) | set(self._get_db().keys())
+        with self.batch():
+            for item in items:
+                del self[item]
 
     def __repr__(self):
         """
-        Override original ``__repr__`` method. Before returning, sync all objects from the
-        database into the internal data store.
+        Override original ``__repr__`` method. Instead of the items held in memory,
+        represent all items of the database.
 
         .. warning::
 
            Where calls to :py:meth:`~magrathea.core.cache.Cache.__contains__` and
            :py:meth:`~magrathea.core.cache.Cache.__getattr__` behave lazily (i. e. they
-           only access the backing :py:mod:`shelve` store only for retrieving one particular
+           only access the backing storage only for retrieving one particular
            member), calling the :py:meth:`~magrathea.core.cache.Cache.__repr__` method (e. g.
-           by addressing the object directly) will synchronize the full :py:mod:`shelve` store
-           into the living object. This might be very time-consuming!
-
-        .. note::
-
-           Unfortunately, we just cannot abuse ``self.update()`` here, since in Python 2.7,
-           this is implemented as ``self.data.update()``, which does not trigger the
-           :py:meth:`~magrathea.utils.dynamic.DynamicIterable.__setitem__` method to be run.
-           Consequently, the :py:meth:`~magrathea.utils.dynamic.DynamicIterable.__add_property`
-           method is also not run, and therefore this way will end up with a correctly working
-           dictionary interface, but with missing properties, having both in a non-synced state.
-
-           Therefore, we have to resort to copying keys and values item-wise from the database
-           backend. Please note that in the Python 3 implementation of :py:class:`collections.UserDict`,
-           this behaviour has changed -- ``self`` is triggered directly, so the
-           :py:meth:`~magrathea.utils.dynamic.DynamicIterable.__setitem__` method would be
-           triggered.
-        """
-        db = shelve.open(self._db_file, flag='c', protocol=self._protocol, writeback=True)
-        temp_dict = dict(db.items())
-        db.close()
-        for key, value in temp_dict.items():
+           by addressing the object directly) will load the full storage. This might be very
+           time-consuming!
+        """
+        with self._lock:
+            return repr(dict(self._get_db().items()))
+
+    def __getitem__(self, key):
+        """
+        Look up an item, holding the lock, so the item loaded from the database is not
+        evicted by another thread before being read.
+        """
+        with self._lock:
+            return DynamicIterable.__getitem__(self, key)
+
+    def __setitem__(self, key, item, **kwargs):
+        """
+        Insert an item, holding the lock, since inserting may evict other items from memory.
+        """
+        with self._lock:
+            DynamicIterable.__setitem__(self, key, item, **kwargs)
+
+    def __delitem__(self, key, **kwargs):
+        """
+        Delete an item, holding the lock.
+        """
+        with self._lock:
+            DynamicIterable.__delitem__(self, key, **kwargs)
+
+    def _get_db(self):
+        """
+        Get the handle of the backing database, opening the database if necessary.
+
+        :returns: the storage object backing this cache
+        """
+        if self._db is None:
+            self._db = open_storage(self._db_file, backend=self._backend, protocol=self._protocol)
+            # caches written by older versions are migrated once, when first opened
+            migrate_keys(self._db)
+            if not self._registered:
+                atexit.register(self.close)
+                self._registered = True
+        return self._db
+
+    def _load(self, key, value):
+        """
+        Insert an item loaded from the database into the cache object, without
+        writing it back to the database.
+        """
+        self._loading = True
+        try:
             self[key] = value
-        return DynamicIterable.__repr__(self)
+        finally:
+            self._loading = False
+
+    def _commit(self):
+        """
+        Flush the database, unless a batch is running.
+        """
+        if not self._batch_depth:
+            self._db.sync()
 
     def _hook_get_sync(self, key, value):
         """
@@ -207,35 +394,42 @@ class Cache(DynamicIterable):
 
         To be applied as pre-get hook.
         """
-        if key not in self.data:
-            db = shelve.open(self._db_file, flag='c', protocol=self._protocol, writeback=True)
+        if self._loading:
+            return key, value
+        with self._lock:
+            if self.data.touch(key):
+                self._hits += 1
+                return key, value
+            self._misses += 1
             try:
-                data = db[key]
+                with span('cache-read'):
+                    data = self._get_db()[key]
             except KeyError:
-                data = None
-            db.close()
-            if data:
-                self.__setitem__(self, key, data)
+                return key, value
+            self._load(key, data)
         return key, value
 
     def _hook_set_sync(self, key, value):
         """
-        Hook ensuring inserted data is synced into the backing shelve database.
+        Hook ensuring inserted data is synced into the backing database.
 
         To be applied as post-set hook.
         """
-        db = shelve.open(self._db_file, flag='c', protocol=self._protocol, writeback=True)
-        db[key] = value
-        db.close()
+        if not self._loading:
+            with self._lock, span('cache-write'):
+                self._get_db()[key] = value
+                self._commit()
         return key, value
 
     def _hook_del_sync(self, key, value):
         """
-        Hook ensuring data deletion is synced to the backing shelve database.
+        Hook ensuring data deletion is synced to the backing database.
 
         To be applied as post-del hook.
         """
-        db = shelve.open(self._db_file, flag='c', protocol=self._protocol, writeback=True)
-        del db[key]
-        db.close()
+        with self._lock:
+            db = self._get_db()
+            if key in db:
+                del db[key]
+                self._commit()
         return key, value
@@ -36,6 +36,7 @@ class FeedError(MagratheaError):
         self._href = ''
         self._title = ''
         self._type = ''
+        self._reason = ''
         super(FeedError, self).__init__(*args, **kwargs)
 
 
@@ -72,3 +73,43 @@ class FeedMovedError(FeedError):
             return "An unknown feed has permanently moved to {href}.".format(href=self._href)
         else:
             return "A feed has permanently moved (no details available)."
+
+
+class FeedFetchError(FeedError):
+    """
+    Feed Fetch Error
+
+    This exception is raised when a feed could not be downloaded, e. g. due to
+    a network failure, a timeout or an HTTP error status other than 410.
+    """
+    def __str__(self):
+        if self._uri and self._reason:
+            return "The feed at {uri} could not be fetched: {reason}".format(uri=self._uri, reason=self._reason)
+        elif self._uri and not self._reason:
+            return "The feed at {uri} could not be fetched.".format(uri=self._uri)
+        else:
+            return "A feed could not be fetched (no details available)."
+
+
+# Build Exceptions
+
+class RenderError(MagratheaError):
+    """
+    Render Error
+
+    This exception is raised when a page could not be rendered, e. g. due to
+    a broken or missing template.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._page = ''
+        self._reason = ''
+        super(RenderError, self).__init__(*args, **kwargs)
+
+    def __str__(self):
+        if self._page and self._reason:
+            return "The page {page} could not be rendered: {reason}".format(page=self._page, reason=self._reason)
+        elif self._page and not self._reason:
+            return "The page {page} could not be rendered.".format(page=self._page)
+        else:
+            return "A page could not be rendered (no details available)."
@@ -9,3 +9,4 @@
 
 # Convenience import
 from .feed import Feed
+from .fetch import Fetcher
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.core.feed.aio
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import asyncio
+import ssl
+from urllib.parse import urljoin, urlsplit
+from ...conf import get_conf
+from ...utils.metrics import span
+from ...utils.timer import counter
+from .fetch import Response, FetchResult, _decode_content
+
+#: Maximum number of redirects followed for one feed document
+MAX_REDIRECTS = 5
+
+#: HTTP status codes indicating a redirect
+REDIRECT_STATES = (301, 302, 303, 307, 308)
+
+
+class HostLimiter(object):
+    """
+    Registry of semaphores limiting the number of concurrent connections per host,
+    so a single slow server cannot occupy all connections of an event loop.
+
+    :param int limit: maximum number of concurrent connections per host
+                      (defaults to :py:data:`~magrathea.conf.default.DEFAULT_FEED_FETCH_HOST_LIMIT`)
+    """
+
+    def __init__(self, limit=None):
+        self._limit = limit or get_conf('FEED_FETCH_HOST_LIMIT')
+        self._semaphores = {}
+
+    @property
+    def limit(self):
+        """Maximum number of concurrent connections per host"""
+        return self._limit
+
+    def get(self, host):
+        """
+        Get the semaphore guarding a host.
+
+        :param str host: host name (optionally including the port)
+        :returns: an :py:class:`asyncio.Semaphore` instance
+        """
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self._limit)
+        return self._semaphores[host]
+
+
+async def _read_body(reader, headers):
+    """
+    Read the body of an HTTP response.
+
+    :param reader:       :py:class:`asyncio.StreamReader` positioned at the start of the body
+    :param dict headers: response headers (lower case names)
+    :returns: raw response body
+    """
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip(), 16)
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return b''.join(chunks)
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    return await reader.read()
+
+
+async def _request(uri, request_headers):
+    """
+    Perform a single HTTP GET request without following redirects.
+
+    :param str uri:              absolute ``http`` or ``https`` URI
+    :param dict request_headers: additional request headers
+    :returns: tuple of status, response headers (lower case names) and raw body
+    """
+    parts = urlsplit(uri)
+    if parts.scheme not in ('http', 'https'):
+        raise ValueError("unsupported URI scheme: {}".format(parts.scheme))
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    reader, writer = await asyncio.open_connection(
+        parts.hostname,
+        port,
+        ssl=ssl.create_default_context() if secure else None
+    )
+    try:
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        lines = ['GET {} HTTP/1.1'.format(path), 'Host: {}'.format(parts.netloc), 'Connection: close']
+        for name, value in request_headers.items():
+            lines.append('{}: {}'.format(name, value))
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        status_line = (await reader.readline()).decode('latin-1').split(None, 2)
+        if len(status_line) < 2 or not status_line[0].startswith('HTTP/'):
+            raise ValueError("malformed HTTP status line")
+        status = int(status_line[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+            if not line:
+                break
+            name, __, value = line.partition(':')
+            name = name.strip().lower()
+            if name in headers:
+                headers[name] = headers[name] + ', ' + value.strip()
+            else:
+                headers[name] = value.strip()
+        if status == 304 or status == 204 or 100 <= status < 200:
+            body = b''
+        else:
+            body = await _read_body(reader, headers)
+    finally:
+        writer.close()
+        # waiting for the connection to be closed requires Python 3.7 or newer
+        if hasattr(writer, 'wait_closed'):
+            try:
+                await writer.wait_closed()
+            except EnvironmentError:
+                # the response is complete (or has failed already), however the connection ends
+                pass
+    return status, headers, body
+
+
+async def adownload(uri, etag=None, modified=None, timeout=None, limiter=None):
+    """
+    Asynchronous counterpart of :py:func:`~magrathea.core.feed.fetch.download`.
+
+    Redirects are followed (up to :py:data:`MAX_REDIRECTS`); if any of them is
+    permanent, the status of the returned response is 301.
+
+    :param str uri:      URI of the feed document
+    :param str etag:     Etag from a previous download, sent as ``If-None-Match``
+    :param str modified: Last-Modified value from a previous download, sent as ``If-Modified-Since``
+    :param timeout:      timeout in seconds for each request, or ``None`` for no timeout
+    :param limiter:      a :py:class:`~magrathea.core.feed.aio.HostLimiter` instance, or ``None``
+    :returns: a :py:class:`~magrathea.core.feed.fetch.Response` instance
+    """
+    request_headers = {
+        'User-Agent': get_conf('DEFAULT_FEED_USER_AGENT'),
+        'Accept-Encoding': 'gzip, deflate'
+    }
+    if etag:
+        request_headers['If-None-Match'] = etag
+    if modified:
+        request_headers['If-Modified-Since'] = modified
+    permanent = False
+    for __ in range(MAX_REDIRECTS + 1):
+        if limiter is None:
+            status, headers, body = await asyncio.wait_for(_request(uri, request_headers), timeout)
+        else:
+            async with limiter.get(urlsplit(uri).netloc):
+                status, headers, body = await asyncio.wait_for(_request(uri, request_headers), timeout)
+        if status in REDIRECT_STATES and 'location' in headers:
+            permanent = permanent or status == 301
+            uri = urljoin(uri, headers['location'])
+            continue
+        break
+    else:
+        raise ValueError("too many redirects")
+    body = _decode_content(body, headers.get('content-encoding'))
+    headers.setdefault('content-location', uri)
+    if permanent and status < 300:
+        status = 301
+    return Response(status, headers, body, uri)
+
+
+async def update_feed(feed, timeout=None, limiter=None):
+    """
+    Update a feed without blocking the event loop. Usually, this coroutine is not
+    awaited directly, but via :py:meth:`~magrathea.core.feed.feed.Feed.aupdate`.
+
+    The feed document is downloaded within the event loop, while parsing it and syncing
+    the feed into its cache run in the loop's default executor, so they do not hold up
+    the other downloads.
+
+    :param feed:    the :py:class:`~magrathea.core.feed.feed.Feed` instance to be updated
+    :param timeout: timeout in seconds for downloading the feed document, or ``None`` for no timeout
+    :param limiter: a :py:class:`~magrathea.core.feed.aio.HostLimiter` instance, or ``None``
+    """
+    validators = feed._begin_update()
+    if validators is None:
+        return
+    loop = asyncio.get_event_loop()
+    try:
+        with span('fetch'):
+            response = await adownload(feed.uri, timeout=timeout, limiter=limiter, **validators)
+    except (EnvironmentError, ValueError, EOFError, asyncio.TimeoutError) as e:
+        # always raises FeedFetchError
+        await loop.run_in_executor(None, feed._fail_update, e)
+        return
+    await loop.run_in_executor(None, feed.update_from_response, response)
+
+
+async def fetch_all(feeds, timeout=None, host_limit=None):
+    """
+    Asynchronous counterpart of :py:meth:`~magrathea.core.feed.fetch.Fetcher.fetch`: update
+    all feeds concurrently, limiting the number of concurrent connections per host::
+
+       results = await fetch_all(feeds, timeout=10, host_limit=2)
+
+    :param feeds:          iterable of :py:class:`~magrathea.core.feed.feed.Feed` instances
+    :param timeout:        timeout in seconds for each request
+                           (defaults to :py:data:`~magrathea.conf.default.DEFAULT_FEED_FETCH_TIMEOUT`)
+    :param int host_limit: maximum number of concurrent connections per host
+                           (defaults to :py:data:`~magrathea.conf.default.DEFAULT_FEED_FETCH_HOST_LIMIT`)
+    :returns: list of :py:class:`~magrathea.core.feed.fetch.FetchResult` instances,
+              in the same order as the feeds passed
+    """
+    limiter = HostLimiter(host_limit)
+    timeout = timeout or get_conf('FEED_FETCH_TIMEOUT')
+
+    async def fetch_one(feed):
+        error = None
+        start = counter()
+        try:
+            await feed.aupdate(timeout=timeout, limiter=limiter)
+        except Exception as e:
+            # a broken feed must never abort the whole run
+            error = e
+        return FetchResult.from_feed(feed, error=error, duration=counter() - start)
+
+    return list(await asyncio.gather(*[fetch_one(feed) for feed in feeds]))
@@ -8,9 +8,15 @@
 """
 import base64
 import calendar
+import hashlib
 import time
-from ...utils.convert import to_str, to_bytes
+from ...utils.convert import to_str, to_str_list
 from .info import FeedInfo
+from ...utils.digest import compact_key
+from ...utils.slots import Slotted
+
+#: marker for fields missing from a :py:mod:`feedparser` entry object
+_missing = object()
 
 
 def get_entry_id(entry):
@@ -19,24 +25,81 @@ def get_entry_id(entry):
     Magrathea uses this internally for a identifying entry objects.
 
     :param entry: :py:mod:`feedparser` entry object
+    :returns: compact key (see :py:func:`~magrathea.utils.digest.compact_key`) of
+              the entry's id or link
     """
     if hasattr(entry, 'id'):
-        return base64.b64encode(to_bytes(entry.id))
+        return compact_key(entry.id)
     if hasattr(entry, 'link'):
-        return base64.b64encode(to_bytes(entry.link))
+        return compact_key(entry.link)
     return None
 
 
-class Entry(object):
+def migrate_entry_id(entry):
+    """
+    Convert the identifier of an :py:class:`Entry` created by Magrathea versions
+    identifying entries by the Base64 encoded id or link into a compact key.
+
+    :param entry: :py:class:`Entry` instance
+    """
+    if entry._id is not None:
+        entry._id = compact_key(base64.b64decode(entry._id))
+
+
+def get_entry_fingerprint(entry):
+    """
+    Compute a fingerprint of the content of a :py:mod:`feedparser` entry object, covering
+    all fields an :py:class:`Entry` is made of (its dates, link, content, title and author).
+    Entries having the same fingerprint need not be parsed again.
+
+    :param entry: :py:mod:`feedparser` entry object
+    :returns: hexadecimal SHA-1 digest
+    """
+    get = entry.get
+    parts = []
+    for name in ('updated_parsed', 'published_parsed', 'created_parsed', 'expired_parsed'):
+        value = get(name)
+        parts.append('%04d%02d%02d%02d%02d%02d' % tuple(value[:6]) if value else '')
+    for name in ('link', 'description', 'title', 'author'):
+        parts.append(get(name))
+    for element in get('content', ()):
+        parts.append(element.value)
+    return hashlib.sha1('\0'.join(to_str_list(parts)).encode('utf-8', 'replace')).hexdigest()
+
+
+class Entry(Slotted):
     """
     Class representing a feed entry. To ease sorting of entries,
     each entry offers a sort key (``key`` property) constructed
     from its update date. If the feed does not provide the updated
     date, the publish date or the creation date are used.
 
+    Each entry carries a fingerprint of the fields it has been parsed
+    from (``fingerprint`` property), so updating an entry with unchanged
+    information costs neither parsing nor a cache write.
+
+    Since a planet holds many entries, entries keep their attributes
+    in ``__slots__`` (see :py:class:`~magrathea.utils.slots.Slotted`).
+    Values derived from the entry's fields (its body and its formatted
+    dates) are computed once and memoized until :py:meth:`update` changes
+    the entry. The memoized values are not pickled.
+
+    The fields themselves are taken from the :py:mod:`feedparser` entry
+    object right away. Deferring this would keep the whole feedparser
+    object alive, while taking a field only stores a reference to its
+    value. Moreover, entries are pickled into the cache as soon as they
+    have changed, which requires all of their fields anyway.
+
     :param entry: A :py:mod:`feedparser` entry object
     """
 
+    __slots__ = (
+        '_id', '_key', '_updated', '_expired', '_link', '_content', '_description', '_title', '_author', '_feed',
+        '_derived', '_fingerprint'
+    )
+
+    _transient = ('_derived',)
+
     def __init__(self, entry):
         self._id = get_entry_id(entry)
         self._key = None
@@ -48,6 +111,8 @@ class Entry(object):
         self._title = None
         self._author = None
         self._feed = None
+        self._derived = None
+        self._fingerprint = get_entry_fingerprint(entry)
         self._parse_entry(entry)
 
     def update(self, entry):
@@ -55,30 +120,65 @@ class Entry(object):
         Update feed entry with new information.
 
         :param entry: A :py:mod:`feedparser` entry object
+        :returns: ``True`` if the entry has changed, ``False`` otherwise
+        :rtype: bool
         """
+        fingerprint = get_entry_fingerprint(entry)
+        if fingerprint == self._fingerprint:
+            return False
+        self._fingerprint = fingerprint
+        self._derived = None
         self._parse_entry(entry)
+        return True
+
+    def forget(self):
+        """
+        Drop the memoized derived values (e. g. the body) to free the memory they occupy.
+        They are derived again once they are accessed next time.
+        """
+        self._derived = None
+
+    def _get_derived(self):
+        """
+        Get the memoized derived values, keyed by their name (and, if applicable, format).
+
+        :returns: dictionary
+        """
+        if self._derived is None:
+            self._derived = {}
+        return self._derived
 
     def _parse_entry(self, entry):
-        if hasattr(entry, 'updated_parsed'):
-            self._updated = entry.updated_parsed
-        if hasattr(entry, 'published_parsed') and not self._updated:
-            self._updated = entry.published_parsed
-        if hasattr(entry, 'created_parsed') and not self._updated:
-            self._updated = entry.created_parsed
-        if hasattr(entry, 'expired_parsed'):
-            self._updated = entry.expired_parsed
-        if hasattr(entry, 'link'):
-            self._link = entry.link
-        if hasattr(entry, 'content'):
-            self._content = []
-            for element in entry.content:
-                self._content.append(element.value)
-        if hasattr(entry, 'description'):
-            self._description = entry.description
-        if hasattr(entry, 'title'):
-            self._title = entry.title
-        if hasattr(entry, 'author'):
-            self._author = entry.author
+        # fields are looked up once each, as probing them by attribute costs feedparser
+        # a second lookup, plus an exception for each missing field
+        get = entry.get
+        value = get('updated_parsed', _missing)
+        if value is not _missing:
+            self._updated = value
+        for name in ('published_parsed', 'created_parsed'):
+            if not self._updated:
+                value = get(name, _missing)
+                if value is not _missing:
+                    self._updated = value
+        value = get('expired_parsed', _missing)
+        if value is not _missing:
+            self._updated = value
+        value = get('link', _missing)
+        if value is not _missing:
+            self._link = value
+        value = get('content', _missing)
+        if value is not _missing:
+            self._content = [element.value for element in value]
+        value = get('description', _missing)
+        if value is not _missing:
+            # the description only serves as body of entries without content
+            self._description = None if self._content else value
+        value = get('title', _missing)
+        if value is not _missing:
+            self._title = value
+        value = get('author', _missing)
+        if value is not _missing:
+            self._author = value
         if self._updated:
             self._key = time.strftime('%Y%m%d%H%M%S', self._updated)
 
@@ -89,6 +189,14 @@ class Entry(object):
         """
         return self._id
 
+    @property
+    def fingerprint(self):
+        """
+        Fingerprint of the information the entry has been parsed from
+        (see :py:func:`~magrathea.core.feed.entry.get_entry_fingerprint`)
+        """
+        return self._fingerprint
+
     @property
     def key(self):
         """
@@ -101,12 +209,19 @@ class Entry(object):
         """
         Content body of the entry
         """
+        derived = self._get_derived()
+        try:
+            return derived['body']
+        except KeyError:
+            pass
         if self._content:
-            # noinspection PyTypeChecker
-            return " ".join(to_str(self._content))
-        if self._description:
-            return to_str(self._description)
-        return ""
+            body = " ".join(to_str_list(self._content))
+        elif self._description:
+            body = to_str(self._description)
+        else:
+            body = ""
+        derived['body'] = body
+        return body
 
     @property
     def title(self):
@@ -115,6 +230,13 @@ class Entry(object):
         """
         return to_str(self._title)
 
+    @property
+    def link(self):
+        """
+        Link to the entry
+        """
+        return to_str(self._link)
+
     @property
     def pubdate_gmt(self):
         """
@@ -127,7 +249,12 @@ class Entry(object):
         """
         Date when the entry was last updated, published or otherwise changed converted to local time
         """
-        return time.localtime(calendar.timegm(self._updated))
+        derived = self._get_derived()
+        try:
+            return derived['local']
+        except KeyError:
+            pubdate = derived['local'] = time.localtime(calendar.timegm(self._updated))
+            return pubdate
 
     @property
     def author(self):
@@ -158,7 +285,12 @@ class Entry(object):
 
         :param str format: format string understood by :py:func:`time.strftime`
         """
-        return time.strftime(format, self._updated)
+        derived = self._get_derived()
+        try:
+            return derived[('gmt', format)]
+        except KeyError:
+            pubdate = derived[('gmt', format)] = time.strftime(format, self._updated)
+            return pubdate
 
     def get_pubdate_local(self, format):
         """
@@ -167,4 +299,9 @@ class Entry(object):
 
         :param str format: format string understood by :py:func:`time.strftime`
         """
-        return time.strftime(format, time.localtime(calendar.timegm(self._updated)))
+        derived = self._get_derived()
+        try:
+            return derived[('local', format)]
+        except KeyError:
+            pubdate = derived[('local', format)] = time.strftime(format, self.pubdate_local)
+            return pubdate
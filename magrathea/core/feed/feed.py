@@ -6,13 +6,23 @@
     :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
     :license: MIT License, see LICENSE for details.
 """
-import base64
+import bisect
+import hashlib
+import time
 import feedparser
-from ..exceptions import FeedGoneError, FeedMovedError
-from ...utils.convert import to_bytes, to_str
-from .entry import Entry
+from ..exceptions import FeedFetchError, FeedGoneError, FeedMovedError
+from ...utils.convert import to_str
+from ...utils.digest import compact_key
+from ...utils.metrics import span
+from .entry import Entry, get_entry_id
+from .fetch import download
 from .info import FeedInfo
 
+try:
+    from http.client import HTTPException
+except ImportError:
+    from httplib import HTTPException
+
 
 class Feed(object):
     """
@@ -20,13 +30,23 @@ class Feed(object):
     If title and author are not specified, they will be guessed at the
     feed's first update.
 
+    If a cache is passed, the feed's conditional GET state (etag and last
+    modified validators, last status, last fetch time and content hash) as
+    well as its entries are persisted within the cache after each update
+    attempt, and restored from the cache when the feed object is created.
+    This way, a feed that has not changed is answered with 304 (Not Modified)
+    even by the first update within a new process.
+
     :param str uri: URI of the feed this object shall represent
-    :param str key: Base64 encoded URI of the feed this object shall represent
+    :param str key: key (see :py:attr:`key`) of the feed this object shall represent. The feed's
+                    URI is restored from the cache then.
     :param str title: Title to be tied with this feed
     :param str author: Author to be tied with this feed
+    :param cache: :py:class:`~magrathea.core.cache.Cache` instance (or any other dictionary-like
+                  object) used for persisting the feed's state
     """
 
-    def __init__(self, uri=None, key=None, title=None, author=None):
+    def __init__(self, uri=None, key=None, title=None, author=None, cache=None):
         self._author = author or None
         self._author_flag = True if author else False
         self._key = key or None
@@ -34,17 +54,22 @@ class Feed(object):
         self._title_flag = True if title else False
         self._uri = uri or None
         self._entries = []
+        self._keys = []
+        self._index = {}
         self._etag = None
         self._modified = None
         self._type = None
+        self._info = None
+        self._dirty = []
         if uri and not key:
-            self._key = base64.b64encode(to_bytes(uri))
-        if key and not uri:
-            self._uri = base64.b64decode(to_bytes(key))
-        self._title = None
-        self._author = None
+            self._key = compact_key(uri)
         self._update_flag = False
         self._gone = False
+        self._status = None
+        self._fetched = None
+        self._hash = None
+        self._cache = cache
+        self._load_state()
 
     @property
     def author(self):
@@ -58,8 +83,9 @@ class Feed(object):
     @property
     def key(self):
         """
-        Byte sequence identifying the feed. Granted to contain only printable characters.
-        Thus, this key can safely be used as :py:mod:`shelve` database key.
+        Byte sequence identifying the feed (see :py:func:`~magrathea.utils.digest.compact_key`).
+        Granted to contain only printable characters. Thus, this key can safely be used as
+        :py:mod:`shelve` database key.
         """
         return self._key
 
@@ -95,7 +121,7 @@ class Feed(object):
         """
         if not self._update_flag:
             self.update()
-        return sorted(self._entries, key=lambda entry: entry.key, reverse=False)
+        return self._entries[:]
 
     @property
     def entries_desc(self):
@@ -104,7 +130,35 @@ class Feed(object):
         """
         if not self._update_flag:
             self.update()
-        return sorted(self._entries, key=lambda entry: entry.key, reverse=True)
+        return self._entries[::-1]
+
+    @property
+    def dirty_entries(self):
+        """
+        List of entries added or changed by the most recent update of the feed. Unlike the
+        other properties, this one does not trigger an update.
+        """
+        return self._dirty[:]
+
+    def iter_entries(self, reverse=False, limit=None):
+        """
+        Iterate lazily over the feed's entries, ordered by their publishing date.
+
+        Since entries are kept in order, no sorting takes place. Therefore, retrieving
+        the latest *k* entries costs O(k), regardless of the total number of entries.
+
+        :param bool reverse: if true, iterate in descending order (most recent entry first)
+        :param int limit:    maximum number of entries to be returned, or ``None`` for all
+        :returns: iterator over :py:class:`~magrathea.core.feed.entry.Entry` instances
+        """
+        if not self._update_flag:
+            self.update()
+        count = len(self._entries)
+        if limit is not None:
+            count = min(count, limit)
+        if reverse:
+            return (self._entries[-index] for index in range(1, count + 1))
+        return (self._entries[index] for index in range(count))
 
     @property
     def etag(self):
@@ -133,7 +187,24 @@ class Feed(object):
             self.update()
         return self._type
 
-    def update(self):
+    @property
+    def fetched(self):
+        """
+        Time (in seconds since the epoch) of the most recent update attempt, or ``None``.
+        Querying this attribute does not trigger an update.
+        """
+        return self._fetched
+
+    @property
+    def status(self):
+        """
+        HTTP status of the most recent update attempt, or ``None`` if no response
+        has been received. Other than most feed attributes, querying the status
+        does not trigger an update.
+        """
+        return self._status
+
+    def update(self, timeout=None):
         """
         Update this feed object.
 
@@ -147,31 +218,199 @@ class Feed(object):
         If the feed represented by this instance has moved permanently, the
         update will be performed. In addition, a
         :py:exc:`~magrathea.core.exception.FeedMovedError` is raised.
+
+        If the feed cannot be downloaded at all, a
+        :py:exc:`~magrathea.core.exception.FeedFetchError` is raised.
+
+        :param timeout: socket timeout in seconds, or ``None`` for the global default
         """
-        if not self._uri:
+        validators = self._begin_update()
+        if validators is None:
             return
+        try:
+            response = download(self._uri, timeout=timeout, **validators)
+        except (EnvironmentError, ValueError, HTTPException) as e:
+            self._fail_update(e)
+        self.update_from_response(response)
+
+    def aupdate(self, timeout=None, limiter=None):
+        """
+        Asynchronous counterpart of :py:meth:`~magrathea.core.feed.feed.Feed.update`, returning an
+        awaitable to be run within an :py:mod:`asyncio` event loop::
+
+           await feed.aupdate()
+
+        The feed document is downloaded without blocking the event loop, then processed exactly
+        like a document downloaded by :py:meth:`~magrathea.core.feed.feed.Feed.update`.
+
+        .. note::
+
+           This method requires Python 3.5 or newer.
+
+        :param timeout: timeout in seconds for downloading the feed document, or ``None`` for no timeout
+        :param limiter: a :py:class:`~magrathea.core.feed.aio.HostLimiter` instance restricting the number
+                        of concurrent connections per host
+        :returns: awaitable performing the update
+        """
+        from .aio import update_feed
+        return update_feed(self, timeout=timeout, limiter=limiter)
+
+    def _begin_update(self):
+        """
+        Prepare an update attempt.
+
+        This method is intended to be called by the various update methods before
+        downloading the feed document. It is strongly advised to never call it directly.
+
+        :returns: dictionary of validators (``etag`` and ``modified``) to be used for a conditional
+                  download, or ``None`` if the feed document shall not be downloaded at all
+        """
+        if not self._uri:
+            return None
         if self._gone:
             raise FeedGoneError(uri=self._uri)
-        result = feedparser.parse(self._uri, etag=self._etag, modified=self._modified)
-        if hasattr(result, 'etag') and result.etag:
-            self._etag = result.etag
-        if hasattr(result, 'modified') and result.modified:
-            self._modified = result.modified
-        if hasattr(result, 'version') and result.version:
-            self._type = result.version
-        else:
-            self._type = 'unknown'
-        if hasattr(result, 'status') and result.status not in (304, 410):
-            self._update(result)
-        if hasattr(result, 'status') and result.status == 410:
+        self._status = None
+        return {'etag': self._etag, 'modified': self._modified}
+
+    def _fail_update(self, error):
+        """
+        Finish an update attempt that failed because the feed document could not be downloaded.
+
+        This method is intended to be called by the various update methods. It is strongly
+        advised to never call it directly.
+
+        :param error: the exception raised by the download
+        """
+        self._update_flag = True
+        self._save_state()
+        raise FeedFetchError(uri=self._uri, reason=str(error) or error.__class__.__name__)
+
+    def update_from_response(self, response):
+        """
+        Update this feed object from an already downloaded feed document.
+
+        The same rules as for :py:meth:`~magrathea.core.feed.feed.Feed.update` apply
+        concerning feeds having gone or moved permanently.
+
+        :param response: a :py:class:`~magrathea.core.feed.fetch.Response` instance
+        """
+        if response.etag:
+            self._etag = response.etag
+        if response.modified:
+            self._modified = response.modified
+        self._status = response.status
+        if response.status == 410:
             self._gone = True
+            self._save_state()
             raise FeedGoneError(uri=self._uri)
+        if response.status >= 400:
+            self._update_flag = True
+            self._save_state()
+            raise FeedFetchError(uri=self._uri, reason="HTTP status {}".format(response.status))
+        changed = False
+        if response.status != 304:
+            content_hash = hashlib.sha1(response.content).hexdigest()
+            # servers ignoring conditional requests may still deliver an unchanged document
+            if content_hash != self._hash:
+                with span('parse'):
+                    result = feedparser.parse(response.content, response_headers=response.headers)
+                    if hasattr(result, 'version') and result.version:
+                        self._type = result.version
+                    else:
+                        self._type = 'unknown'
+                    changed = self._update(result)
+                self._hash = content_hash
         self._update_flag = True
-        if hasattr(result, 'status') and result.status == 301:
-            if hasattr(result, 'href'):
-                raise FeedMovedError(href=result.href, uri=self._uri)
-            else:
-                raise FeedMovedError(uri=self._uri)
+        self._save_state(entries=changed)
+        if response.status == 301:
+            raise FeedMovedError(href=response.href, uri=self._uri)
+
+    def _get_cache_key(self, kind):
+        """
+        Get the cache key under which a specific kind of information about this feed is stored.
+
+        :param str kind: kind of information, either ``state`` or ``entries``
+        :returns: cache key
+        """
+        return "feed-{kind}:{key}".format(kind=kind, key=to_str(self._key))
+
+    def _load_state(self):
+        """
+        Restore the feed's state and entries from the cache, if available.
+
+        Validators are only restored along with the entries they belong to; otherwise
+        a conditional GET might be answered with 304 while no entries are known.
+        """
+        if self._cache is None or not self._key:
+            return
+        state_key = self._get_cache_key('state')
+        entries_key = self._get_cache_key('entries')
+        if state_key not in self._cache:
+            return
+        state = self._cache[state_key]
+        # the state keeps the reverse mapping of the feed's key
+        if not self._uri:
+            self._uri = state.get('uri')
+        self._status = state.get('status')
+        self._fetched = state.get('fetched')
+        self._gone = self._status == 410
+        if entries_key not in self._cache:
+            return
+        self._entries = list(self._cache[entries_key])
+        self._rebuild_index()
+        self._etag = state.get('etag')
+        self._modified = state.get('modified')
+        self._hash = state.get('hash')
+        self._type = state.get('type')
+        if not self._title_flag:
+            self._title = state.get('title')
+        if not self._author_flag:
+            self._author = state.get('author')
+        # entries unpickled one by one carry copies of the feed's information
+        self._attach_info(all_entries=True)
+
+    def _attach_info(self, all_entries=False):
+        """
+        Pass the feed's information to its entries. All entries share the same
+        :py:class:`~magrathea.core.feed.info.FeedInfo` instance, which is only replaced
+        once the feed's information changes.
+
+        :param bool all_entries: if true, check all entries, not only the dirty ones
+        :returns: ``True`` if the feed's information has changed, ``False`` otherwise
+        :rtype: bool
+        """
+        info = self._info
+        changed = info is None or (info.author, info.title, info.uri, info.type) != \
+            (self._author, self._title, self._uri, self._type)
+        if changed:
+            info = self._info = FeedInfo(self._author, self._title, self._uri, self._type)
+        for entry in self._entries if changed or all_entries else self._dirty:
+            if entry.feed is not info:
+                entry.feed = info
+        return changed
+
+    def _save_state(self, entries=False):
+        """
+        Persist the feed's state (and optionally its entries) into the cache, if available.
+
+        :param bool entries: if true, also persist the feed's entries
+        """
+        self._fetched = time.time()
+        if self._cache is None or not self._key:
+            return
+        if entries:
+            self._cache[self._get_cache_key('entries')] = self._entries
+        self._cache[self._get_cache_key('state')] = {
+            'uri': self._uri,
+            'etag': self._etag,
+            'modified': self._modified,
+            'status': self._status,
+            'fetched': self._fetched,
+            'hash': self._hash,
+            'type': self._type,
+            'title': self._title,
+            'author': self._author
+        }
 
     def _update(self, parser):
         """
@@ -181,8 +420,10 @@ class Feed(object):
         It is strongly advised to never call it directly.
 
         :param parser: A :py:mod:`feedparser` result object
+        :returns: ``True`` if the feed's entries need to be persisted, ``False`` otherwise
+        :rtype: bool
         """
-        self._update_entries(parser.entries)
+        self._dirty = self._update_entries(parser.entries)
         if not self._title_flag:
             if 'title' in parser.feed:
                 self._title = to_str(parser.feed.title)
@@ -193,23 +434,67 @@ class Feed(object):
                 recent_entry = self._get_entry_most_recent()
                 if recent_entry:
                     self._author = recent_entry.author
-        for entry in self._entries:
-            entry.feed = FeedInfo(self._author, self._title, self._uri, self._type)
+        return self._attach_info() or bool(self._dirty)
 
     def _update_entries(self, entries):
         """
         Update the feed's entries from a :py:mod:`feedparser` entries list.
 
         :param list entries: A list of :py:mod:`feedparser` entry objects
+        :returns: list of the entries added or changed
         """
+        dirty = []
         for entry in entries:
             if hasattr(entry, 'id'):
-                existing = self._get_entry_by_id(entry.id)
+                existing = self._get_entry_by_id(get_entry_id(entry))
                 if existing:
-                    index = self._entries.index(existing)
-                    self._entries[index].update(entry)
+                    sort_key = self._get_sort_key(existing)
+                    if not existing.update(entry):
+                        continue
+                    if self._get_sort_key(existing) != sort_key:
+                        self._remove_sorted(existing, sort_key)
+                        self._insert_sorted(existing)
+                    dirty.append(existing)
                 else:
-                    self._entries.append(Entry(entry))
+                    new_entry = Entry(entry)
+                    self._insert_sorted(new_entry)
+                    self._index[new_entry.id] = new_entry
+                    dirty.append(new_entry)
+        return dirty
+
+    @staticmethod
+    def _get_sort_key(entry):
+        """
+        Get the key an entry is sorted by. Entries without any date are sorted first.
+
+        :param entry: a :py:class:`~magrathea.core.feed.entry.Entry` instance
+        :returns: sort key string
+        """
+        return entry.key or ''
+
+    def _insert_sorted(self, entry):
+        """
+        Insert an entry into the list of entries, keeping it in ascending order.
+
+        :param entry: the :py:class:`~magrathea.core.feed.entry.Entry` instance to be inserted
+        """
+        sort_key = self._get_sort_key(entry)
+        position = bisect.bisect_right(self._keys, sort_key)
+        self._keys.insert(position, sort_key)
+        self._entries.insert(position, entry)
+
+    def _remove_sorted(self, entry, sort_key):
+        """
+        Remove an entry from the list of entries.
+
+        :param entry:        the :py:class:`~magrathea.core.feed.entry.Entry` instance to be removed
+        :param str sort_key: the sort key the entry has been inserted with
+        """
+        position = bisect.bisect_left(self._keys, sort_key)
+        while self._entries[position] is not entry:
+            position += 1
+        del self._keys[position]
+        del self._entries[position]
 
     def _get_entry_most_recent(self):
         """
@@ -218,7 +503,7 @@ class Feed(object):
         :return: a :py:class:`~magrathea.core.feed.entry.Entry` instance or ``None``.
         """
         try:
-            return sorted(self._entries, key=lambda entry: entry.key, reverse=True)[0]
+            return self._entries[-1]
         except IndexError:
             return None
 
@@ -229,16 +514,25 @@ class Feed(object):
         :param str entry_id: the string identifying an entry object.
         :return: a :py:class:`~magrathea.core.feed.entry.Entry` instance or ``None``.
         """
-        entries = self._get_entries_by_property('id', entry_id)
-        if entries and len(entries) == 1:
-            return entries[0]
-        elif entries and len(entries) > 1:
-            # try healing this issue
-            for entry in entries[1:]:
-                self._entries.remove(entry)
-            return entries[0]
-        else:
-            return None
+        return self._index.get(entry_id)
+
+    def _rebuild_index(self):
+        """
+        Rebuild the index mapping entry ids to entry objects from the list of entries,
+        and bring the list of entries into ascending order.
+
+        Should the list contain several entries sharing the same id, only the first
+        one is kept; all others are removed (healing duplicates).
+        """
+        self._index = {}
+        entries = []
+        for entry in self._entries:
+            if entry.id not in self._index:
+                self._index[entry.id] = entry
+                entries.append(entry)
+        entries.sort(key=self._get_sort_key)
+        self._entries = entries
+        self._keys = [self._get_sort_key(entry) for entry in entries]
 
     def _get_entries_by_property(self, item, value):
         """
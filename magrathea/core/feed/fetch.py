@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.core.feed.fetch
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import gzip
+import io
+import threading
+import zlib
+from ..exceptions import FeedGoneError
+from ...conf import get_conf
+from ...utils.metrics import timed
+from ...utils.timer import counter
+
+try:
+    from urllib.request import build_opener, HTTPRedirectHandler, Request
+    from urllib.error import HTTPError
+except ImportError:
+    from urllib2 import build_opener, HTTPRedirectHandler, Request, HTTPError
+
+
+class Response(object):
+    """
+    Raw result of downloading a feed document.
+
+    :param int status:   HTTP status code (200 for non-HTTP resources)
+    :param dict headers: response headers, with all header names converted to lower case
+    :param bytes content: raw (decompressed) document body
+    :param str href:     final URI of the document after following all redirects
+    """
+
+    def __init__(self, status, headers, content, href):
+        self._status = status
+        self._headers = headers
+        self._content = content
+        self._href = href
+
+    @property
+    def status(self):
+        """HTTP status code"""
+        return self._status
+
+    @property
+    def headers(self):
+        """Dictionary of response headers (lower case names)"""
+        return self._headers
+
+    @property
+    def content(self):
+        """Raw document body"""
+        return self._content
+
+    @property
+    def href(self):
+        """Final URI of the document"""
+        return self._href
+
+    @property
+    def etag(self):
+        """Etag provided by the web server, or ``None``"""
+        return self._headers.get('etag')
+
+    @property
+    def modified(self):
+        """Last-Modified header provided by the web server, or ``None``"""
+        return self._headers.get('last-modified')
+
+
+class _RedirectHandler(HTTPRedirectHandler, object):
+    """
+    Redirect handler recording whether a permanent redirect occurred
+    while following the redirect chain.
+    """
+
+    def __init__(self):
+        self.permanent = False
+
+    def http_error_301(self, req, fp, code, msg, headers):
+        self.permanent = True
+        return HTTPRedirectHandler.http_error_302(self, req, fp, code, msg, headers)
+
+
+def _decode_content(content, encoding):
+    """
+    Decompress a response body according to its content encoding.
+
+    :param bytes content:  raw response body
+    :param str encoding:   value of the ``Content-Encoding`` header
+    :returns: decompressed response body
+    """
+    if encoding == 'gzip':
+        return gzip.GzipFile(fileobj=io.BytesIO(content)).read()
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(content)
+        except zlib.error:
+            return zlib.decompress(content, -zlib.MAX_WBITS)
+    return content
+
+
+@timed('fetch')
+def download(uri, etag=None, modified=None, timeout=None):
+    """
+    Download a feed document, performing a conditional GET if validators are available.
+
+    HTTP error states (including 304 and 410) are reported through the status of the
+    returned :py:class:`~magrathea.core.feed.fetch.Response`. Transport errors (e. g.
+    unreachable hosts or timeouts) are propagated to the caller.
+
+    :param str uri:      URI of the feed document
+    :param str etag:     Etag from a previous download, sent as ``If-None-Match``
+    :param str modified: Last-Modified value from a previous download, sent as ``If-Modified-Since``
+    :param timeout:      socket timeout in seconds, or ``None`` for the global default
+    :returns: a :py:class:`~magrathea.core.feed.fetch.Response` instance
+    """
+    request = Request(uri)
+    request.add_header('User-Agent', get_conf('DEFAULT_FEED_USER_AGENT'))
+    request.add_header('Accept-Encoding', 'gzip, deflate')
+    if etag:
+        request.add_header('If-None-Match', etag)
+    if modified:
+        request.add_header('If-Modified-Since', modified)
+    redirect_handler = _RedirectHandler()
+    opener = build_opener(redirect_handler)
+    try:
+        if timeout is None:
+            handle = opener.open(request)
+        else:
+            handle = opener.open(request, timeout=timeout)
+    except HTTPError as e:
+        handle = e
+    try:
+        status = handle.getcode() or 200
+        headers = dict((name.lower(), value) for name, value in handle.info().items())
+        content = handle.read()
+        href = handle.geturl() or uri
+    finally:
+        handle.close()
+    content = _decode_content(content, headers.get('content-encoding'))
+    headers.setdefault('content-location', href)
+    if redirect_handler.permanent and status < 300:
+        status = 301
+    return Response(status, headers, content, href)
+
+
+class FetchResult(object):
+    """
+    Outcome of fetching one feed within a :py:class:`~magrathea.core.feed.fetch.Fetcher` run.
+
+    A fetch result evaluates to ``True`` if the feed could be updated without any error.
+    Note that a feed having moved permanently is updated nonetheless; the corresponding
+    :py:exc:`~magrathea.core.exceptions.FeedMovedError` is recorded as ``error``.
+
+    :param feed:     the :py:class:`~magrathea.core.feed.feed.Feed` instance this result belongs to
+    :param int status: HTTP status of the fetch, or ``None`` if no response was received
+    :param str etag: Etag known for the feed after the fetch
+    :param str modified: Last-Modified value known for the feed after the fetch
+    :param error:    exception raised while fetching, or ``None``
+    :param float duration: time (in fractional seconds) spent on this feed
+    """
+
+    def __init__(self, feed, status=None, etag=None, modified=None, error=None, duration=0.0):
+        self._feed = feed
+        self._status = status
+        self._etag = etag
+        self._modified = modified
+        self._error = error
+        self._duration = duration
+
+    def __bool__(self):
+        return self._error is None
+
+    __nonzero__ = __bool__
+
+    @classmethod
+    def from_feed(cls, feed, error=None, duration=0.0):
+        """
+        Create a fetch result from the state of a feed right after an update attempt.
+
+        :param feed:     the :py:class:`~magrathea.core.feed.feed.Feed` instance that has been updated
+        :param error:    exception raised by the update attempt, or ``None``
+        :param float duration: time (in fractional seconds) spent on the update attempt
+        :returns: a :py:class:`~magrathea.core.feed.fetch.FetchResult` instance
+        """
+        etag = None
+        modified = None
+        if feed.status is not None and not isinstance(error, FeedGoneError):
+            # read directly, as the properties would start another update of a feed that failed
+            etag = feed._etag
+            modified = feed._modified
+        return cls(feed, status=feed.status, etag=etag, modified=modified, error=error, duration=duration)
+
+    @property
+    def feed(self):
+        """The feed this result belongs to"""
+        return self._feed
+
+    @property
+    def key(self):
+        """Key of the feed this result belongs to"""
+        return self._feed.key
+
+    @property
+    def uri(self):
+        """URI of the feed this result belongs to"""
+        return self._feed.uri
+
+    @property
+    def status(self):
+        """HTTP status of the fetch, or ``None`` if no response was received"""
+        return self._status
+
+    @property
+    def etag(self):
+        """Etag known for the feed after the fetch"""
+        return self._etag
+
+    @property
+    def modified(self):
+        """Last-Modified value known for the feed after the fetch"""
+        return self._modified
+
+    @property
+    def error(self):
+        """Exception raised while fetching the feed, or ``None``"""
+        return self._error
+
+    @property
+    def duration(self):
+        """Time (in fractional seconds) spent on fetching the feed"""
+        return self._duration
+
+
+class Fetcher(object):
+    """
+    Fetch engine refreshing a set of :py:class:`~magrathea.core.feed.feed.Feed` objects in parallel,
+    using a bounded pool of worker threads::
+
+       >>> fetcher = Fetcher(workers=16, timeout=10)
+       >>> for result in fetcher.fetch(feeds):
+       ...     if not result:
+       ...         print(result.error)
+
+    Errors never abort a run. Instead, they are recorded within the
+    :py:class:`~magrathea.core.feed.fetch.FetchResult` of the feed concerned.
+
+    :param int workers: maximum number of feeds being fetched concurrently
+                        (defaults to :py:data:`~magrathea.conf.default.DEFAULT_FEED_FETCH_WORKERS`)
+    :param timeout:     socket timeout in seconds applied to each feed
+                        (defaults to :py:data:`~magrathea.conf.default.DEFAULT_FEED_FETCH_TIMEOUT`)
+    """
+
+    def __init__(self, workers=None, timeout=None):
+        self._workers = workers or get_conf('FEED_FETCH_WORKERS')
+        self._timeout = timeout or get_conf('FEED_FETCH_TIMEOUT')
+
+    @property
+    def workers(self):
+        """Maximum number of feeds being fetched concurrently"""
+        return self._workers
+
+    @property
+    def timeout(self):
+        """Socket timeout in seconds applied to each feed"""
+        return self._timeout
+
+    def fetch(self, feeds):
+        """
+        Fetch all feeds and wait until every feed has been processed.
+
+        :param feeds: iterable of :py:class:`~magrathea.core.feed.feed.Feed` instances
+        :returns: list of :py:class:`~magrathea.core.feed.fetch.FetchResult` instances,
+                  in the same order as the feeds passed
+        """
+        feeds = list(feeds)
+        results = [None] * len(feeds)
+        pending = iter(enumerate(feeds))
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    try:
+                        index, feed = next(pending)
+                    except StopIteration:
+                        return
+                results[index] = self._fetch_one(feed)
+
+        threads = [threading.Thread(target=worker) for __ in range(min(self._workers, len(feeds)))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _fetch_one(self, feed):
+        """
+        Update a single feed and record the outcome.
+
+        :param feed: the :py:class:`~magrathea.core.feed.feed.Feed` instance to be updated
+        :returns: a :py:class:`~magrathea.core.feed.fetch.FetchResult` instance
+        """
+        error = None
+        start = counter()
+        try:
+            feed.update(timeout=self._timeout)
+        except Exception as e:
+            # a broken feed must never abort the whole run
+            error = e
+        return FetchResult.from_feed(feed, error=error, duration=counter() - start)
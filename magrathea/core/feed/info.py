@@ -6,13 +6,19 @@
     :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
     :license: MIT License, see LICENSE for details.
 """
+from ...utils.slots import Slotted
 
 
-class FeedInfo(object):
+class FeedInfo(Slotted):
     """
-    A simple namespace object for passing information to an entry
+    A simple namespace object for passing information to an entry.
+
+    Since all entries of a feed share the same information, a feed passes one instance
+    to all of its entries (see :py:meth:`~magrathea.core.feed.feed.Feed._update`).
     """
 
+    __slots__ = ('_author', '_title', '_uri', '_type')
+
     def __init__(self, author, title, uri, version):
         self._author = author
         self._title = title
@@ -8,10 +8,12 @@
 """
 import os
 import shutil
+import time
 from .result import Result
 from .template import Template
 from ..conf import get_conf
-from ..utils.compat import comp_makedirs
+from ..utils.compat import comp_makedirs, comp_open, CompConfigParser, ConfigParserError
+from ..utils.convert import to_str
 from ..utils.file import File
 from ..utils.singleton import Singleton
 
@@ -65,6 +67,117 @@ class Planet(File):
         finally:
             return op_result
 
+    def build(self, force=False):
+        """
+        Build the planet: update all feeds configured in the planet's configuration file and
+        render the pages whose entries have changed since the previous build into the planet's
+        build directory (see :py:class:`~magrathea.core.build.Builder`), using the planet's
+        theme (see :py:class:`~magrathea.core.theme.Theme`).
+
+        :param bool force: if true, render all pages
+        """
+        # imported on demand, so commands not building the planet work without feedparser and Jinja2
+        from .build import Builder
+        from .cache import Cache
+        from .feed.feed import Feed
+        from .feed.fetch import Fetcher
+        from .theme import Theme
+        from .timeline import Timeline
+
+        op_result = Result()
+        try:
+            conf = self._load_conf()
+            if conf is not None:
+                settings = conf.defaults()
+                sections = [(uri, dict(conf.items(uri))) for uri in conf.sections()]
+        except (ConfigParserError, UnicodeError) as e:
+            op_result.fail("Error {}".format(e))
+            return op_result
+        if conf is None:
+            op_result.fail("{} is not a planet directory".format(self._path))
+            return op_result
+        try:
+            theme = Theme(
+                name=self._get_setting(settings, 'THEME'),
+                theme_dir=os.path.join(self._path, self._get_setting(settings, 'THEME_DIR')),
+                cache_dir=os.path.join(self._path, get_conf('PLANET_THEME_CACHE_DIR'))
+            )
+        except ValueError as e:
+            op_result.fail("Error {}".format(e))
+            return op_result
+        cache = Cache.get_instance(
+            os.path.join(self._path, self._get_setting(settings, 'CACHE_FILE')),
+            backend=self._get_setting(settings, 'CACHE_BACKEND')
+        )
+        feeds = []
+        for uri, options in sections:
+            feeds.append(Feed(
+                uri=uri,
+                title=options.get(get_conf('PLANET_CONF_FEED_TITLE_KEY')),
+                author=options.get(get_conf('PLANET_CONF_FEED_AUTHOR_KEY')),
+                cache=cache
+            ))
+        try:
+            timeline = Timeline(
+                feeds,
+                policy=self._get_setting(settings, 'POLICY'),
+                limit=self._get_setting(settings, 'LIMIT'),
+                # fixed, so each pass over the timeline selects the same entries
+                now=time.time()
+            )
+            builder = Builder(
+                os.path.join(self._path, self._get_setting(settings, 'BUILD_DIR')),
+                theme,
+                cache=cache,
+                paginate=self._get_setting(settings, 'PAGINATE')
+            )
+        except ValueError as e:
+            op_result.fail("Error {}".format(e))
+            return op_result
+        with cache.batch():
+            for fetch_result in Fetcher().fetch(feeds):
+                if not fetch_result:
+                    op_result.warn("{}: {}".format(fetch_result.uri, fetch_result.error))
+                op_result.debug(
+                    "fetched {}".format(fetch_result.uri),
+                    feed=fetch_result.uri,
+                    key=to_str(fetch_result.key),
+                    status=fetch_result.status,
+                    duration=fetch_result.duration
+                )
+            op_result.merge(builder.build(timeline, force=force))
+        return op_result
+
+    def _load_conf(self):
+        """
+        Load the planet's configuration file.
+
+        :returns: :py:class:`~magrathea.utils.compat.CompConfigParser` instance, or ``None``
+                  if the configuration file does not exist
+        """
+        filename = os.path.join(self._path, get_conf('PLANET_CONF_FILE'))
+        if not self._check_file_exists(filename):
+            return None
+        conf = CompConfigParser()
+        with comp_open(filename, mode='r') as fp:
+            conf.read_string(fp.read(), filename)
+        return conf
+
+    @staticmethod
+    def _get_setting(settings, name):
+        """
+        Get a planet-wide setting, falling back to its default value.
+
+        :param dict settings: settings read from the planet's configuration file
+        :param str name:      name of the setting, e. g. ``POLICY`` for the
+                              ``PLANET_CONF_POLICY_KEY`` and ``PLANET_CONF_POLICY_VAL`` pair
+        :returns: the setting's value
+        """
+        value = settings.get(get_conf('PLANET_CONF_{}_KEY'.format(name)))
+        if not value:
+            value = get_conf('PLANET_CONF_{}_VAL'.format(name))
+        return value
+
     def _create_dir_if_not_exists(self, directory='', purge=True):
         """
         Create a directory if it does not exist yet.
@@ -27,6 +27,9 @@ class Result(object):
         """
         return self._status
 
+    # Python 2 uses __nonzero__ instead of __bool__
+    __nonzero__ = __bool__
+
     @property
     def status(self):
         """
@@ -46,6 +49,19 @@ class Result(object):
             msg.append((self._messages[message][0], self._messages[message][1]))
         return msg
 
+    @property
+    def records(self):
+        """
+        List of message tuples in the order of occurrence, just like :py:attr:`messages`.
+        Each message is represented by a tuple (level, message, fields), with fields being
+        a dictionary of further information about the message (e. g. a duration).
+        """
+        msg = []
+        for message in sorted(self._messages.keys()):
+            record = self._messages[message]
+            msg.append((record[0], record[1], record[2] if len(record) > 2 else {}))
+        return msg
+
     @property
     def messages_raw(self):
         """
@@ -83,6 +99,16 @@ class Result(object):
         if message:
             self._messages[counter()] = ('warning', message)
 
+    def debug(self, message='', **fields):
+        """
+        Record a debug message, without affecting the result's status
+
+        :param str message: debug message to be appended to messages list
+        :param fields:      further information about the message (see :py:attr:`records`)
+        """
+        if message:
+            self._messages[counter()] = ('debug', message, fields)
+
     def merge(self, result):
         """
         Merge a result object into this result
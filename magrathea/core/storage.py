@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.core.storage
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import heapq
+import itertools
+import os
+import pickle
+import shelve
+import sqlite3
+from ..conf import get_conf
+from ..utils.convert import to_str
+from ..utils.digest import compact_key
+from .feed.entry import migrate_entry_id
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+#: Prefix of the cache keys holding the entries of a feed
+ENTRIES_PREFIX = 'feed-entries:'
+
+#: Prefix of the cache keys holding the state of a feed
+STATE_PREFIX = 'feed-state:'
+
+#: Cache key holding the version of the key scheme used by a storage
+KEY_SCHEME_KEY = 'magrathea-key-scheme'
+
+#: Version of the key scheme, i. e. compact keys (see :py:func:`~magrathea.utils.digest.compact_key`)
+KEY_SCHEME = 2
+
+
+def open_storage(db_file, backend=None, flag='c', protocol=None):
+    """
+    Open the storage backing a :py:class:`~magrathea.core.cache.Cache` object.
+
+    :param str db_file:  path of the database file (without suffix)
+    :param str backend:  one of :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CACHE_BACKEND_SHELVE` or
+                         :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CACHE_BACKEND_SQLITE`
+                         (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CACHE_BACKEND`)
+    :param str flag:     ``'c'`` for opening the database, creating it if necessary, or ``'n'``
+                         for always creating a new, empty database
+    :param int protocol: protocol version to use for :py:mod:`pickle`
+    :returns: a :py:class:`ShelveStorage` or :py:class:`SQLiteStorage` instance
+    """
+    backend = backend or get_conf('PLANET_CACHE_BACKEND')
+    if backend == get_conf('PLANET_CACHE_BACKEND_SHELVE'):
+        return ShelveStorage(db_file, flag=flag, protocol=protocol)
+    if backend == get_conf('PLANET_CACHE_BACKEND_SQLITE'):
+        return SQLiteStorage(db_file, flag=flag, protocol=protocol)
+    raise ValueError("unknown cache backend: {}".format(backend))
+
+
+def migrate_keys(db):
+    """
+    Migrate a storage written by Magrathea versions identifying feeds and entries by their
+    Base64 encoded URIs and ids to compact keys (see :py:func:`~magrathea.utils.digest.compact_key`).
+    The new keys are derived from the URI kept in each feed's state. Once migrated, the storage
+    is marked by :py:data:`KEY_SCHEME_KEY` and left untouched by further calls.
+
+    :param db: storage object, as returned by :py:func:`open_storage`
+    :returns: number of feeds migrated
+    :rtype: int
+    """
+    if db.get(KEY_SCHEME_KEY) == KEY_SCHEME:
+        return 0
+    count = 0
+    for key in list(db.keys()):
+        if not key.startswith(STATE_PREFIX):
+            continue
+        state = db[key]
+        old = key[len(STATE_PREFIX):]
+        # keys are kept as native strings, as dbm modules on Python 2 reject unicode keys
+        new = '{}'.format(to_str(compact_key(state['uri']))) if state.get('uri') else old
+        if new == old:
+            continue
+        db[STATE_PREFIX + new] = state
+        del db[key]
+        if ENTRIES_PREFIX + old in db:
+            entries = db[ENTRIES_PREFIX + old]
+            for entry in entries:
+                migrate_entry_id(entry)
+            db[ENTRIES_PREFIX + new] = entries
+            del db[ENTRIES_PREFIX + old]
+        count += 1
+    db[KEY_SCHEME_KEY] = KEY_SCHEME
+    return count
+
+
+class ShelveStorage(shelve.DbfilenameShelf):
+    """
+    Storage based on :py:mod:`shelve`, offering key lookups only.
+
+    :param str db_file:  path of the database file (without suffix)
+    :param str flag:     flag passed to :py:func:`dbm.open`
+    :param int protocol: protocol version to use for :py:mod:`pickle`
+    """
+
+    def __init__(self, db_file, flag='c', protocol=None):
+        shelve.DbfilenameShelf.__init__(self, db_file, flag=flag, protocol=protocol)
+
+    def query_entries(self, limit=None, since=None, feeds=None):
+        """
+        Get the most recent entries of all feeds. See :py:meth:`SQLiteStorage.query_entries`.
+
+        Other than the :py:mod:`sqlite3` based storage, this storage has to load the entries of
+        all feeds concerned to answer the query.
+        """
+        if feeds is not None:
+            feeds = set(feeds)
+        streams = []
+        for key in self.keys():
+            if not key.startswith(ENTRIES_PREFIX):
+                continue
+            if feeds is not None and key[len(ENTRIES_PREFIX):] not in feeds:
+                continue
+            streams.append(entry for entry in self[key] if since is None or (entry.key or '') >= since)
+        entries = itertools.chain(*streams)
+        if limit is None:
+            return sorted(entries, key=lambda entry: entry.key or '', reverse=True)
+        return heapq.nlargest(limit, entries, key=lambda entry: entry.key or '')
+
+
+class SQLiteStorage(MutableMapping):
+    """
+    Storage based on :py:mod:`sqlite3`, using a write-ahead log.
+
+    Just like :py:class:`ShelveStorage`, this storage maps keys to pickled objects. However,
+    the entries of feeds (stored under keys starting with :py:data:`ENTRIES_PREFIX`) are kept
+    in a table of their own, one row per entry, indexed by the feed's key and the entry's
+    publishing date. This allows querying the most recent entries without unpickling
+    any other object (see :py:meth:`query_entries`).
+
+    Changes are written within a transaction, which is committed by :py:meth:`sync`.
+
+    :param str db_file:  path of the database file (the suffix ``.sqlite`` is appended)
+    :param str flag:     ``'c'`` for opening the database, creating it if necessary, or ``'n'``
+                         for always creating a new, empty database
+    :param int protocol: protocol version to use for :py:mod:`pickle`
+    """
+
+    #: suffix of the database file
+    suffix = '.sqlite'
+
+    def __init__(self, db_file, flag='c', protocol=None):
+        self._path = db_file + self.suffix
+        self._protocol = protocol
+        if flag == 'n' and os.path.exists(self._path):
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self._path + suffix):
+                    os.unlink(self._path + suffix)
+        # thread safety is granted by the cache object's lock
+        self._db = sqlite3.connect(self._path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'feed TEXT NOT NULL, id TEXT NOT NULL, updated TEXT NOT NULL, value BLOB NOT NULL, '
+            'PRIMARY KEY (feed, id))'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_feed_updated ON entries (feed, updated)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_updated ON entries (updated)')
+        self._db.commit()
+
+    def __getitem__(self, key):
+        if key.startswith(ENTRIES_PREFIX):
+            feed = key[len(ENTRIES_PREFIX):]
+            if self._db.execute('SELECT 1 FROM items WHERE key = ?', (key,)).fetchone() is None:
+                raise KeyError(key)
+            rows = self._db.execute(
+                'SELECT value FROM entries WHERE feed = ? ORDER BY updated, rowid', (feed,)
+            ).fetchall()
+            return [self._loads(row[0]) for row in rows]
+        row = self._db.execute('SELECT value FROM items WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._loads(row[0])
+
+    def __setitem__(self, key, value):
+        if key.startswith(ENTRIES_PREFIX):
+            feed = key[len(ENTRIES_PREFIX):]
+            self._db.execute('DELETE FROM entries WHERE feed = ?', (feed,))
+            self._db.executemany(
+                'INSERT OR REPLACE INTO entries (feed, id, updated, value) VALUES (?, ?, ?, ?)',
+                ((feed, to_str(entry.id), entry.key or '', self._dumps(entry)) for entry in value)
+            )
+            # the item itself only marks the existence of the feed's entries
+            value = None
+        self._db.execute('INSERT OR REPLACE INTO items (key, value) VALUES (?, ?)', (key, self._dumps(value)))
+
+    def __delitem__(self, key):
+        if self._db.execute('DELETE FROM items WHERE key = ?', (key,)).rowcount == 0:
+            raise KeyError(key)
+        if key.startswith(ENTRIES_PREFIX):
+            self._db.execute('DELETE FROM entries WHERE feed = ?', (key[len(ENTRIES_PREFIX):],))
+
+    def __contains__(self, key):
+        return self._db.execute('SELECT 1 FROM items WHERE key = ?', (key,)).fetchone() is not None
+
+    def __iter__(self):
+        return iter([row[0] for row in self._db.execute('SELECT key FROM items')])
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def query_entries(self, limit=None, since=None, feeds=None):
+        """
+        Get the most recent entries of all feeds, in descending order.
+
+        :param int limit: maximum number of entries, or ``None`` for all
+        :param str since: sort key (see :py:attr:`~magrathea.core.feed.entry.Entry.key`) of the oldest
+                          entries to be included, or ``None``
+        :param feeds:     keys of the feeds to be included (as :py:class:`str`), or ``None`` for all
+        :returns: list of :py:class:`~magrathea.core.feed.entry.Entry` instances
+        """
+        query = 'SELECT value FROM entries'
+        conditions = []
+        parameters = []
+        if since is not None:
+            conditions.append('updated >= ?')
+            parameters.append(since)
+        if feeds is not None:
+            feeds = list(feeds)
+            conditions.append('feed IN ({})'.format(', '.join('?' * len(feeds))))
+            parameters.extend(feeds)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY updated DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            parameters.append(limit)
+        return [self._loads(row[0]) for row in self._db.execute(query, parameters)]
+
+    def sync(self):
+        """
+        Commit the running transaction.
+        """
+        self._db.commit()
+
+    def close(self):
+        """
+        Commit the running transaction and close the database.
+        """
+        self._db.commit()
+        self._db.close()
+
+    def _dumps(self, value):
+        return sqlite3.Binary(pickle.dumps(value, self._protocol))
+
+    @staticmethod
+    def _loads(value):
+        return pickle.loads(bytes(value))
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.core.theme
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+import jinja2
+from .exceptions import RenderError
+from ..conf import get_conf
+from ..utils.compat import comp_makedirs
+
+#: Jinja2 environments already set up, keyed by their template search path and bytecode cache directory
+_environments = {}
+
+
+def get_environment(search_path, cache_dir=None):
+    """
+    Get the :py:class:`jinja2.Environment` loading templates from a search path. Within a process,
+    there is only one environment per search path and cache directory, so templates already
+    loaded are reused by every :py:class:`Theme` object using the same templates.
+
+    If a cache directory is given, templates compiled once are kept there as bytecode
+    (see :py:class:`jinja2.FileSystemBytecodeCache`). Thus, templates are only compiled
+    again once they have changed, not once per process. Templates changed while the process
+    is running are reloaded on their next use.
+
+    :param search_path: list of directories to load templates from, in order of precedence
+    :param str cache_dir: directory for the bytecode cache, or ``None``
+    :returns: :py:class:`jinja2.Environment` instance
+    """
+    key = (tuple(search_path), cache_dir)
+    environment = _environments.get(key)
+    if environment is None:
+        bytecode_cache = None
+        if cache_dir:
+            comp_makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(cache_dir)
+        environment = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(list(search_path), encoding=get_conf('CHARSET')),
+            bytecode_cache=bytecode_cache,
+            autoescape=True,
+            auto_reload=True,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        environment.globals['charset'] = get_conf('CHARSET')
+        environment = _environments.setdefault(key, environment)
+    return environment
+
+
+class Theme(object):
+    """
+    Renderer rendering pages (see :py:class:`~magrathea.core.build.Page`) with a `Jinja2`_ theme.
+
+    A theme is a directory of Jinja2 templates, named like the theme and located within the
+    planet's theme directory (see :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CONF_THEME_DIR_KEY`).
+    Each page is rendered by the theme's ``page.html`` template, receiving the ``page`` and
+    its ``entries``. Templates missing from the theme are taken from Magrathea's ``default``
+    theme, so a theme may override single templates only.
+
+    The theme's ``signature`` reflects the modification times of all its templates.
+    Thus, all pages are rendered again once the theme has changed
+    (see :py:class:`~magrathea.core.build.Builder`).
+
+    :param str name:      name of the theme
+                          (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CONF_THEME_VAL`)
+    :param str theme_dir: directory containing the planet's themes, or ``None``
+    :param str cache_dir: directory for caching compiled templates, or ``None``
+
+    .. _Jinja2: http://jinja.pocoo.org/
+    """
+
+    #: Name of the template rendering a page
+    page_template = 'page.html'
+
+    def __init__(self, name=None, theme_dir=None, cache_dir=None):
+        self._name = name or get_conf('PLANET_CONF_THEME_VAL')
+        search_path = []
+        if theme_dir and os.path.isdir(os.path.join(theme_dir, self._name)):
+            search_path.append(os.path.abspath(os.path.join(theme_dir, self._name)))
+        default = os.path.join(get_conf('DEFAULT_THEME_PATH'), get_conf('DEFAULT_PLANET_CONF_THEME_VAL'))
+        if not search_path and self._name != get_conf('DEFAULT_PLANET_CONF_THEME_VAL'):
+            raise ValueError("unknown theme: {}".format(self._name))
+        search_path.append(default)
+        self._search_path = search_path
+        self._cache_dir = cache_dir
+        self._signature = None
+        self._template = None
+
+    @property
+    def name(self):
+        """Name of the theme"""
+        return self._name
+
+    @property
+    def search_path(self):
+        """List of directories templates are loaded from, in order of precedence"""
+        return self._search_path[:]
+
+    @property
+    def signature(self):
+        """Signature of the theme, changing whenever any of its templates changes"""
+        if self._signature is None:
+            mtimes = []
+            for directory in self._search_path:
+                for root, __, files in os.walk(directory):
+                    for filename in files:
+                        path = os.path.join(root, filename)
+                        mtimes.append((os.path.relpath(path, directory), os.path.getmtime(path)))
+            self._signature = (self._name, tuple(sorted(mtimes)))
+        return self._signature
+
+    @property
+    def environment(self):
+        """The :py:class:`jinja2.Environment` used by this theme"""
+        return get_environment(self._search_path, self._cache_dir)
+
+    def render(self, page):
+        """
+        Render a page.
+
+        :param page: :py:class:`~magrathea.core.build.Page` instance
+        :returns: the rendered page
+        :raises RenderError: if a template is missing or broken
+        """
+        try:
+            if self._template is None:
+                self._template = self.environment.get_template(self.page_template)
+            return self._template.render(page=page, entries=page.entries)
+        except jinja2.TemplateError as e:
+            raise RenderError(page=page.name, reason="theme {}: {}".format(self._name, e))
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.core.timeline
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import heapq
+import itertools
+import time
+from .exceptions import FeedError, FeedMovedError
+from ..conf import get_conf
+
+#: Format of the entries' sort keys (see :py:attr:`magrathea.core.feed.entry.Entry.key`)
+KEY_FORMAT = '%Y%m%d%H%M%S'
+
+
+class _Head(object):
+    """
+    Head of one entry stream within the merge heap. Heads are ordered so that the most
+    recent entry comes first; ties are broken by the stream's position.
+    """
+
+    __slots__ = ('key', 'entry', 'index', 'stream')
+
+    def __init__(self, entry, index, stream):
+        self.key = entry.key or ''
+        self.entry = entry
+        self.index = index
+        self.stream = stream
+
+    def __lt__(self, other):
+        if self.key == other.key:
+            return self.index < other.index
+        return self.key > other.key
+
+
+def merge(streams):
+    """
+    Merge entry streams, each in descending order, into one stream in descending order.
+
+    This is a lazy k-way merge: only one entry per stream is held at any time, and
+    retrieving the first *n* entries of the merged stream costs O(n log k) for *k* streams.
+
+    :param streams: iterable of iterators over :py:class:`~magrathea.core.feed.entry.Entry`
+                    instances, each ordered from the most recent to the oldest entry
+    :returns: iterator over :py:class:`~magrathea.core.feed.entry.Entry` instances
+    """
+    heap = []
+    for index, stream in enumerate(streams):
+        stream = iter(stream)
+        for entry in stream:
+            heap.append(_Head(entry, index, stream))
+            break
+    heapq.heapify(heap)
+    while heap:
+        head = heap[0]
+        yield head.entry
+        for entry in head.stream:
+            head.key = entry.key or ''
+            head.entry = entry
+            heapq.heapreplace(heap, head)
+            break
+        else:
+            heapq.heappop(heap)
+
+
+def get_cutoff_key(policy, limit, now=None):
+    """
+    Get the sort key of the oldest moment still covered by a time based policy.
+
+    :param str policy: one of the hours, days, weeks or months policy values
+    :param int limit:  number of hours, days, weeks or months
+    :param float now:  reference time in seconds since the epoch (defaults to the current time)
+    :returns: sort key string
+    """
+    if now is None:
+        now = time.time()
+    if policy == get_conf('PLANET_CONF_POLICY_VAL_HOURS'):
+        return time.strftime(KEY_FORMAT, time.gmtime(now - limit * 3600))
+    if policy == get_conf('PLANET_CONF_POLICY_VAL_DAYS'):
+        return time.strftime(KEY_FORMAT, time.gmtime(now - limit * 86400))
+    if policy == get_conf('PLANET_CONF_POLICY_VAL_WEEKS'):
+        return time.strftime(KEY_FORMAT, time.gmtime(now - limit * 604800))
+    if policy == get_conf('PLANET_CONF_POLICY_VAL_MONTHS'):
+        moment = time.gmtime(now)
+        months = moment.tm_year * 12 + moment.tm_mon - 1 - limit
+        return "{year:04d}{month:02d}{rest}".format(
+            year=months // 12,
+            month=months % 12 + 1,
+            rest=time.strftime('%d%H%M%S', moment)
+        )
+    raise ValueError("policy {} is not time based".format(policy))
+
+
+class Timeline(object):
+    """
+    The planet's timeline: the entries of many feeds, merged into one stream from the most
+    recent to the oldest entry, and limited according to the planet's *policy* setting:
+
+    * ``global``: the latest *limit* entries of all feeds
+    * ``local``: the latest *limit* entries of each feed
+    * ``hours``, ``days``, ``weeks``, ``months``: entries published within the past *limit* hours,
+      days, weeks or months
+    * ``none``: all entries
+
+    Since each feed keeps its entries ordered, the timeline never sorts. It merges the feeds'
+    entry streams lazily and stops as soon as the limit or the time cutoff has been reached::
+
+       >>> timeline = Timeline(feeds, policy='global', limit=25)
+       >>> for entry in timeline:
+       ...     print(entry.title)
+
+    Feeds that cannot be updated (e. g. because they have gone) are skipped. Pass feeds
+    updated beforehand (see :py:class:`~magrathea.core.feed.fetch.Fetcher`) to avoid
+    downloading them one by one.
+
+    :param feeds:      iterable of :py:class:`~magrathea.core.feed.feed.Feed` instances
+    :param str policy: the policy to be applied
+                       (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CONF_POLICY_VAL`)
+    :param int limit:  the limit for the chosen policy
+                       (defaults to :py:data:`~magrathea.conf.default.DEFAULT_PLANET_CONF_LIMIT_VAL`)
+    :param float now:  reference time for time based policies (defaults to the current time)
+    """
+
+    def __init__(self, feeds, policy=None, limit=None, now=None):
+        self._feeds = list(feeds)
+        self._policy = policy or get_conf('PLANET_CONF_POLICY_VAL')
+        self._limit = int(limit if limit is not None else get_conf('PLANET_CONF_LIMIT_VAL'))
+        self._now = now
+        if self._policy not in (
+            get_conf('PLANET_CONF_POLICY_VAL_GLOBAL'),
+            get_conf('PLANET_CONF_POLICY_VAL_LOCAL'),
+            get_conf('PLANET_CONF_POLICY_VAL_HOURS'),
+            get_conf('PLANET_CONF_POLICY_VAL_DAYS'),
+            get_conf('PLANET_CONF_POLICY_VAL_WEEKS'),
+            get_conf('PLANET_CONF_POLICY_VAL_MONTHS'),
+            get_conf('PLANET_CONF_POLICY_VAL_NONE')
+        ):
+            raise ValueError("unknown policy: {}".format(self._policy))
+
+    @property
+    def policy(self):
+        """The policy applied to this timeline"""
+        return self._policy
+
+    @property
+    def limit(self):
+        """The limit of the policy applied to this timeline"""
+        return self._limit
+
+    def __iter__(self):
+        if self._policy == get_conf('PLANET_CONF_POLICY_VAL_GLOBAL'):
+            return itertools.islice(merge(self._get_streams()), self._limit)
+        if self._policy == get_conf('PLANET_CONF_POLICY_VAL_LOCAL'):
+            return merge(self._get_streams(self._limit))
+        if self._policy == get_conf('PLANET_CONF_POLICY_VAL_NONE'):
+            return merge(self._get_streams())
+        cutoff = get_cutoff_key(self._policy, self._limit, self._now)
+        return itertools.takewhile(lambda entry: (entry.key or '') >= cutoff, merge(self._get_streams()))
+
+    def _get_streams(self, limit=None):
+        """
+        Get the entry streams of all feeds.
+
+        :param int limit: maximum number of entries per feed, or ``None`` for all
+        :returns: list of iterators over each feed's entries, from the most recent to the oldest
+        """
+        streams = []
+        for feed in self._feeds:
+            try:
+                streams.append(feed.iter_entries(reverse=True, limit=limit))
+            except FeedMovedError:
+                # the feed has been updated nevertheless
+                streams.append(feed.iter_entries(reverse=True, limit=limit))
+            except FeedError:
+                continue
+        return streams
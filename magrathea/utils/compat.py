@@ -109,6 +109,25 @@ def comp_open(file, mode='r', buffering=-1, encoding=None, errors=None, newline=
     return fp
 
 
+def comp_replace(src, dst):
+    """
+    Compatibility wrapper for :py:func:`os.replace`. It renames the file or directory *src*
+    to *dst*, replacing *dst* if it exists. On POSIX systems, this is an atomic operation.
+
+    .. note::
+
+       Prior to Python 3.3, this falls back to :py:func:`os.rename`, which replaces
+       an existing *dst* on POSIX systems only.
+
+    :param src: path of the file or directory to be renamed
+    :param dst: new path of the file or directory
+    """
+    if sys.version_info >= (3, 3, 0):
+        os.replace(src, dst)
+    else:
+        os.rename(src, dst)
+
+
 # Black magic for getting the right config parser class...
 if sys.version_info >= (3, 2, 0):
     CP = configparser.ConfigParser
@@ -116,6 +135,8 @@ else:
     CP = configparser.SafeConfigParser
 
 DEFAULTSECT = configparser.DEFAULTSECT
+#: Base class of all exceptions raised by :py:class:`CompConfigParser`
+ConfigParserError = configparser.Error
 _UNSET = getattr(configparser, '_UNSET', object())
 _default_dict = getattr(configparser, '_default_dict', OrderedDict)
 
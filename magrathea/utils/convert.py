@@ -3,64 +3,160 @@
     magrathea.utils.convert
     ~~~~~~~~~~~~~~~~~~~~~~~
 
+    The conversion functions are defined once per Python major version at import time,
+    with the charset resolved at import time as well (``DEFAULT_`` settings are immutable).
+    Thus, converting a value costs neither a version check nor a configuration lookup.
+
     :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
     :license: MIT License, see LICENSE for details.
 """
 import sys
 from ..conf import get_conf
 
+#: Charset used for all conversions
+_CHARSET = get_conf('DEFAULT_CHARSET')
+
+
+if sys.version_info >= (3, 0, 0):
 
-def to_bytes(value):
-    """
-    Convert any value into a byte sequence.
+    def to_bytes(value):
+        """
+        Convert any value into a byte sequence.
 
-    :param value: The value to be converted
-    :return: Byte sequence
-    """
-    if sys.version_info < (3, 0, 0):
-        if isinstance(value, unicode):
-            return str(bytearray(source=value, encoding=get_conf('DEFAULT_CHARSET'), errors='replace'))
+        :param value: The value to be converted
+        :return: Byte sequence
+        """
+        if type(value) is str:
+            return value.encode(_CHARSET, 'replace')
+        elif type(value) is bytes:
+            return value
         elif isinstance(value, bytearray):
-            return str(value)
+            return bytes(value)
+        elif isinstance(value, bytes):
+            return bytes(value)
         elif value is None:
             return b''
         else:
-            return str(bytearray(source=str(value), encoding=get_conf('DEFAULT_CHARSET'), errors='replace'))
-    else:
-        if isinstance(value, str):
-            # noinspection PyArgumentList
-            return bytes(source=value, encoding=get_conf('DEFAULT_CHARSET'), errors='replace')
-        elif isinstance(value, bytearray):
-            return bytes(value)
-        elif isinstance(value, bytes):
+            return str(value).encode(_CHARSET, 'replace')
+
+    def to_str(value):
+        """
+        Convert any value into a unicode string.
+
+        :param value: The value to be converted
+        :return: Resulting string
+        """
+        if type(value) is str:
             return value
+        elif isinstance(value, (bytes, bytearray)):
+            return value.decode(_CHARSET, 'replace')
         elif value is None:
-            return b''
+            return ''
         else:
-            # noinspection PyArgumentList
-            return bytes(source=str(value), encoding=get_conf('DEFAULT_CHARSET'), errors='replace')
+            return str(value)
+
+    def to_bytes_list(values):
+        """
+        Convert all values of an iterable into byte sequences. Equivalent to, but faster than,
+        calling :py:func:`to_bytes` for each value.
+
+        :param values: iterable of values to be converted
+        :return: list of byte sequences
+        """
+        charset = _CHARSET
+        return [
+            value.encode(charset, 'replace') if type(value) is str else
+            value if type(value) is bytes else
+            to_bytes(value)
+            for value in values
+        ]
 
+    def to_str_list(values):
+        """
+        Convert all values of an iterable into unicode strings. Equivalent to, but faster than,
+        calling :py:func:`to_str` for each value.
 
-def to_str(value):
-    """
-    Convert any value into a unicode string.
+        :param values: iterable of values to be converted
+        :return: list of strings
+        """
+        charset = _CHARSET
+        return [
+            value if type(value) is str else
+            value.decode(charset, 'replace') if type(value) is bytes else
+            to_str(value)
+            for value in values
+        ]
 
-    :param value: The value to be converted
-    :return: Resulting string
-    """
-    if sys.version_info < (3, 0, 0):
-        if isinstance(value, str):
-            return unicode(value, encoding=get_conf('DEFAULT_CHARSET'), errors='replace')
+else:
+
+    def to_bytes(value):
+        """
+        Convert any value into a byte sequence.
+
+        :param value: The value to be converted
+        :return: Byte sequence
+        """
+        if type(value) is unicode:
+            return value.encode(_CHARSET, 'replace')
+        elif type(value) is str:
+            return value
         elif isinstance(value, bytearray):
-            return unicode(str(value), encoding=get_conf('DEFAULT_CHARSET'), errors='replace')
+            return str(value)
+        elif isinstance(value, unicode):
+            return unicode(value).encode(_CHARSET, 'replace')
         elif value is None:
-            return u''
+            return b''
         else:
-            return unicode(str(value), encoding=get_conf('DEFAULT_CHARSET'), errors='replace')
-    else:
-        if isinstance(value, bytes) or isinstance(value, bytearray):
-            return value.decode(encoding=get_conf('DEFAULT_CHARSET'), errors='replace')
+            return str(bytearray(source=str(value), encoding=_CHARSET, errors='replace'))
+
+    def to_str(value):
+        """
+        Convert any value into a unicode string.
+
+        :param value: The value to be converted
+        :return: Resulting string
+        """
+        if type(value) is unicode:
+            return value
+        elif isinstance(value, str):
+            return unicode(value, encoding=_CHARSET, errors='replace')
+        elif isinstance(value, bytearray):
+            return unicode(str(value), encoding=_CHARSET, errors='replace')
         elif value is None:
-            return ''
+            return u''
+        elif isinstance(value, unicode):
+            return unicode(value)
         else:
-            return str(value)
+            return unicode(str(value), encoding=_CHARSET, errors='replace')
+
+    def to_bytes_list(values):
+        """
+        Convert all values of an iterable into byte sequences. Equivalent to, but faster than,
+        calling :py:func:`to_bytes` for each value.
+
+        :param values: iterable of values to be converted
+        :return: list of byte sequences
+        """
+        charset = _CHARSET
+        return [
+            value.encode(charset, 'replace') if type(value) is unicode else
+            value if type(value) is str else
+            to_bytes(value)
+            for value in values
+        ]
+
+    def to_str_list(values):
+        """
+        Convert all values of an iterable into unicode strings. Equivalent to, but faster than,
+        calling :py:func:`to_str` for each value.
+
+        :param values: iterable of values to be converted
+        :return: list of strings
+        """
+        charset = _CHARSET
+        return [
+            value if type(value) is unicode else
+            unicode(value, charset, 'replace') if type(value) is str else
+            to_str(value)
+            for value in values
+        ]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.utils.digest
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import base64
+import hashlib
+from .convert import to_bytes
+
+#: Size of the digest compact keys are made of, in bytes
+KEY_DIGEST_SIZE = 12
+
+
+def compact_key(value):
+    """
+    Get a compact key identifying a value, e. g. the URI of a feed. Compact keys are
+    URL-safe Base64 encoded, truncated SHA-1 digests of the value. Thus, they are byte
+    sequences of a fixed length, containing only printable characters, however long the
+    value is::
+
+       >>> compact_key('http://example.org/feed.xml')
+       b'E9DtrUcZHgajyRtW'
+
+    The digest algorithm is the same on all Python versions, since compact keys are
+    stored; a key changing with the interpreter would orphan the items stored under it.
+
+    :param value: the value to be identified
+    :returns: byte sequence of 16 characters
+    """
+    return base64.urlsafe_b64encode(hashlib.sha1(to_bytes(value)).digest()[:KEY_DIGEST_SIZE])
@@ -13,9 +13,35 @@ else:
     from UserDict import UserDict
 
 
+def _link(first, second):
+    """
+    Link two hooks into one callable, running ``second`` on the result of ``first``.
+    """
+    def chain(key, value):
+        key, value = first(key, value)
+        return second(key, value)
+    return chain
+
+
+def _compose(hooks):
+    """
+    Compose a list of hooks into one callable.
+
+    :param list hooks: hooks, each taking and returning a (key, value) tuple
+    :returns: callable running all hooks in order, or ``None`` if there are no hooks
+    """
+    chain = None
+    for hook in hooks:
+        chain = hook if chain is None else _link(chain, hook)
+    return chain
+
+
 class Dynamic(object):
     """
     Dynamic class generating properties from kwargs
+
+    Properties are resolved per instance (see ``__getattr__``), so creating an
+    object never modifies its class.
     """
 
     def __init__(self, *args, **kwargs):
@@ -27,10 +53,11 @@ class Dynamic(object):
 
     def __add_property(self, name, value, doc=None):
         """
-        Dynamically add property (read-only) to the current class object
+        Dynamically add property (read-only) to the current object
         """
-        fget = lambda self: self._get_property(name)
-        setattr(self.__class__, name, property(fget, doc=doc))
+        if '_dynamic_properties' not in self.__dict__:
+            self._dynamic_properties = set()
+        self._dynamic_properties.add(name)
         setattr(self, '_' + name, value)
 
     def _get_property(self, name):
@@ -39,11 +66,36 @@ class Dynamic(object):
         """
         return getattr(self, '_' + name)
 
+    def __getattr__(self, name):
+        """
+        Resolve properties created from keyword arguments. Only called if regular
+        attribute lookup has failed.
+        """
+        if name in self.__dict__.get('_dynamic_properties', ()):
+            return self._get_property(name)
+        raise AttributeError(name)
+
 
 class DynamicIterable(UserDict, object):
     """
     A dynamic iterable object is similar to a normal Python dictionary, except it offers
-    all keys also as properties.
+    all keys also as properties::
+
+       >>> obj = DynamicIterable({'foo': 'bar'})
+       >>> obj.foo
+       'bar'
+       >>> obj.foo = 'baz'
+       >>> obj['foo']
+       'baz'
+
+    Properties are resolved dynamically on the instance (see ``__getattr__`` and ``__setattr__``)
+    instead of being added to the class, so inserting any number of keys leaves the class untouched.
+    Setting an attribute only modifies an item if the item already exists; otherwise, a normal
+    instance attribute is set. Attributes whose name starts with an underscore are never
+    mapped to items.
+
+    Hooks registered for the same type are composed into one callable upon registration,
+    so running a chain of hooks costs one call, and nothing at all if the chain is empty.
 
     .. note::
 
@@ -63,7 +115,8 @@ class DynamicIterable(UserDict, object):
             'pre-del': [],
             'post-del': []
         }
-        super(DynamicIterable, self).__init__(dict=dict, **kwargs)
+        self._chains = {hook_type: None for hook_type in self._hooks}
+        super(DynamicIterable, self).__init__(dict, **kwargs)
 
     def register_hook(self, hook_type, method):
         """
@@ -77,68 +130,52 @@ class DynamicIterable(UserDict, object):
         """
         if hook_type in self._hooks.keys():
             self._hooks[hook_type].append(method)
-
-    def __run_hooks(self, hook_type, key, value):
-        """
-        Run all hooks registered to the chain of a specific hook type.
-
-        :param str hook_type: one of `pre-set`, `post-set`, `pre-del`, `post-del`, `pre-get`, `post-get`
-        :param key: initial value for `key`
-        :param value: initial value for `value`
-        :returns: tuple of key and value, updated by hooks.
-        :rtype: tuple
-        """
-        chain = None
-        if hook_type in self._hooks.keys():
-            chain = self._hooks[hook_type]
-        if chain:
-            for hook in chain:
-                key, value = hook(key, value)
-        return key, value
-
-    def __add_property(self, name, value, doc=None):
-        """
-        Dynamically add property to the current class object
-        """
-        fget = lambda self: self.__getattr__(name)
-        fset = lambda self, value: self.__setitem__(name, value)
-        setattr(self.__class__, name, property(fget=fget, fset=fset, doc=doc))
-
-    def __del_property(self, name):
-        """
-        Dynamically delete property and internal representation
-        """
-        delattr(self.__class__, name)
+            self._chains[hook_type] = _compose(self._hooks[hook_type])
 
     def __setitem__(self, key, item, **kwargs):
         """
-        Overrides default ``__setitem__`` method. Functionality is identical, except a property with
-        the key name is created or updated, and corresponding pre-set and post-set hooks are run.
+        Overrides default ``__setitem__`` method. Functionality is identical, except the corresponding
+        pre-set and post-set hooks are run.
         """
-        key, item = self.__run_hooks('pre-set', key, item)
-        self.__add_property(key, item)
-        super(DynamicIterable, self).__setitem__(key, item)
-        self.__run_hooks('post-set', key, item)
+        chain = self._chains['pre-set']
+        if chain is not None:
+            key, item = chain(key, item)
+        self.data[key] = item
+        chain = self._chains['post-set']
+        if chain is not None:
+            chain(key, item)
 
     def __delitem__(self, key, **kwargs):
         """
-        Overrides default ``__delitem__`` method. Functionality is identical, the property with
-        the key name is deleted and corresponding pre-del and post-del hooks are run.
+        Overrides default ``__delitem__`` method. Functionality is identical, except the
+        corresponding pre-del and post-del hooks are run.
         """
-        key, item = self.__run_hooks('pre-del', key, self[key])
+        item = self[key]
+        chain = self._chains['pre-del']
+        if chain is not None:
+            key, item = chain(key, item)
         if key in self:
-            self.__del_property(key)
-            super(DynamicIterable, self).__delitem__(key)
-        self.__run_hooks('post-del', key, item)
+            del self.data[key]
+        chain = self._chains['post-del']
+        if chain is not None:
+            chain(key, item)
 
     def __getitem__(self, key):
         """
         Overrides default ``__getitem__`` method. Functionality is identical, except the pre-get and
         post-get hooks are being executed.
         """
-        key, item = self.__run_hooks('pre-get', key, None)
-        item = super(DynamicIterable, self).__getitem__(key)
-        key, item = self.__run_hooks('post-get', key, item)
+        chain = self._chains['pre-get']
+        if chain is not None:
+            key = chain(key, None)[0]
+        try:
+            item = self.data[key]
+        except KeyError:
+            # let UserDict take care of __missing__ support
+            item = super(DynamicIterable, self).__getitem__(key)
+        chain = self._chains['post-get']
+        if chain is not None:
+            key, item = chain(key, item)
         return item
 
     def __contains__(self, key):
@@ -146,15 +183,31 @@ class DynamicIterable(UserDict, object):
         Overrides default ``__contains__`` method. Function is identical, except the pre-get
         hooks are being executed.
         """
-        key, item = self.__run_hooks('pre-get', key, None)
-        return super(DynamicIterable, self).__contains__(key)
+        chain = self._chains['pre-get']
+        if chain is not None:
+            key = chain(key, None)[0]
+        return key in self.data
 
     def __getattr__(self, key):
         """
-        Overrides default ``__getattr__`` method. Function is identical, except the pre-get
-        hooks are being executed.
+        Overrides default ``__getattr__`` method, resolving attributes not found otherwise to items.
+        Function is identical, except the pre-get hooks are being executed.
         """
+        # refuse special names and lookups before the object has been initialised (e. g. while unpickling)
+        if key.startswith('__') or '_hooks' not in self.__dict__ or 'data' not in self.__dict__:
+            raise AttributeError(key)
         if key in self:
             return self[key]
         else:
-            raise AttributeError
+            raise AttributeError(key)
+
+    def __setattr__(self, key, value):
+        """
+        Overrides default ``__setattr__`` method. If an item named ``key`` exists, it is updated
+        (running the pre-set and post-set hooks). Otherwise, a normal attribute is set.
+        """
+        if key.startswith('_') or key == 'data' or 'data' not in self.__dict__ or hasattr(type(self), key) \
+                or key not in self:
+            object.__setattr__(self, key, value)
+        else:
+            self[key] = value
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.utils.lru
+    ~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from collections import OrderedDict
+
+
+class LRUDict(OrderedDict):
+    """
+    Dictionary holding at most *limit* items. Items are kept in order of their most recent
+    use; when inserting a new item into a full dictionary, the least recently used item
+    is evicted::
+
+       >>> lru = LRUDict(limit=2)
+       >>> lru['a'] = 1
+       >>> lru['b'] = 2
+       >>> lru.touch('a')
+       >>> lru['c'] = 3
+       >>> list(lru.keys())
+       ['a', 'c']
+       >>> lru.evictions
+       1
+
+    Setting an item counts as use. Reading an item does not, since the owner of the dictionary
+    usually knows best which lookups matter; it has to call :py:meth:`touch` instead.
+
+    The dictionary is not thread safe: owners sharing it between threads have to serialise
+    all modifications, including :py:meth:`touch`, with a lock of their own.
+
+    :param int limit: maximum number of items, or ``None`` for no limit
+    """
+
+    def __init__(self, limit=None):
+        self._limit = limit
+        self._evictions = 0
+        OrderedDict.__init__(self)
+
+    @property
+    def limit(self):
+        """Maximum number of items, or ``None`` for no limit"""
+        return self._limit
+
+    @property
+    def evictions(self):
+        """Number of items evicted so far"""
+        return self._evictions
+
+    def touch(self, key):
+        """
+        Mark an item as most recently used. An item missing (e. g. since it has been
+        evicted meanwhile) is ignored.
+
+        :param key: key of the item
+        :returns: ``True`` if the item exists, ``False`` otherwise
+        """
+        try:
+            self.move_to_end(key)
+        except KeyError:
+            return False
+        except AttributeError:
+            # Python 2.7 lacks move_to_end
+            try:
+                OrderedDict.__setitem__(self, key, OrderedDict.pop(self, key))
+            except KeyError:
+                return False
+        return True
+
+    def __setitem__(self, key, value):
+        if key in self:
+            OrderedDict.__setitem__(self, key, value)
+            self.touch(key)
+            return
+        OrderedDict.__setitem__(self, key, value)
+        if self._limit is not None:
+            while len(self) > self._limit:
+                self.popitem(last=False)
+                self._evictions += 1
+
+    def __repr__(self):
+        return repr(dict(self.items()))
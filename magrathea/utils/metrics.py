@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.utils.metrics
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import bisect
+import functools
+import threading
+from .timer import counter
+
+#: Upper bounds (in seconds) of the histogram buckets; the last bucket holds all longer durations
+BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+
+class Phase(object):
+    """
+    Statistics of a named phase: the number of times it has been passed, the total time
+    spent within it and a histogram of the durations (see :py:data:`BUCKETS`).
+
+    :param str name: name of the phase
+    """
+
+    __slots__ = ('_name', '_count', '_total', '_histogram')
+
+    def __init__(self, name):
+        self._name = name
+        self._count = 0
+        self._total = 0.0
+        self._histogram = [0] * (len(BUCKETS) + 1)
+
+    @property
+    def name(self):
+        """Name of the phase"""
+        return self._name
+
+    @property
+    def count(self):
+        """Number of times the phase has been passed"""
+        return self._count
+
+    @property
+    def total(self):
+        """Total time (in fractional seconds) spent within the phase"""
+        return self._total
+
+    @property
+    def mean(self):
+        """Mean time (in fractional seconds) spent within the phase"""
+        return self._total / self._count if self._count else 0.0
+
+    @property
+    def histogram(self):
+        """List of the number of durations per bucket (see :py:data:`BUCKETS`)"""
+        return self._histogram[:]
+
+    def add(self, duration):
+        """
+        Record a duration.
+
+        :param float duration: time (in fractional seconds) spent within the phase
+        """
+        self._count += 1
+        self._total += duration
+        self._histogram[bisect.bisect_left(BUCKETS, duration)] += 1
+
+
+class _Span(object):
+    """
+    Context manager recording the time spent within its context as a phase of a
+    :py:class:`Metrics` registry.
+    """
+
+    __slots__ = ('_metrics', '_name', '_start')
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics.record(self._name, counter() - self._start)
+        return False
+
+
+class _NullSpan(object):
+    """
+    Context manager doing nothing, used while metrics are disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+#: The one and only span used while metrics are disabled
+_NULL_SPAN = _NullSpan()
+
+
+class Metrics(object):
+    """
+    Registry of phase statistics (see :py:class:`Phase`). The time spent within a phase is
+    recorded by a span, used either as context manager or as decorator::
+
+       >>> with metrics.span('render'):
+       ...     theme.render(page)
+
+       >>> @metrics.timed('fetch')
+       ... def download(uri):
+       ...     pass
+
+    Metrics are disabled by default. While disabled, spans are a no-op, so instrumented
+    code costs little more than the :py:keyword:`with` statement or the function call.
+    Recording is thread safe.
+    """
+
+    def __init__(self):
+        self._enabled = False
+        self._phases = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Boolean switch indicating whether spans are recorded"""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = bool(value)
+
+    @property
+    def phases(self):
+        """List of all phases recorded so far, ordered by name"""
+        with self._lock:
+            return [self._phases[name] for name in sorted(self._phases)]
+
+    def span(self, name):
+        """
+        Get a context manager recording the time spent within its context.
+
+        :param str name: name of the phase
+        :returns: context manager
+        """
+        if not self._enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name):
+        """
+        Get a decorator recording the time spent within the decorated function.
+
+        :param str name: name of the phase
+        :returns: decorator
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self._enabled:
+                    return func(*args, **kwargs)
+                start = counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, counter() - start)
+            return wrapper
+        return decorator
+
+    def record(self, name, duration):
+        """
+        Record the time spent within a phase.
+
+        :param str name:       name of the phase
+        :param float duration: time (in fractional seconds) spent within the phase
+        """
+        with self._lock:
+            phase = self._phases.get(name)
+            if phase is None:
+                phase = self._phases[name] = Phase(name)
+            phase.add(duration)
+
+    def reset(self):
+        """Forget all phases recorded so far"""
+        with self._lock:
+            self._phases = {}
+
+    def report(self):
+        """
+        Get a table of all phases recorded so far, showing count, total and mean time and
+        the histogram of each phase.
+
+        :returns: the table as string
+        """
+        labels = ['<{}'.format(_format_duration(bound)) for bound in BUCKETS]
+        labels.append('>={}'.format(_format_duration(BUCKETS[-1])))
+        lines = ["{: <16s} {: >8s} {: >11s} {: >10s}".format('phase', 'count', 'total ms', 'mean ms') +
+                 ''.join(" {: >7s}".format(label) for label in labels)]
+        for phase in self.phases:
+            lines.append(
+                "{: <16s} {: >8d} {: >11.1f} {: >10.3f}".format(
+                    phase.name, phase.count, phase.total * 1000, phase.mean * 1000
+                ) + ''.join(" {: >7d}".format(number) for number in phase.histogram)
+            )
+        return '\n'.join(lines)
+
+
+def _format_duration(seconds):
+    """
+    Format a histogram bound.
+
+    :param float seconds: the bound in seconds
+    :returns: the bound in the most appropriate unit
+    """
+    if seconds < 0.001:
+        return '{:g}us'.format(seconds * 1e6)
+    if seconds < 1:
+        return '{:g}ms'.format(seconds * 1e3)
+    return '{:g}s'.format(seconds)
+
+
+#: Magrathea's metrics registry
+metrics = Metrics()
+
+#: Shortcut for :py:meth:`Metrics.span` of Magrathea's metrics registry
+span = metrics.span
+
+#: Shortcut for :py:meth:`Metrics.timed` of Magrathea's metrics registry
+timed = metrics.timed
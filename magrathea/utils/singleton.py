@@ -56,10 +56,18 @@ class Singleton:
         :param kwargs:    keyword arguments to be passed to the wrapped class' constructor
         :return:          instance of the singleton-decorated class.
         """
-        if not self._instance:
+        if self._instance is None:
             self._instance = self._decorated(*args, **kwargs)
         return self._instance
 
+    def has_instance(self):
+        """
+        Check whether the singleton instance has already been created, without creating it.
+
+        :return: ``True`` if the instance exists, ``False`` otherwise
+        """
+        return self._instance is not None
+
     def __call__(self):
         raise TypeError('Singletons must be accessed through `get_instance()`.')
 
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+    magrathea.utils.slots
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+
+
+class Slotted(object):
+    """
+    Base class for compact objects keeping their attributes in ``__slots__`` instead of a
+    per-instance ``__dict__``. Derived classes list all their attributes in ``__slots__``::
+
+       class Point(Slotted):
+           __slots__ = ('_x', '_y')
+
+    Slotted objects can be pickled with any :py:mod:`pickle` protocol. Their state is pickled as
+    a tuple of the attribute values, in the order of ``__slots__``. When unpickling, attributes
+    missing from the state (e. g. since they have been added to ``__slots__`` later on) are set
+    to ``None``. States pickled as dictionary, i. e. before the class used ``__slots__``, are
+    restored as well.
+
+    Attributes listed in ``_transient`` (e. g. caches of derived values) are pickled as ``None``.
+    """
+
+    __slots__ = ()
+
+    #: names of attributes not to be pickled
+    _transient = ()
+
+    def __getstate__(self):
+        transient = self._transient
+        return tuple(None if name in transient else getattr(self, name, None) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        if isinstance(state, dict):
+            for name, value in state.items():
+                if name in self.__slots__:
+                    setattr(self, name, value)
+        else:
+            for name, value in zip(self.__slots__, state):
+                setattr(self, name, value)
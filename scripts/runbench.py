@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+    Magrathea - Benchmark Script
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+
+import importlib
+import os
+import sys
+
+
+def main():
+    """
+    Magrathea benchmark script main function
+
+    Runs all benchmarks found in the ``benchmark`` package, or only those of the
+    modules given as arguments (e. g. ``runbench.py lookup``).
+    """
+    # find out if running from an uninstalled version
+    # this being the case, insert the appropriate path into PYTHONPATH
+    magrathea_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    if os.path.isfile(os.path.join(magrathea_path, 'magrathea', '__init__.py')):
+        sys.path.insert(0, magrathea_path)
+
+    bench_dir = os.path.join(magrathea_path, 'benchmark')
+    modules = sorted(
+        os.path.splitext(item)[0] for item in os.listdir(bench_dir)
+        if item.startswith('bench_') and item.endswith('.py')
+    )
+    if len(sys.argv) > 1:
+        modules = [module for module in modules if module[6:] in sys.argv[1:]]
+
+    print("\nMagrathea Benchmark Results:\n")
+    for module_name in modules:
+        module = importlib.import_module('benchmark.{}'.format(module_name))
+        print("{}\n{}".format(module_name[6:], '=' * 80))
+        for name in sorted(member for member in dir(module) if member.startswith('bench_')):
+            bench = getattr(module, name)
+            value, unit = bench()
+            print("{description: <60} {value: >12.1f} {unit}".format(
+                description=bench.__doc__.strip().splitlines()[0],
+                value=value,
+                unit=unit
+            ))
+        print("")
+    return os.EX_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+else:
+    raise RuntimeError("This is an executable file. Do not try to import it!")
+    # noinspection PyUnreachableCode
+    sys.exit(os.EX_SOFTWARE)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_cli.t_commands.test_build
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from magrathea.cli.base import BaseCommand
+from magrathea.cli.commands.build import BuildCommand
+
+
+class TestMagratheaCliCommandsBuild(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.cli.commands.build`
+    """
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Check if :py:class:`~magrathea.cli.commands.build.BuildCommand` is a subclass of
+        :py:class:`~magrathea.cli.commands.base.BaseCommand`.
+
+        Test is passed if :py:class:`~magrathea.cli.commands.build.BuildCommand` is a subclass of
+        :py:class:`~magrathea.cli.commands.base.BaseCommand`.
+        """
+        self.assertTrue(issubclass(BuildCommand, BaseCommand))
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Try creating an instance of :py:class:`~magrathea.cli.commands.build.BuildCommand`.
+
+        Test is passed if instance proves being an instance of
+        :py:class:`~magrathea.cli.commands.build.BuildCommand`.
+        """
+        obj = BuildCommand()
+        self.assertIsInstance(obj, BuildCommand)
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Run the build command on planets with a malformed configuration file and with a broken theme.
+
+        Test is passed if the command fails with :py:data:`os.EX_IOERR` instead of a traceback.
+        """
+        script = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scripts', 'magrathea.py')
+        planets = {
+            'conf': ('[DEFAULT]\ntheme = default\ntheme = other\n', None),
+            'theme': ('[DEFAULT]\ntheme = broken\n', '{% for entry in entries %}')
+        }
+        directory = tempfile.mkdtemp()
+        try:
+            for name, (conf, template) in planets.items():
+                path = os.path.join(directory, name)
+                os.makedirs(os.path.join(path, 'themes', 'broken'))
+                with open(os.path.join(path, 'planet.ini'), 'w') as fp:
+                    fp.write(conf)
+                if template:
+                    with open(os.path.join(path, 'themes', 'broken', 'page.html'), 'w') as fp:
+                        fp.write(template)
+                process = subprocess.Popen(
+                    [sys.executable, script, '-d', path, '-n', 'build'],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                output = b''.join(process.communicate())
+                self.assertEqual(process.returncode, os.EX_IOERR, name)
+                self.assertNotIn(b'Traceback', output, name)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Run the build command on planets with an unknown policy, a non-numeric limit and invalid page sizes.
+
+        Test is passed if the command fails with :py:data:`os.EX_IOERR` instead of a traceback.
+        """
+        script = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scripts', 'magrathea.py')
+        planets = {
+            'policy': '[DEFAULT]\npolicy = forever\n',
+            'limit': '[DEFAULT]\nlimit = many\n',
+            'zero': '[DEFAULT]\npaginate = 0\n',
+            'paginate': '[DEFAULT]\npaginate = some\n'
+        }
+        directory = tempfile.mkdtemp()
+        try:
+            for name, conf in planets.items():
+                path = os.path.join(directory, name)
+                os.makedirs(path)
+                with open(os.path.join(path, 'planet.ini'), 'w') as fp:
+                    fp.write(conf)
+                process = subprocess.Popen(
+                    [sys.executable, script, '-d', path, '-n', 'build'],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                output = b''.join(process.communicate())
+                self.assertEqual(process.returncode, os.EX_IOERR, name)
+                self.assertNotIn(b'Traceback', output, name)
+        finally:
+            shutil.rmtree(directory)
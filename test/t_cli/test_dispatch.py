@@ -6,9 +6,42 @@
     :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
     :license: MIT License, see LICENSE for details.
 """
+import os
+import shutil
+import subprocess
 import sys
+import tempfile
 from unittest import TestCase
+from magrathea.cli.base import BaseCommand
+from magrathea.cli.commands import COMMANDS
 from magrathea.cli.dispatch import CommandDispatcher
+from magrathea.utils import loader
+
+
+def dispatch_and_check(argv, modules):
+    """
+    Dispatch a command in a new interpreter and check which modules it has imported
+
+    :param list argv:     list of command line arguments
+    :param tuple modules: names of the modules to check
+    :returns: list of the checked modules that have been imported
+    """
+    code = (
+        "import sys\n"
+        "from magrathea.cli.dispatch import CommandDispatcher\n"
+        "CommandDispatcher({argv!r}).execute()\n"
+        "for module in {modules!r}:\n"
+        "    if module in sys.modules:\n"
+        "        print('imported ' + module)\n"
+    ).format(argv=list(argv), modules=tuple(modules))
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (root, env.get('PYTHONPATH'))))
+    process = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, env=env)
+    output = process.communicate()[0].decode('utf-8').splitlines()
+    if process.returncode != 0:
+        raise AssertionError("command {} failed with status {}".format(argv, process.returncode))
+    return [line[9:] for line in output if line.startswith('imported ')]
 
 
 class TestMagratheaCliDispatch(TestCase):
@@ -58,3 +91,52 @@ class TestMagratheaCliDispatch(TestCase):
         args = [sys.argv[0], 'foo']
         obj = CommandDispatcher(args)
         self.assertEqual(obj._command, '')
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Compare the command registry (see :py:data:`~magrathea.cli.commands.COMMANDS`) with the command
+        classes detected within :py:mod:`magrathea.cli.commands`.
+
+        Test is passed if every command class is registered with its name, aliases and help text.
+        """
+        detected = loader.detect_class_modules('magrathea.cli.commands', BaseCommand)
+        self.assertEqual(sorted(command.member for command in COMMANDS), sorted(detected))
+        for command in COMMANDS:
+            self.assertEqual(command.module, detected[command.member])
+            cls = loader.load_member(command.module, command.member)
+            self.assertEqual(command.name, cls.name)
+            self.assertEqual(tuple(command.aliases), tuple(cls.aliases))
+            self.assertEqual(command.help, cls.help)
+
+    def test_06(self):
+        """
+        Test Case 06:
+        Dispatch the version command in a new interpreter.
+
+        Test is passed if the modules of the other commands and their dependencies are not imported.
+        """
+        imported = dispatch_and_check(
+            ['magrathea', 'version', '--short'],
+            ('magrathea.cli.commands.build', 'magrathea.cli.commands.init',
+             'magrathea.core.planet', 'magrathea.core.cache', 'feedparser', 'jinja2')
+        )
+        self.assertEqual(imported, [])
+
+    def test_07(self):
+        """
+        Test Case 07:
+        Dispatch the init command in a new interpreter.
+
+        Test is passed if neither the modules building the planet nor feedparser and Jinja2 are imported.
+        """
+        target = tempfile.mkdtemp()
+        try:
+            imported = dispatch_and_check(
+                ['magrathea', '-d', target, 'init'],
+                ('magrathea.core.build', 'magrathea.core.cache', 'magrathea.core.theme', 'feedparser', 'jinja2')
+            )
+            self.assertTrue(os.path.exists(os.path.join(target, 'planet.ini')))
+        finally:
+            shutil.rmtree(target)
+        self.assertEqual(imported, [])
@@ -6,9 +6,11 @@
     :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
     :license: MIT License, see LICENSE for details.
 """
+import json
 import os
 import sys
 import tempfile
+import time
 from unittest import TestCase, skipIf
 from magrathea.cli.logger import Logger
 
@@ -51,3 +53,106 @@ class TestMagratheaCliLogger(TestCase):
             content,
             r'^\[\d{4}\-\d{2}\-\d{2} \d{2}:\d{2}:\d{2}\] \[ERROR\] This is a test message$'
         )
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Test logger in background mode by logging many messages into a file.
+
+        Test is passed if all messages are written in order once background mode is left.
+        """
+        fd, name = tempfile.mkstemp()
+        os.close(fd)
+        logger = Logger.get_instance()
+        logger.file = name
+        logger.type = 'file'
+        logger.background = True
+        self.assertTrue(logger.background)
+        for number in range(250):
+            logger.log_error("Message {}".format(number))
+        logger.background = False
+        with open(name, 'r') as fp:
+            content = fp.read()
+        logger.type = 'term'
+        os.unlink(name)
+        lines = content.splitlines()
+        self.assertEqual(len(lines), 250)
+        self.assertEqual([line.split('] ', 2)[2] for line in lines], ["Message {}".format(n) for n in range(250)])
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Test logger by logging a multi-line message into a file, and flushing it explicitly in background mode.
+
+        Test is passed if continuation lines are indented, and the message is written by the flush.
+        """
+        fd, name = tempfile.mkstemp()
+        os.close(fd)
+        logger = Logger.get_instance()
+        logger.file = name
+        logger.type = 'file'
+        logger.background = True
+        logger.log_error("First line\nSecond line")
+        logger.flush()
+        with open(name, 'r') as fp:
+            content = fp.read()
+        logger.background = False
+        logger.type = 'term'
+        os.unlink(name)
+        self.assertRegexpMatches(
+            content,
+            r'^\[\d{4}\-\d{2}\-\d{2} \d{2}:\d{2}:\d{2}\] \[ERROR\] First line\n {30}Second line\n$'
+        )
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Test logger by logging messages with fields into a JSON lines file.
+
+        Test is passed if each message is written as one JSON object holding level, message, timestamps and fields.
+        """
+        fd, name = tempfile.mkstemp()
+        os.close(fd)
+        logger = Logger.get_instance()
+        logger.file = name
+        logger.type = 'json'
+        logger.log_error("fetched", feed='http://example.org/feed.xml', duration=0.25)
+        logger.log_error("Second\nmessage")
+        logger.type = 'term'
+        with open(name, 'rb') as fp:
+            records = [json.loads(line.decode('utf-8')) for line in fp.read().splitlines()]
+        os.unlink(name)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['level'], 'error')
+        self.assertEqual(records[0]['message'], 'fetched')
+        self.assertEqual(records[0]['feed'], 'http://example.org/feed.xml')
+        self.assertEqual(records[0]['duration'], 0.25)
+        self.assertLess(records[0]['monotonic'], records[1]['monotonic'])
+        self.assertAlmostEqual(records[1]['time'], time.time(), delta=60)
+        self.assertEqual(records[1]['message'], 'Second\nmessage')
+
+    def test_06(self):
+        """
+        Test Case 06:
+        Switch the log file of a JSON lines logger after logging a message, and log another one.
+
+        Test is passed if each message is written into the file set at the time it has been logged.
+        """
+        names = []
+        for __ in range(2):
+            fd, name = tempfile.mkstemp()
+            os.close(fd)
+            names.append(name)
+        logger = Logger.get_instance()
+        logger.file = names[0]
+        logger.type = 'json'
+        logger.log_error("first")
+        logger.file = names[1]
+        logger.log_error("second")
+        logger.type = 'term'
+        messages = []
+        for name in names:
+            with open(name, 'rb') as fp:
+                messages.append([json.loads(line.decode('utf-8'))['message'] for line in fp.read().splitlines()])
+            os.unlink(name)
+        self.assertEqual(messages, [['first'], ['second']])
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_cli.test_profiler
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+import pstats
+import shutil
+import tempfile
+from unittest import TestCase, skipIf
+from magrathea.cli.profiler import Profiler, tracemalloc
+
+
+def workload():
+    """Allocate some memory and spend some time"""
+    return len([str(number) for number in range(10000)])
+
+
+class TestMagratheaCliProfiler(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.cli.profiler`
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Run a function with a :py:class:`~magrathea.cli.profiler.Profiler` not asked to profile anything.
+
+        Test is passed if the function's return value is passed through and the summary is empty.
+        """
+        profiler = Profiler()
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(profiler.run(workload), 10000)
+        self.assertEqual(profiler.summary, '')
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Profile a function with :py:mod:`cProfile`.
+
+        Test is passed if the statistics file can be loaded, and the summary lists the function.
+        """
+        stats_file = os.path.join(self.directory, 'stats')
+        profiler = Profiler(stats_file=stats_file, limit=5)
+        self.assertEqual(profiler.run(workload), 10000)
+        self.assertTrue(pstats.Stats(stats_file).total_calls > 0)
+        self.assertIn('workload', profiler.summary)
+
+    @skipIf(tracemalloc is None, "tracemalloc requires Python 3.4 or newer")
+    def test_03(self):
+        """
+        Test Case 03:
+        Trace the memory allocations of a function raising an exception with :py:mod:`tracemalloc`.
+
+        Test is passed if the snapshot is saved nevertheless, and tracing has been stopped.
+        """
+        snapshot_file = os.path.join(self.directory, 'snapshot')
+
+        def failing():
+            workload()
+            raise IOError('gone')
+
+        profiler = Profiler(snapshot_file=snapshot_file)
+        with self.assertRaises(IOError):
+            profiler.run(failing)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertTrue(tracemalloc.Snapshot.load(snapshot_file).traces)
+        self.assertIn('test_profiler.py', profiler.summary)
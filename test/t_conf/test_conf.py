@@ -172,3 +172,24 @@ class TestMagratheaConf(TestCase):
         self.assertTrue(flag)
         self.assertNotIn('foo', obj)
         self.assertFalse(hasattr(obj, 'foo'))
+
+    def test_13(self):
+        """
+        Test Case 13:
+        Test the frozen configuration snapshot.
+
+        Test is passed if the snapshot is reused, read-only and replaced as soon as a value is set or deleted.
+        """
+        obj = ApplicationConf.get_instance()
+        frozen = obj.freeze()
+        self.assertIs(obj.freeze(), frozen)
+        self.assertEqual(frozen['DEFAULT_CHARSET'], obj['DEFAULT_CHARSET'])
+        with self.assertRaises(TypeError):
+            frozen['CHARSET'] = 'iso-8859-1'
+        obj['CHARSET'] = 'iso-8859-1'
+        self.assertIsNot(obj.freeze(), frozen)
+        self.assertEqual(get_conf('CHARSET'), 'iso-8859-1')
+        self.assertEqual(get_conf('charset'), 'iso-8859-1')
+        del obj['CHARSET']
+        self.assertEqual(get_conf('CHARSET'), obj['DEFAULT_CHARSET'])
+        self.assertIsNone(get_conf('NO_SUCH_SETTING'))
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.t_feed.coroutines
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Coroutines for unit tests of :py:mod:`magrathea.core.feed.aio`. They are kept apart from
+    the test modules, since Python versions prior to 3.5 cannot even compile them.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import asyncio
+
+
+async def probe(limiter, host, active, peak):
+    """
+    Occupy a host's semaphore for a moment, recording how many probes are active for that host.
+
+    :param limiter:    :py:class:`~magrathea.core.feed.aio.HostLimiter` instance
+    :param str host:   host name
+    :param list active: hosts of the probes currently active
+    :param list peak:   number of probes active for the host, appended once per probe
+    """
+    async with limiter.get(host):
+        active.append(host)
+        peak.append(active.count(host))
+        await asyncio.sleep(0.01)
+        active.remove(host)
+
+
+async def probe_all(limiter, hosts, active, peak):
+    """
+    Run one probe (see :py:func:`probe`) per host concurrently.
+
+    :param limiter:    :py:class:`~magrathea.core.feed.aio.HostLimiter` instance
+    :param list hosts: host names, possibly repeated
+    :param list active: hosts of the probes currently active
+    :param list peak:   number of probes active for the host, appended once per probe
+    """
+    await asyncio.gather(*[probe(limiter, host, active, peak) for host in hosts])
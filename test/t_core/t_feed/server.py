@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.t_feed.server
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Local HTTP stand-in server for feed related unit tests.
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import threading
+import time
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+
+
+#: Atom document served by the stand-in server
+FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Test Feed</title>
+  <author><name>Arthur Dent</name></author>
+  <entry>
+    <id>urn:magrathea:test:1</id>
+    <title>Entry One</title>
+    <link href="/one"/>
+    <updated>2014-01-01T10:00:00Z</updated>
+    <content type="html">First entry</content>
+  </entry>
+  <entry>
+    <id>urn:magrathea:test:2</id>
+    <title>Entry Two</title>
+    <link href="/two"/>
+    <updated>2014-01-02T10:00:00Z</updated>
+    <content type="html">Second entry</content>
+  </entry>
+</feed>
+"""
+
+#: Etag delivered along with :py:data:`FEED`
+ETAG = '"magrathea-v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Request handler implementing a few well-known feed server behaviours:
+
+    * ``/feed.xml`` serves :py:data:`FEED`, honouring ``If-None-Match``
+    * ``/gone.xml`` answers with 410 (Gone)
+    * ``/moved.xml`` permanently redirects to ``/feed.xml``
+    * ``/slow.xml`` serves :py:data:`FEED` after a delay of two seconds
+    * ``/chunked.xml`` serves :py:data:`FEED` using chunked transfer encoding
+    * anything else answers with 404 (Not Found)
+    """
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == '/feed.xml':
+            if self.headers.get('If-None-Match') == ETAG:
+                self._reply(304)
+            else:
+                self._reply(200, FEED)
+        elif self.path == '/gone.xml':
+            self._reply(410)
+        elif self.path == '/moved.xml':
+            self._reply(301, location='/feed.xml')
+        elif self.path == '/slow.xml':
+            time.sleep(2)
+            self._reply(200, FEED)
+        elif self.path == '/chunked.xml':
+            self._reply_chunked(FEED)
+        else:
+            self._reply(404)
+
+    def _reply(self, status, body=b'', location=None):
+        self.send_response(status)
+        if status == 200:
+            self.send_header('Content-Type', 'application/atom+xml')
+            self.send_header('ETag', ETAG)
+        if location:
+            self.send_header('Location', location)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _reply_chunked(self, body, size=100):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/atom+xml')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for offset in range(0, len(body), size):
+            chunk = body[offset:offset + size]
+            self.wfile.write('{:x}\r\n'.format(len(chunk)).encode('ascii') + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FeedServer(object):
+    """
+    Feed server running in a background thread on a random local port.
+    """
+
+    def __init__(self):
+        self._httpd = _Server(('127.0.0.1', 0), _Handler)
+        self._httpd.requests = []
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+
+    def start(self):
+        """
+        Start serving requests
+        """
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop serving requests
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def uri(self, path):
+        """
+        Get the URI of a document served by this server
+
+        :param str path: path of the document
+        :returns: absolute URI of the document
+        """
+        return 'http://127.0.0.1:{port}{path}'.format(port=self._httpd.server_address[1], path=path)
+
+    @property
+    def requests(self):
+        """
+        List of request paths received so far
+        """
+        return self._httpd.requests
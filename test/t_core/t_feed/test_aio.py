@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.t_feed.test_aio
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import threading
+from unittest import TestCase, skipIf
+from magrathea.core.exceptions import FeedFetchError, FeedGoneError, FeedMovedError
+from magrathea.core.feed.feed import Feed
+from .server import FeedServer, ETAG
+
+try:
+    import asyncio
+    from magrathea.core.feed import aio
+    from .coroutines import probe_all
+except (ImportError, SyntaxError):
+    aio = None
+
+#: local stand-in server
+server = None
+
+
+def run(awaitable):
+    """
+    Run an awaitable within a fresh event loop and return its result
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
+
+
+@skipIf(aio is None, "Asynchronous fetching requires Python 3.5 or newer")
+class TestMagratheaCoreFeedAio(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.core.feed.aio`
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global server
+        server = FeedServer()
+        server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        global server
+        server.stop()
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Download a feed document with :py:func:`~magrathea.core.feed.aio.adownload`.
+
+        Test is passed if the response carries status 200, the etag and the document.
+        """
+        response = run(aio.adownload(server.uri('/feed.xml')))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.etag, ETAG)
+        self.assertIn(b'Test Feed', response.content)
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Download feed documents served with chunked transfer encoding and after a permanent redirect.
+
+        Test is passed if the documents are received completely and the redirect is reported as status 301.
+        """
+        response = run(aio.adownload(server.uri('/chunked.xml')))
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.content.endswith(b'</feed>\n'))
+        response = run(aio.adownload(server.uri('/moved.xml')))
+        self.assertEqual(response.status, 301)
+        self.assertEqual(response.href, server.uri('/feed.xml'))
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Update one feed via :py:meth:`~magrathea.core.feed.feed.Feed.aupdate` and another one via
+        :py:meth:`~magrathea.core.feed.feed.Feed.update`.
+
+        Test is passed if both feeds end up with identical entries.
+        """
+        sync_feed = Feed(uri=server.uri('/feed.xml'))
+        sync_feed.update()
+        async_feed = Feed(uri=server.uri('/feed.xml'))
+        run(async_feed.aupdate())
+        self.assertEqual(async_feed.status, 200)
+        self.assertEqual(async_feed.title, sync_feed.title)
+        self.assertEqual(
+            [(e.id, e.key, e.title, e.body) for e in async_feed.entries_asc],
+            [(e.id, e.key, e.title, e.body) for e in sync_feed.entries_asc]
+        )
+        run(async_feed.aupdate())
+        self.assertEqual(async_feed.status, 304)
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Update a set of feeds with :py:func:`~magrathea.core.feed.aio.fetch_all`.
+
+        Test is passed if there is one result per feed, in order, carrying the expected status and error.
+        """
+        feeds = [
+            Feed(uri=server.uri('/feed.xml')),
+            Feed(uri=server.uri('/gone.xml')),
+            Feed(uri=server.uri('/moved.xml')),
+            Feed(uri=server.uri('/missing.xml')),
+            Feed(uri=server.uri('/slow.xml'))
+        ]
+        results = run(aio.fetch_all(feeds, timeout=0.5, host_limit=2))
+        self.assertEqual([result.feed for result in results], feeds)
+        self.assertEqual(results[0].status, 200)
+        self.assertIsInstance(results[1].error, FeedGoneError)
+        self.assertIsInstance(results[2].error, FeedMovedError)
+        self.assertEqual(len(feeds[2].entries_unordered), 2)
+        self.assertEqual(results[3].status, 404)
+        self.assertIsInstance(results[3].error, FeedFetchError)
+        self.assertIsInstance(results[4].error, FeedFetchError)
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Verify the per-host semaphores of :py:class:`~magrathea.core.feed.aio.HostLimiter`.
+
+        Test is passed if one semaphore is kept per host and never more than the limit is acquired at once.
+        """
+        limiter = aio.HostLimiter(1)
+        active = []
+        peak = []
+        run(probe_all(limiter, ('a', 'a', 'a', 'b', 'b'), active, peak))
+        self.assertIs(limiter.get('a'), limiter.get('a'))
+        self.assertIsNot(limiter.get('a'), limiter.get('b'))
+        self.assertEqual(max(peak), 1)
+
+    def test_06(self):
+        """
+        Test Case 06:
+        Update a feed via :py:meth:`~magrathea.core.feed.feed.Feed.aupdate`.
+
+        Test is passed if the feed document is processed outside the thread running the event loop.
+        """
+
+        class RecordingFeed(Feed):
+            threads = []
+
+            def update_from_response(self, response):
+                self.threads.append(threading.current_thread())
+                return Feed.update_from_response(self, response)
+
+        feed = RecordingFeed(uri=server.uri('/feed.xml'))
+        run(feed.aupdate())
+        self.assertEqual(feed.status, 200)
+        self.assertEqual(len(feed.threads), 1)
+        self.assertIsNot(feed.threads[0], threading.current_thread())
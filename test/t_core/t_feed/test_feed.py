@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.t_feed.test_feed
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from unittest import TestCase
+from magrathea.core.exceptions import FeedGoneError
+from magrathea.core.feed.feed import Feed
+from magrathea.core.feed.fetch import Response
+from .server import FeedServer, FEED, ETAG
+
+#: local stand-in server
+server = None
+
+
+class TestMagratheaCoreFeedFeed(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.core.feed.feed`
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global server
+        server = FeedServer()
+        server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        global server
+        server.stop()
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Create a :py:class:`~magrathea.core.feed.feed.Feed` with title and author.
+
+        Test is passed if title and author are kept and not overwritten by the feed's own information.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'), title='My Title', author='Me')
+        self.assertEqual(feed.title, 'My Title')
+        self.assertEqual(feed.author, 'Me')
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Update a :py:class:`~magrathea.core.feed.feed.Feed` backed by a cache.
+
+        Test is passed if the feed's validators, status, fetch time, content hash and entries are persisted.
+        """
+        cache = {}
+        feed = Feed(uri=server.uri('/feed.xml'), cache=cache)
+        feed.update()
+        state = cache['feed-state:' + feed.key.decode('ascii')]
+        self.assertEqual(state['etag'], ETAG)
+        self.assertEqual(state['status'], 200)
+        self.assertEqual(state['uri'], server.uri('/feed.xml'))
+        self.assertIsNotNone(state['fetched'])
+        self.assertIsNotNone(state['hash'])
+        self.assertEqual(len(cache['feed-entries:' + feed.key.decode('ascii')]), 2)
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Create a second :py:class:`~magrathea.core.feed.feed.Feed` on a cache populated by a first one.
+
+        Test is passed if the state is restored and the first update is answered with 304, keeping all entries.
+        """
+        cache = {}
+        Feed(uri=server.uri('/feed.xml'), cache=cache).update()
+        feed = Feed(uri=server.uri('/feed.xml'), cache=cache)
+        self.assertEqual(len(feed._entries), 2)
+        feed.update()
+        self.assertEqual(feed.status, 304)
+        self.assertEqual(feed.title, 'Test Feed')
+        self.assertEqual(feed.etag, ETAG)
+        self.assertEqual(len(feed.entries_unordered), 2)
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Create a second :py:class:`~magrathea.core.feed.feed.Feed` on a cache knowing the feed has gone.
+
+        Test is passed if :py:exc:`~magrathea.core.exceptions.FeedGoneError` is raised without contacting the server.
+        """
+        cache = {}
+        with self.assertRaises(FeedGoneError):
+            Feed(uri=server.uri('/gone.xml'), cache=cache).update()
+        requests = len(server.requests)
+        feed = Feed(uri=server.uri('/gone.xml'), cache=cache)
+        with self.assertRaises(FeedGoneError):
+            feed.update()
+        self.assertEqual(len(server.requests), requests)
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Update a :py:class:`~magrathea.core.feed.feed.Feed` with a changed document containing known entries.
+
+        Test is passed if known entries are updated in place instead of being added again.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update_from_response(Response(200, {}, FEED, feed.uri))
+        first = feed._get_entry_by_id(feed.entries_unordered[0].id)
+        changed = FEED.replace(b'Entry One', b'Entry One (updated)')
+        feed.update_from_response(Response(200, {}, changed, feed.uri))
+        self.assertEqual(len(feed.entries_unordered), 2)
+        self.assertIs(feed._get_entry_by_id(first.id), first)
+        self.assertEqual(first.title, 'Entry One (updated)')
+
+    def test_06(self):
+        """
+        Test Case 06:
+        Restore a :py:class:`~magrathea.core.feed.feed.Feed` from a cache holding duplicate entries.
+
+        Test is passed if duplicates are collapsed into the first entry carrying the id.
+        """
+        cache = {}
+        feed = Feed(uri=server.uri('/feed.xml'), cache=cache)
+        feed.update()
+        entries_key = 'feed-entries:' + feed.key.decode('ascii')
+        cache[entries_key] = cache[entries_key] + cache[entries_key][:1]
+        restored = Feed(uri=server.uri('/feed.xml'), cache=cache)
+        self.assertEqual(len(restored._entries), 2)
+        self.assertIs(restored._get_entry_by_id(cache[entries_key][0].id), cache[entries_key][0])
+
+    def test_07(self):
+        """
+        Test Case 07:
+        Verify the ordered entry views of a :py:class:`~magrathea.core.feed.feed.Feed`, also after an
+        entry's date has changed.
+
+        Test is passed if all views reflect the entries' publishing dates.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update_from_response(Response(200, {}, FEED, feed.uri))
+        self.assertEqual([e.title for e in feed.entries_asc], ['Entry One', 'Entry Two'])
+        self.assertEqual([e.title for e in feed.entries_desc], ['Entry Two', 'Entry One'])
+        self.assertEqual([e.title for e in feed.iter_entries(reverse=True, limit=1)], ['Entry Two'])
+        self.assertEqual(feed._get_entry_most_recent().title, 'Entry Two')
+        changed = FEED.replace(b'2014-01-01T10:00:00Z', b'2014-01-03T10:00:00Z')
+        feed.update_from_response(Response(200, {}, changed, feed.uri))
+        self.assertEqual([e.title for e in feed.entries_asc], ['Entry Two', 'Entry One'])
+        self.assertEqual([e.title for e in feed.iter_entries()], ['Entry Two', 'Entry One'])
+        self.assertEqual(feed._get_entry_most_recent().title, 'Entry One')
+
+    def test_08(self):
+        """
+        Test Case 08:
+        Verify the body of the entries of a :py:class:`~magrathea.core.feed.feed.Feed`.
+
+        Test is passed if the body equals the entry's content.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update_from_response(Response(200, {}, FEED, feed.uri))
+        self.assertEqual([e.body for e in feed.entries_asc], ['First entry', 'Second entry'])
+
+    def test_09(self):
+        """
+        Test Case 09:
+        Verify the feed information passed to the entries of a :py:class:`~magrathea.core.feed.feed.Feed`.
+
+        Test is passed if all entries share one instance, which is replaced once the feed's information changes.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update_from_response(Response(200, {}, FEED, feed.uri))
+        first, second = feed.entries_asc
+        self.assertFalse(hasattr(first, '__dict__'))
+        self.assertIs(first.feed, second.feed)
+        info = first.feed
+        feed.update_from_response(Response(200, {}, FEED.replace(b'2014-01-01', b'2014-01-03'), feed.uri))
+        self.assertIs(first.feed, info)
+        feed._title = 'Another Title'
+        feed._attach_info()
+        self.assertIsNot(first.feed, info)
+        self.assertIs(first.feed, second.feed)
+        self.assertEqual(first.feed.title, 'Another Title')
+
+    def test_10(self):
+        """
+        Test Case 10:
+        Verify the memoized derived values of the entries of a :py:class:`~magrathea.core.feed.feed.Feed`.
+
+        Test is passed if the values are memoized, kept by unchanged updates, and recomputed after changes
+        and after having been forgotten.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update_from_response(Response(200, {}, FEED, feed.uri))
+        entry = feed.entries_asc[0]
+        self.assertEqual(entry.get_pubdate_gmt('%Y-%m-%d'), '2014-01-01')
+        self.assertEqual(entry.body, 'First entry')
+        self.assertIs(entry.pubdate_local, entry.pubdate_local)
+        derived = entry._derived
+        self.assertIn('body', derived)
+        feed.update_from_response(Response(200, {}, FEED.replace(b'Entry Two', b'Entry 2'), feed.uri))
+        self.assertIs(entry._derived, derived)
+        changed = FEED.replace(b'2014-01-01T10:00:00Z', b'2014-01-03T10:00:00Z').replace(b'First', b'1st')
+        feed.update_from_response(Response(200, {}, changed, feed.uri))
+        self.assertIsNone(entry._derived)
+        self.assertEqual(entry.get_pubdate_gmt('%Y-%m-%d'), '2014-01-03')
+        self.assertEqual(entry.body, '1st entry')
+        entry.forget()
+        self.assertIsNone(entry._derived)
+        self.assertEqual(entry.body, '1st entry')
+
+    def test_11(self):
+        """
+        Test Case 11:
+        Verify the change detection of the entries of a :py:class:`~magrathea.core.feed.feed.Feed`.
+
+        Test is passed if only entries added or changed by the most recent update are reported dirty.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update_from_response(Response(200, {}, FEED, feed.uri))
+        first, second = feed.entries_asc
+        self.assertEqual(len(feed.dirty_entries), 2)
+        fingerprint = first.fingerprint
+        feed.update_from_response(Response(200, {}, FEED.replace(b'Second entry', b'2nd entry'), feed.uri))
+        self.assertEqual(feed.dirty_entries, [second])
+        self.assertEqual(first.fingerprint, fingerprint)
+        self.assertNotEqual(second.fingerprint, fingerprint)
+        feed.update_from_response(Response(200, {}, FEED.replace(b'Second entry', b'2nd entry') + b'\n', feed.uri))
+        self.assertEqual(feed.dirty_entries, [])
+
+    def test_12(self):
+        """
+        Test Case 12:
+        Verify the body of the entries of a :py:class:`~magrathea.core.feed.feed.Feed` providing summaries.
+
+        Test is passed if the summary is only kept, and used as body, for the entry without content.
+        """
+        document = FEED.replace(
+            b'<content type="html">First entry</content>',
+            b'<summary>First summary</summary><content type="html">First entry</content>'
+        ).replace(b'<content type="html">Second entry</content>', b'<summary>Second summary</summary>')
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update_from_response(Response(200, {}, document, feed.uri))
+        first, second = feed.entries_asc
+        self.assertEqual([first.body, second.body], ['First entry', 'Second summary'])
+        self.assertIsNone(first._description)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.t_feed.test_fetch
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from unittest import TestCase
+from magrathea.core.exceptions import FeedFetchError, FeedGoneError, FeedMovedError
+from magrathea.core.feed.feed import Feed
+from magrathea.core.feed.fetch import download, Fetcher, FetchResult, Response
+from .server import FeedServer, ETAG
+
+#: local stand-in server
+server = None
+
+
+class TestMagratheaCoreFeedFetch(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.core.feed.fetch`
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global server
+        server = FeedServer()
+        server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        global server
+        server.stop()
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Download a feed document with :py:func:`~magrathea.core.feed.fetch.download`.
+
+        Test is passed if a :py:class:`~magrathea.core.feed.fetch.Response` with status 200 and the etag is returned.
+        """
+        response = download(server.uri('/feed.xml'))
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.etag, ETAG)
+        self.assertIn(b'Test Feed', response.content)
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Perform a conditional download with :py:func:`~magrathea.core.feed.fetch.download`.
+
+        Test is passed if the server answers with status 304.
+        """
+        response = download(server.uri('/feed.xml'), etag=ETAG)
+        self.assertEqual(response.status, 304)
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Download a permanently moved feed with :py:func:`~magrathea.core.feed.fetch.download`.
+
+        Test is passed if the status is 301 and the final location is reported.
+        """
+        response = download(server.uri('/moved.xml'))
+        self.assertEqual(response.status, 301)
+        self.assertEqual(response.href, server.uri('/feed.xml'))
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Update a :py:class:`~magrathea.core.feed.feed.Feed` twice.
+
+        Test is passed if the entries are parsed and the second update is answered with status 304.
+        """
+        feed = Feed(uri=server.uri('/feed.xml'))
+        feed.update()
+        self.assertEqual(feed.status, 200)
+        self.assertEqual(feed.title, 'Test Feed')
+        self.assertEqual(len(feed.entries_unordered), 2)
+        feed.update()
+        self.assertEqual(feed.status, 304)
+        self.assertEqual(len(feed.entries_unordered), 2)
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Update a :py:class:`~magrathea.core.feed.feed.Feed` that has gone.
+
+        Test is passed if :py:exc:`~magrathea.core.exceptions.FeedGoneError` is raised.
+        """
+        feed = Feed(uri=server.uri('/gone.xml'))
+        with self.assertRaises(FeedGoneError):
+            feed.update()
+
+    def test_06(self):
+        """
+        Test Case 06:
+        Update a :py:class:`~magrathea.core.feed.feed.Feed` within a too short timeout.
+
+        Test is passed if :py:exc:`~magrathea.core.exceptions.FeedFetchError` is raised.
+        """
+        feed = Feed(uri=server.uri('/slow.xml'))
+        with self.assertRaises(FeedFetchError):
+            feed.update(timeout=0.2)
+
+    def test_07(self):
+        """
+        Test Case 07:
+        Fetch a set of feeds using a :py:class:`~magrathea.core.feed.fetch.Fetcher`.
+
+        Test is passed if there is one result per feed, in order, carrying the expected status and error.
+        """
+        feeds = [
+            Feed(uri=server.uri('/feed.xml')),
+            Feed(uri=server.uri('/gone.xml')),
+            Feed(uri=server.uri('/moved.xml')),
+            Feed(uri=server.uri('/missing.xml')),
+            Feed(uri=server.uri('/slow.xml'))
+        ]
+        results = Fetcher(workers=3, timeout=0.5).fetch(feeds)
+        self.assertEqual(len(results), len(feeds))
+        for feed, result in zip(feeds, results):
+            self.assertIsInstance(result, FetchResult)
+            self.assertIs(result.feed, feed)
+        self.assertTrue(results[0])
+        self.assertEqual(results[0].status, 200)
+        self.assertEqual(results[0].etag, ETAG)
+        self.assertEqual(results[1].status, 410)
+        self.assertIsInstance(results[1].error, FeedGoneError)
+        self.assertEqual(results[2].status, 301)
+        self.assertIsInstance(results[2].error, FeedMovedError)
+        self.assertEqual(len(feeds[2].entries_unordered), 2)
+        self.assertEqual(results[3].status, 404)
+        self.assertIsInstance(results[3].error, FeedFetchError)
+        self.assertIsNone(results[4].status)
+        self.assertIsInstance(results[4].error, FeedFetchError)
+
+    def test_08(self):
+        """
+        Test Case 08:
+        Fetch a feed whose update fails with an unexpected exception after a response has been received.
+
+        Test is passed if the result records the exception and the feed is updated only once.
+        """
+
+        class BrokenFeed(Feed):
+            calls = 0
+
+            def update(self, timeout=None):
+                self.calls += 1
+                self._status = 200
+                raise RuntimeError('parser crashed')
+
+        feed = BrokenFeed(uri=server.uri('/feed.xml'))
+        results = Fetcher(workers=1).fetch([feed])
+        self.assertIsInstance(results[0], FetchResult)
+        self.assertIsInstance(results[0].error, RuntimeError)
+        self.assertEqual(results[0].status, 200)
+        self.assertEqual(feed.calls, 1)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.test_build
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from magrathea.core.build import Builder, SimpleRenderer, iter_pages, paginate, prefetch
+from magrathea.core.cache import Cache
+from magrathea.core.feed.feed import Feed
+from magrathea.core.feed.fetch import Response
+from magrathea.core.timeline import Timeline
+
+
+def make_document(count):
+    """
+    Create an Atom document holding one entry per day, starting on 2014-01-01
+
+    :param int count: number of entries
+    :returns: the document as byte sequence
+    """
+    entries = []
+    for index in range(count):
+        entries.append(
+            '<entry><id>urn:build:{index}</id><title>Entry {index}</title><link href="/{index}"/>'
+            '<updated>2014-{month:02d}-{day:02d}T10:00:00Z</updated><content>Body {index}</content></entry>'.format(
+                index=index, month=index // 28 + 1, day=index % 28 + 1
+            )
+        )
+    return '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">' \
+           '<title>Build</title>{}</feed>'.format(''.join(entries)).encode('utf-8')
+
+
+class TestMagratheaCoreBuild(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.core.build`
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.feed = Feed(uri='http://example.org/build.xml')
+        self.update(10)
+        self.cache = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def update(self, count):
+        self.feed.update_from_response(Response(200, {}, make_document(count), self.feed.uri))
+
+    def build(self, renderer=None, force=False):
+        builder = Builder(self.directory, renderer or SimpleRenderer(), cache=self.cache, paginate=2)
+        self.assertTrue(builder.build(Timeline([self.feed], policy='none'), force=force))
+        return builder.written
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Split entries into pages with :py:func:`~magrathea.core.build.paginate`.
+
+        Test is passed if all pages but the most recent one (and the oldest one, if older entries have gone) are full,
+        and the most recent one is the index page.
+        """
+        pages = paginate(list(range(7)), 3)
+        self.assertEqual([page.number for page in pages], [3, 2, 1])
+        self.assertEqual([page.entries for page in pages], [[0], [1, 2, 3], [4, 5, 6]])
+        self.assertEqual([page.is_index for page in pages], [True, False, False])
+        self.assertEqual((pages[1].newer, pages[1].older), ('page3.html', 'page1.html'))
+        self.assertEqual(len(paginate([], 3)), 1)
+        pages = list(iter_pages(list(range(5)), 3, 5, offset=4))
+        self.assertEqual([page.number for page in pages], [3, 2])
+        self.assertEqual([page.entries for page in pages], [[0, 1, 2], [3, 4]])
+        self.assertEqual((pages[0].is_index, pages[0].older, pages[1].older), (True, 'page2.html', None))
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Build pages twice with a :py:class:`~magrathea.core.build.Builder`.
+
+        Test is passed if all pages are written by the first build, and none by the second one.
+        """
+        self.assertEqual(len(self.build()), 6)
+        self.assertEqual(sorted(os.listdir(self.directory)), [
+            'index.html', 'page1.html', 'page2.html', 'page3.html', 'page4.html', 'page5.html'
+        ])
+        self.assertEqual(self.build(), [])
+        with open(os.path.join(self.directory, 'index.html'), 'rb') as fp:
+            self.assertIn(b'Entry 9', fp.read())
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Build pages after new entries have been published.
+
+        Test is passed if only the most recent page, and the page preceding it once a new page is begun, are written.
+        """
+        self.build()
+        self.update(11)
+        self.assertEqual(self.build(), ['page6.html', 'index.html', 'page5.html'])
+        self.update(12)
+        self.assertEqual(self.build(), ['page6.html', 'index.html'])
+        self.assertEqual(len(os.listdir(self.directory)), 7)
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Build pages after an entry has changed, after the renderer has changed and with force.
+
+        Test is passed if only the page holding the entry, respectively all pages, are written.
+        """
+        self.build()
+        self.feed.update_from_response(
+            Response(200, {}, make_document(10).replace(b'Body 3', b'Changed'), self.feed.uri)
+        )
+        self.assertEqual(self.build(), ['page2.html'])
+
+        class OtherRenderer(SimpleRenderer):
+            signature = ('other', 1)
+
+        self.assertEqual(len(self.build(renderer=OtherRenderer())), 6)
+        self.assertEqual(len(self.build(renderer=OtherRenderer(), force=True)), 6)
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Build pages after entries have gone.
+
+        Test is passed if pages that do not exist anymore are removed, while the remaining pages keep their numbers.
+        """
+        self.build()
+        builder = Builder(self.directory, SimpleRenderer(), cache=self.cache, paginate=2)
+        builder.build(Timeline([self.feed], policy='global', limit=3))
+        self.assertEqual(sorted(os.listdir(self.directory)), ['index.html', 'page4.html', 'page5.html'])
+
+    def test_06(self):
+        """
+        Test Case 06:
+        Split an entry stream into pages with :py:func:`~magrathea.core.build.iter_pages` and
+        :py:func:`~magrathea.core.build.prefetch`.
+
+        Test is passed if entries are only pulled as far as needed, and errors reach the consumer.
+        """
+        pulled = []
+
+        def stream():
+            for index in range(7):
+                pulled.append(index)
+                yield index
+
+        pages = iter_pages(stream(), 3, 7)
+        self.assertEqual(next(pages).entries, [0])
+        self.assertEqual(pulled, [0])
+        self.assertEqual([page.entries for page in prefetch(pages)], [[1, 2, 3], [4, 5, 6]])
+
+        def failing():
+            yield 1
+            raise IOError('gone')
+
+        with self.assertRaises(IOError):
+            list(prefetch(failing()))
+
+    def test_07(self):
+        """
+        Test Case 07:
+        Build pages from a plain iterator, and with a renderer failing on one of the pages.
+
+        Test is passed if the pages are built with their rendering times recorded, and the failing build leaves
+        no temporary files behind.
+        """
+        builder = Builder(self.directory, SimpleRenderer(), paginate=4)
+        result = builder.build(iter(list(Timeline([self.feed], policy='none'))))
+        self.assertTrue(result)
+        self.assertEqual(builder.written, ['page3.html', 'index.html', 'page2.html', 'page1.html'])
+        timed = [fields for level, message, fields in result.records if 'duration' in fields]
+        self.assertEqual([fields['page'] for fields in timed], ['page3.html', 'page2.html', 'page1.html'])
+
+        class FailingRenderer(SimpleRenderer):
+            signature = ('failing', 1)
+
+            def render(self, page):
+                if page.number == 2:
+                    raise IOError('disk full')
+                return SimpleRenderer.render(self, page)
+
+        builder = Builder(self.directory, FailingRenderer(), paginate=4)
+        self.assertFalse(builder.build(Timeline([self.feed], policy='none')))
+        self.assertEqual(sorted(os.listdir(self.directory)), ['index.html', 'page1.html', 'page2.html', 'page3.html'])
+
+    def test_08(self):
+        """
+        Test Case 08:
+        Build pages after the oldest entries have expired, and after a new entry has been published.
+
+        Test is passed if only the oldest remaining page is written after the expiry, and only the most recent
+        pages are written after the publication.
+        """
+        self.build()
+        builder = Builder(self.directory, SimpleRenderer(), cache=self.cache, paginate=2)
+        self.assertTrue(builder.build(Timeline([self.feed], policy='global', limit=7)))
+        self.assertEqual(builder.written, ['page2.html'])
+        self.assertNotIn('page1.html', os.listdir(self.directory))
+        with open(os.path.join(self.directory, 'page2.html'), 'rb') as fp:
+            content = fp.read()
+        self.assertIn(b'Entry 3', content)
+        self.assertNotIn(b'Entry 2<', content)
+        self.assertNotIn(b'older', content)
+        self.update(11)
+        self.assertTrue(builder.build(Timeline([self.feed], policy='global', limit=8)))
+        self.assertEqual(builder.written, ['page6.html', 'index.html', 'page5.html'])
+        self.assertTrue(builder.build(Timeline([self.feed], policy='global', limit=8)))
+        self.assertEqual(builder.written, [])
+
+    def test_09(self):
+        """
+        Test Case 09:
+        Build pages twice, keeping the dependencies in a :py:class:`~magrathea.core.cache.Cache` backed by
+        :py:mod:`shelve`, re-opened in between.
+
+        Test is passed if the pages are only written by the first build.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            for written in (['page5.html', 'index.html', 'page4.html', 'page3.html', 'page2.html', 'page1.html'], []):
+                # a private instance, so the planet-wide cache instance is left untouched
+                self.cache = Cache._decorated(os.path.join(directory, 'cache'), backend='shelve')
+                self.assertEqual(self.build(), written)
+                self.cache.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_10(self):
+        """
+        Test Case 10:
+        Try creating a :py:class:`~magrathea.core.build.Builder` with zero and with a negative number of
+        entries per page.
+
+        Test is passed if :py:exc:`ValueError` is raised.
+        """
+        for size in (0, -1, '0'):
+            with self.assertRaises(ValueError):
+                Builder(self.directory, SimpleRenderer(), paginate=size)
@@ -8,10 +8,13 @@
 """
 import os
 import sys
+import shelve
 import shutil
 import tempfile
+import threading
 from unittest import TestCase, skipIf
 from magrathea.core.cache import Cache
+from magrathea.utils.lru import LRUDict
 
 #: database name
 db_name = ''
@@ -31,6 +34,7 @@ class TestMagratheaCoreCache(TestCase):
     @classmethod
     def tearDownClass(cls):
         global db_name
+        Cache.get_instance().close()
         shutil.rmtree(os.path.dirname(db_name))
 
     def test_01(self):
@@ -173,3 +177,129 @@ class TestMagratheaCoreCache(TestCase):
         obj3 = Cache.get_instance(db_name)
         self.assertEqual(dict(obj3), {})
         del obj3
+
+    def test_09(self):
+        """
+        Test Case 09:
+        Test the database handle of a :py:class:`~magrathea.core.cache.Cache` object.
+
+        Test is passed if one handle is kept open across operations and re-opened transparently after
+        :py:meth:`~magrathea.core.cache.Cache.close` has been called.
+        """
+        global db_name
+        obj = Cache.get_instance(db_name)
+        obj['test'] = 'test data'
+        db = obj._db
+        self.assertIsNotNone(db)
+        obj['test'] = 'other data'
+        self.assertIs(obj._db, db)
+        obj.close()
+        self.assertIsNone(obj._db)
+        obj.data.clear()
+        self.assertEqual(obj['test'], 'other data')
+        obj.reset()
+
+    def test_10(self):
+        """
+        Test Case 10:
+        Test :py:meth:`~magrathea.core.cache.Cache.batch` method, including nested batches.
+
+        Test is passed if all items written within the batches are found in the database afterwards.
+        """
+        global db_name
+        obj = Cache.get_instance(db_name)
+        with obj.batch():
+            for number in range(50):
+                obj['item-{}'.format(number)] = number
+            with obj.batch():
+                obj['nested'] = 'nested data'
+            self.assertEqual(obj._batch_depth, 1)
+        self.assertEqual(obj._batch_depth, 0)
+        obj.close()
+        db = shelve.open(obj._db_file, flag='r')
+        self.assertEqual(db['item-49'], 49)
+        self.assertEqual(db['nested'], 'nested data')
+        db.close()
+        obj.reset()
+
+    def test_11(self):
+        """
+        Test Case 11:
+        Insert more items into a :py:class:`~magrathea.core.cache.Cache` object than its in-memory tier can hold.
+
+        Test is passed if memory use is bounded, evictions are counted and evicted items are reloaded on access.
+        """
+        global db_name
+        obj = Cache.get_instance(db_name)
+        limit = obj.stats['limit']
+        evictions = obj.stats['evictions']
+        with obj.batch():
+            for number in range(limit + 10):
+                obj['item-{}'.format(number)] = number
+        self.assertEqual(obj.stats['size'], limit)
+        self.assertGreaterEqual(obj.stats['evictions'], evictions + 10)
+        misses = obj.stats['misses']
+        self.assertEqual(obj['item-0'], 0)
+        self.assertEqual(obj.stats['misses'], misses + 1)
+        hits = obj.stats['hits']
+        self.assertEqual(obj['item-0'], 0)
+        self.assertEqual(obj.stats['hits'], hits + 1)
+        obj.reset()
+        self.assertNotIn('item-1', obj)
+
+    def test_12(self):
+        """
+        Test Case 12:
+        Read and write items of a :py:class:`~magrathea.core.cache.Cache` object from 16 threads,
+        with an in-memory tier holding two items only.
+
+        Test is passed if no thread raises an exception and all items hold a value written by a thread.
+        """
+        global db_name
+        obj = Cache.get_instance(db_name)
+        data = obj.data
+        obj.data = LRUDict(2)
+        errors = []
+        interval = sys.getswitchinterval() if hasattr(sys, 'getswitchinterval') else None
+        if interval is not None:
+            # switch threads as often as possible to provoke races
+            sys.setswitchinterval(1e-6)
+
+        def work(offset):
+            try:
+                for number in range(300):
+                    obj['item-{}'.format((number + offset) % 8)] = number
+                    obj.get('item-{}'.format((number + offset + 3) % 8))
+            except Exception as e:
+                errors.append(e)
+
+        try:
+            with obj.batch():
+                threads = [threading.Thread(target=work, args=(offset,)) for offset in range(16)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            self.assertEqual(errors, [])
+            for number in range(8):
+                self.assertIn(obj['item-{}'.format(number)], range(300))
+        finally:
+            if interval is not None:
+                sys.setswitchinterval(interval)
+            obj.reset()
+            obj.data = data
+
+    def test_13(self):
+        """
+        Test Case 13:
+        Close a :py:class:`magrathea.core.cache.Cache` twice, after its directory has been removed.
+
+        Test is passed if no exception is raised.
+        """
+        directory = tempfile.mkdtemp()
+        # a private instance, so the shared instance keeps its database
+        obj = Cache._decorated(os.path.join(directory, 'cache_db'), backend='shelve')
+        obj['foo'] = 'bar'
+        shutil.rmtree(directory)
+        obj.close()
+        obj.close()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.test_storage
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import base64
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from magrathea.core.feed.feed import Feed
+from magrathea.core.feed.fetch import Response
+from magrathea.core.storage import open_storage, migrate_keys, ShelveStorage, SQLiteStorage, ENTRIES_PREFIX, \
+    STATE_PREFIX, KEY_SCHEME_KEY
+from .t_feed.server import FEED
+
+
+def make_feeds():
+    """
+    Create two feeds with two entries each, published on 2014-01-01, 2014-01-02, 2014-02-01 and 2014-02-02
+
+    :returns: list of :py:class:`~magrathea.core.feed.feed.Feed` instances
+    """
+    first = Feed(uri='http://example.org/first.xml')
+    first.update_from_response(Response(200, {}, FEED, first.uri))
+    second = Feed(uri='http://example.org/second.xml')
+    second.update_from_response(Response(200, {}, FEED.replace(b'2014-01-', b'2014-02-'), second.uri))
+    return [first, second]
+
+
+class TestMagratheaCoreStorage(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.core.storage`
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.directory, 'cache')
+        self.feeds = make_feeds()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fill(self, db):
+        for feed in self.feeds:
+            db[ENTRIES_PREFIX + str(feed.key.decode('ascii'))] = feed.entries_asc
+        db['foo'] = {'bar': 'baz'}
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Open storages with :py:func:`~magrathea.core.storage.open_storage`.
+
+        Test is passed if the requested backend is used and an unknown backend raises :py:exc:`ValueError`.
+        """
+        db = open_storage(self.db_file, backend='shelve')
+        self.assertIsInstance(db, ShelveStorage)
+        db.close()
+        db = open_storage(self.db_file, backend='sqlite')
+        self.assertIsInstance(db, SQLiteStorage)
+        db.close()
+        with self.assertRaises(ValueError):
+            open_storage(self.db_file, backend='tape')
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Store, retrieve and delete items within a :py:class:`~magrathea.core.storage.SQLiteStorage`.
+
+        Test is passed if the items, including feed entries, persist across re-opening the storage.
+        """
+        db = SQLiteStorage(self.db_file)
+        self.fill(db)
+        db.close()
+        db = SQLiteStorage(self.db_file)
+        key = ENTRIES_PREFIX + self.feeds[0].key.decode('ascii')
+        self.assertEqual(db['foo'], {'bar': 'baz'})
+        self.assertEqual([entry.title for entry in db[key]], ['Entry One', 'Entry Two'])
+        self.assertEqual(len(db), 3)
+        del db[key]
+        self.assertNotIn(key, db)
+        with self.assertRaises(KeyError):
+            db[key]
+        self.assertEqual(len(db.query_entries()), 2)
+        db.close()
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Query the most recent entries from both storage backends.
+
+        Test is passed if both backends return the same entries in descending order, honouring limit, date and feeds.
+        """
+        for backend in ('shelve', 'sqlite'):
+            db = open_storage(self.db_file, backend=backend, flag='n')
+            self.fill(db)
+            keys = [entry.key for entry in db.query_entries()]
+            self.assertEqual(keys, ['20140202100000', '20140201100000', '20140102100000', '20140101100000'])
+            self.assertEqual(len(db.query_entries(limit=3)), 3)
+            self.assertEqual(len(db.query_entries(since='20140102000000')), 3)
+            self.assertEqual(
+                [entry.key for entry in db.query_entries(limit=1, feeds=[self.feeds[0].key.decode('ascii')])],
+                ['20140102100000']
+            )
+            db.close()
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Open an existing :py:class:`~magrathea.core.storage.SQLiteStorage` with flag ``n``.
+
+        Test is passed if the storage is empty afterwards.
+        """
+        db = SQLiteStorage(self.db_file)
+        self.fill(db)
+        db.close()
+        db = SQLiteStorage(self.db_file, flag='n')
+        self.assertEqual(len(db), 0)
+        self.assertEqual(db.query_entries(), [])
+        db.close()
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Migrate a storage keyed by Base64 encoded URIs and ids with :py:func:`~magrathea.core.storage.migrate_keys`.
+
+        Test is passed if feeds and entries are keyed by compact keys afterwards and a feed can be restored by its key.
+        """
+        feed = self.feeds[0]
+        ids = [entry.id for entry in feed.entries_asc]
+        for backend in ('shelve', 'sqlite'):
+            db = open_storage(self.db_file, backend=backend, flag='n')
+            legacy_key = str(base64.b64encode(feed.uri.encode('ascii')).decode('ascii'))
+            entries = feed.entries_asc
+            for entry, legacy_id in zip(entries, [b'dXJuOm1hZ3JhdGhlYTp0ZXN0OjE=', b'dXJuOm1hZ3JhdGhlYTp0ZXN0OjI=']):
+                entry._id = legacy_id
+            db[STATE_PREFIX + legacy_key] = {'uri': feed.uri, 'hash': 'abc'}
+            db[ENTRIES_PREFIX + legacy_key] = entries
+            self.assertEqual(migrate_keys(db), 1)
+            self.assertEqual(migrate_keys(db), 0)
+            self.assertIn(KEY_SCHEME_KEY, db)
+            self.assertNotIn(STATE_PREFIX + legacy_key, db)
+            self.assertNotIn(ENTRIES_PREFIX + legacy_key, db)
+            restored = Feed(key=feed.key, cache=db)
+            self.assertEqual(restored.uri, feed.uri)
+            self.assertEqual([entry.id for entry in restored._entries], ids)
+            db.close()
@@ -130,3 +130,22 @@ class TestMagratheaCoreTemplate(TestCase):
                 flag = flag and os.path.exists(os.path.join(obj.path, _filter(binary)))
         shutil.rmtree(td)
         self.assertTrue(flag)
+
+    def test_08(self):
+        """
+        Test Case 08:
+        Deploy the planet template into a temporary directory and read the planet configuration file.
+
+        Test is passed if all planet-wide settings are present, set to their default values.
+        """
+        td = tempfile.mkdtemp()
+        obj = Template(template='planet', path=td)
+        obj.deploy()
+        cp = CompConfigParser()
+        with comp_open(os.path.join(td, get_conf('DEFAULT_PLANET_CONF_FILE')), mode='r') as fp:
+            cp.read_string(fp.read())
+        shutil.rmtree(td)
+        settings = cp.defaults()
+        for name in ('THEME', 'POLICY', 'LIMIT', 'PAGINATE', 'THEME_DIR', 'BUILD_DIR', 'CACHE_FILE', 'CACHE_BACKEND'):
+            key = get_conf('DEFAULT_PLANET_CONF_{}_KEY'.format(name))
+            self.assertEqual(settings.get(key), str(get_conf('DEFAULT_PLANET_CONF_{}_VAL'.format(name))), key)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.test_theme
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from magrathea.core.build import Builder, paginate
+from magrathea.core.exceptions import RenderError
+from magrathea.core.theme import Theme
+from .test_timeline import make_feed
+
+
+class TestMagratheaCoreTheme(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.core.theme`
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.theme_dir = os.path.join(self.directory, 'themes')
+        self.cache_dir = os.path.join(self.directory, 'cache')
+        os.makedirs(os.path.join(self.theme_dir, 'custom'))
+        with open(os.path.join(self.theme_dir, 'custom', 'base.html'), 'w') as fp:
+            fp.write('custom:{% block content %}{% endblock %}')
+        feed = make_feed('a', ['2014-03-31T10:00:00Z', '2014-03-20T10:00:00Z'])
+        self.page = paginate(feed.entries_desc, 25)[0]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Render a page with the default :py:class:`~magrathea.core.theme.Theme`.
+
+        Test is passed if the page holds all entries, and compiled templates are kept in the cache directory.
+        """
+        theme = Theme(theme_dir=self.theme_dir, cache_dir=self.cache_dir)
+        content = theme.render(self.page)
+        self.assertIn('a-2014-03-31T10:00:00Z', content)
+        self.assertIn('a-2014-03-20T10:00:00Z', content)
+        self.assertTrue(os.listdir(self.cache_dir))
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Render a page with a custom :py:class:`~magrathea.core.theme.Theme` overriding a single template.
+
+        Test is passed if the custom template is used along with the default ones.
+        """
+        theme = Theme(name='custom', theme_dir=self.theme_dir)
+        content = theme.render(self.page)
+        self.assertTrue(content.startswith('custom:'))
+        self.assertIn('a-2014-03-31T10:00:00Z', content)
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Create :py:class:`~magrathea.core.theme.Theme` objects for the same and for an unknown theme.
+
+        Test is passed if equal themes share their environment, and an unknown theme raises :py:exc:`ValueError`.
+        """
+        first = Theme(name='custom', theme_dir=self.theme_dir, cache_dir=self.cache_dir)
+        second = Theme(name='custom', theme_dir=self.theme_dir, cache_dir=self.cache_dir)
+        self.assertIs(first.environment, second.environment)
+        self.assertEqual(first.signature, second.signature)
+        self.assertNotEqual(first.signature, Theme(theme_dir=self.theme_dir).signature)
+        with self.assertRaises(ValueError):
+            Theme(name='missing', theme_dir=self.theme_dir)
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Render a page with a :py:class:`~magrathea.core.theme.Theme` holding a broken template, both directly
+        and by a :py:class:`~magrathea.core.build.Builder`.
+
+        Test is passed if rendering raises :py:exc:`~magrathea.core.exceptions.RenderError` naming the page,
+        and the build fails without raising an exception.
+        """
+        os.makedirs(os.path.join(self.theme_dir, 'broken'))
+        with open(os.path.join(self.theme_dir, 'broken', 'page.html'), 'w') as fp:
+            fp.write('{% for entry in entries %}')
+        theme = Theme(name='broken', theme_dir=self.theme_dir)
+        with self.assertRaises(RenderError) as context:
+            theme.render(self.page)
+        self.assertIn(self.page.name, str(context.exception))
+        result = Builder(os.path.join(self.directory, 'build'), theme).build(self.page.entries)
+        self.assertFalse(result)
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Render a page with a custom :py:class:`~magrathea.core.theme.Theme`, change one of its templates
+        and render the page again within the same process.
+
+        Test is passed if the theme's signature changes and the changed template is used.
+        """
+        theme = Theme(name='custom', theme_dir=self.theme_dir, cache_dir=self.cache_dir)
+        signature = theme.signature
+        self.assertTrue(theme.render(self.page).startswith('custom:'))
+        path = os.path.join(self.theme_dir, 'custom', 'base.html')
+        with open(path, 'w') as fp:
+            fp.write('changed:{% block content %}{% endblock %}')
+        mtime = os.path.getmtime(path) + 10
+        os.utime(path, (mtime, mtime))
+        changed = Theme(name='custom', theme_dir=self.theme_dir, cache_dir=self.cache_dir)
+        self.assertNotEqual(changed.signature, signature)
+        self.assertTrue(changed.render(self.page).startswith('changed:'))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_core.test_timeline
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import calendar
+from unittest import TestCase
+from magrathea.core.feed.feed import Feed
+from magrathea.core.feed.fetch import Response
+from magrathea.core.timeline import Timeline, merge, get_cutoff_key
+
+#: Reference time of all tests: 2014-03-31T12:00:00Z
+NOW = calendar.timegm((2014, 3, 31, 12, 0, 0, 0, 0, 0))
+
+
+def make_feed(name, dates):
+    """
+    Create a feed holding one entry per date
+
+    :param str name:  name of the feed, used for its URI and the entries' titles
+    :param dates:     list of ISO 8601 dates
+    :returns: an updated :py:class:`~magrathea.core.feed.feed.Feed` instance
+    """
+    entries = []
+    for index, date in enumerate(dates):
+        entries.append(
+            '<entry><id>urn:{name}:{index}</id><title>{name}-{date}</title>'
+            '<updated>{date}</updated></entry>'.format(name=name, index=index, date=date)
+        )
+    document = '<?xml version="1.0" encoding="utf-8"?>' \
+               '<feed xmlns="http://www.w3.org/2005/Atom"><title>{name}</title>{entries}</feed>'.format(
+                   name=name,
+                   entries=''.join(entries)
+               )
+    feed = Feed(uri='http://example.org/{}.xml'.format(name))
+    feed.update_from_response(Response(200, {}, document.encode('utf-8'), feed.uri))
+    return feed
+
+
+class TestMagratheaCoreTimeline(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.core.timeline`
+    """
+
+    def setUp(self):
+        self.feeds = [
+            make_feed('a', ['2014-03-31T10:00:00Z', '2014-03-20T10:00:00Z', '2014-01-15T10:00:00Z']),
+            make_feed('b', ['2014-03-31T11:00:00Z', '2014-03-30T10:00:00Z', '2013-12-24T10:00:00Z']),
+            make_feed('c', [])
+        ]
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Merge the entries of several feeds with :py:func:`~magrathea.core.timeline.merge`.
+
+        Test is passed if all entries are returned in descending order.
+        """
+        entries = list(merge([feed.iter_entries(reverse=True) for feed in self.feeds]))
+        self.assertEqual(len(entries), 6)
+        keys = [entry.key for entry in entries]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Apply the ``global`` and ``none`` policies.
+
+        Test is passed if the latest *limit* entries of all feeds, respectively all entries, are returned.
+        """
+        titles = [entry.title for entry in Timeline(self.feeds, policy='global', limit=3)]
+        self.assertEqual(titles, ['b-2014-03-31T11:00:00Z', 'a-2014-03-31T10:00:00Z', 'b-2014-03-30T10:00:00Z'])
+        self.assertEqual(len(list(Timeline(self.feeds, policy='none'))), 6)
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Apply the ``local`` policy.
+
+        Test is passed if the latest *limit* entries of each feed are returned in descending order.
+        """
+        titles = [entry.title for entry in Timeline(self.feeds, policy='local', limit=1)]
+        self.assertEqual(titles, ['b-2014-03-31T11:00:00Z', 'a-2014-03-31T10:00:00Z'])
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Apply the time based policies.
+
+        Test is passed if only entries published within the given time span are returned.
+        """
+        self.assertEqual(len(list(Timeline(self.feeds, policy='hours', limit=3, now=NOW))), 2)
+        self.assertEqual(len(list(Timeline(self.feeds, policy='days', limit=2, now=NOW))), 3)
+        self.assertEqual(len(list(Timeline(self.feeds, policy='weeks', limit=2, now=NOW))), 4)
+        self.assertEqual(len(list(Timeline(self.feeds, policy='months', limit=3, now=NOW))), 5)
+
+    def test_05(self):
+        """
+        Test Case 05:
+        Compute cutoff keys with :py:func:`~magrathea.core.timeline.get_cutoff_key`.
+
+        Test is passed if calendar months are subtracted correctly, also across years.
+        """
+        self.assertEqual(get_cutoff_key('hours', 12, NOW), '20140331000000')
+        self.assertEqual(get_cutoff_key('months', 1, NOW), '20140231120000')
+        self.assertEqual(get_cutoff_key('months', 3, NOW), '20131231120000')
+        with self.assertRaises(ValueError):
+            get_cutoff_key('global', 1, NOW)
+
+    def test_06(self):
+        """
+        Test Case 06:
+        Create a :py:class:`~magrathea.core.timeline.Timeline` with an unknown policy.
+
+        Test is passed if :py:exc:`ValueError` is raised.
+        """
+        with self.assertRaises(ValueError):
+            Timeline(self.feeds, policy='forever')
@@ -14,7 +14,7 @@ import tempfile
 import stat
 from unittest import TestCase
 from magrathea.conf import get_conf
-from magrathea.utils.compat import comp_makedirs, comp_open, CompConfigParser
+from magrathea.utils.compat import comp_makedirs, comp_open, comp_replace, CompConfigParser
 from magrathea.utils.convert import to_bytes
 
 
@@ -163,3 +163,23 @@ class TestMagratheaUtilsCompat(TestCase):
         self.assertTrue(obj.has_section('test'))
         self.assertTrue(obj.has_option('test', 'foo'))
         self.assertEqual(obj.get('test', 'foo'), 'bar')
+
+    def test_10(self):
+        """
+        Test Case 10:
+        Replace an existing file with :py:func:`magrathea.utils.compat.comp_replace`.
+
+        Test is passed if the target holds the source's content and the source is gone.
+        """
+        td = tempfile.mkdtemp()
+        src = os.path.join(td, 'src')
+        dst = os.path.join(td, 'dst')
+        for name, content in ((src, 'new'), (dst, 'old')):
+            with comp_open(name, 'w') as fd:
+                fd.write(content)
+        comp_replace(src, dst)
+        with comp_open(dst, 'r') as fd:
+            result = fd.read()
+        shutil.rmtree(td)
+        self.assertEqual(result, 'new')
+        self.assertFalse(os.path.exists(src))
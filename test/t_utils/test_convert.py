@@ -8,7 +8,7 @@
 """
 from unittest import TestCase, skipIf
 import sys
-from magrathea.utils.convert import to_bytes, to_str
+from magrathea.utils.convert import to_bytes, to_str, to_bytes_list, to_str_list
 
 
 class TestMagratheaUtilsConvert(TestCase):
@@ -281,3 +281,24 @@ class TestMagratheaUtilsConvert(TestCase):
         test_bytes = [1, 2, 3]
         self.assertIsInstance(to_str(test_bytes), unicode)
         self.assertSequenceEqual(to_str(test_bytes), test_string)
+
+    def test_22(self):
+        """
+        Test Case 22:
+        Convert a list of mixed values into strings in one batch.
+
+        Test is passed if the result equals converting each value separately.
+        """
+        values = [u'Größe', u'Größe'.encode('utf-8'), bytearray(b'abc'), None, 42, [1, 2]]
+        self.assertEqual(to_str_list(values), [to_str(value) for value in values])
+        self.assertEqual(to_str_list(iter(values)), [to_str(value) for value in values])
+
+    def test_23(self):
+        """
+        Test Case 23:
+        Convert a list of mixed values into byte sequences in one batch.
+
+        Test is passed if the result equals converting each value separately.
+        """
+        values = [u'Größe', u'Größe'.encode('utf-8'), bytearray(b'abc'), None, 42]
+        self.assertEqual(to_bytes_list(values), [to_bytes(value) for value in values])
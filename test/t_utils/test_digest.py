@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_utils.test_digest
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import string
+from unittest import TestCase
+from magrathea.utils.digest import compact_key
+
+
+class TestMagratheaUtilsDigest(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.utils.digest`
+    """
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Get compact keys of values of different length and type.
+
+        Test is passed if all keys are printable byte sequences of 16 characters.
+        """
+        printable = set(string.ascii_letters + string.digits + '-_')
+        for value in ('', 'http://example.org/feed.xml', 'x' * 4096, b'bytes', 42):
+            key = compact_key(value)
+            self.assertIsInstance(key, bytes)
+            self.assertEqual(len(key), 16)
+            self.assertTrue(set(key.decode('ascii')) <= printable)
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Get compact keys of equal and different values.
+
+        Test is passed if equal values, whether strings or byte sequences, share their key, and different values don't.
+        """
+        self.assertEqual(compact_key('http://example.org/'), compact_key(b'http://example.org/'))
+        self.assertNotEqual(compact_key('http://example.org/a'), compact_key('http://example.org/b'))
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Get the compact key of a fixed URI.
+
+        Test is passed if the key equals the key pinned here, which must never change, since keys are stored.
+        """
+        self.assertEqual(compact_key('http://example.org/feed.xml'), b'E9DtrUcZHgajyRtW')
@@ -138,3 +138,74 @@ class TestMagratheaUtilsDynamic(TestCase):
             result = False
         self.assertTrue(result)
         self.assertEqual(result, 'bar')
+
+    def test_11(self):
+        """
+        Test Case 11:
+        Insert many items into a DynamicIterable object.
+
+        Test is passed if all items are accessible as attributes, while the class remains unchanged.
+        """
+        class_dict = dict(DynamicIterable.__dict__)
+        obj = DynamicIterable()
+        for number in range(1000):
+            obj['item{}'.format(number)] = number
+        self.assertEqual(obj.item999, 999)
+        self.assertEqual(dict(DynamicIterable.__dict__), class_dict)
+        self.assertFalse(hasattr(DynamicIterable(), 'item999'))
+
+    def test_12(self):
+        """
+        Test Case 12:
+        Set attributes of a DynamicIterable object.
+
+        Test is passed if existing items are updated via hooks, while other attributes do not create items.
+        """
+        def my_hook(key, value):
+            return key, value * 2
+
+        obj = DynamicIterable({'test': 1})
+        obj.register_hook('pre-set', my_hook)
+        obj.test = 2
+        self.assertEqual(obj['test'], 4)
+        obj.other = 3
+        self.assertEqual(obj.other, 3)
+        self.assertNotIn('other', obj)
+
+    def test_13(self):
+        """
+        Test Case 13:
+        Instantiate two Dynamic objects with different payload data.
+
+        Test is passed if each object only offers the properties of its own payload.
+        """
+        obj1 = Dynamic(first=1)
+        obj2 = Dynamic(second=2)
+        self.assertEqual(obj1.first, 1)
+        self.assertEqual(obj2.second, 2)
+        self.assertFalse(hasattr(obj1, 'second'))
+        self.assertFalse(hasattr(obj2, 'first'))
+
+    def test_14(self):
+        """
+        Test Case 14:
+        Register several hooks of the same type within a DynamicIterable object.
+
+        Test is passed if all hooks are run in the order of their registration.
+        """
+        calls = []
+
+        def first_hook(key, value):
+            calls.append('first')
+            return key + '_first', value
+
+        def second_hook(key, value):
+            calls.append('second')
+            return key + '_second', value
+
+        obj = DynamicIterable()
+        obj.register_hook('pre-set', first_hook)
+        obj.register_hook('pre-set', second_hook)
+        obj['test'] = 123
+        self.assertEqual(calls, ['first', 'second'])
+        self.assertIn('test_first_second', obj)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_utils.test_lru
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import threading
+from unittest import TestCase
+from magrathea.utils.lru import LRUDict
+
+
+class TestMagratheaUtilsLru(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.utils.lru`
+    """
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Insert more items into a :py:class:`~magrathea.utils.lru.LRUDict` than its limit allows.
+
+        Test is passed if the oldest items are evicted and counted.
+        """
+        lru = LRUDict(limit=3)
+        for number in range(5):
+            lru[number] = number
+        self.assertEqual(list(lru.keys()), [2, 3, 4])
+        self.assertEqual(lru.evictions, 2)
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Touch and update items of a full :py:class:`~magrathea.utils.lru.LRUDict`.
+
+        Test is passed if touched and updated items survive the next insert.
+        """
+        lru = LRUDict(limit=3)
+        for number in range(3):
+            lru[number] = number
+        lru.touch(0)
+        lru[1] = 'one'
+        lru[3] = 3
+        self.assertEqual(list(lru.keys()), [0, 1, 3])
+        self.assertEqual(lru[1], 'one')
+        self.assertEqual(lru.evictions, 1)
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Insert many items into a :py:class:`~magrathea.utils.lru.LRUDict` without limit.
+
+        Test is passed if no item is evicted.
+        """
+        lru = LRUDict()
+        for number in range(1000):
+            lru[number] = number
+        self.assertEqual(len(lru), 1000)
+        self.assertEqual(lru.evictions, 0)
+        self.assertIsNone(lru.limit)
+
+    def test_04(self):
+        """
+        Test Case 04:
+        Insert and touch items of a full :py:class:`~magrathea.utils.lru.LRUDict` from several threads,
+        serialised by a lock. Each thread touches its own item some time after inserting it.
+
+        Test is passed if touching items evicted meanwhile by other threads reports them missing
+        instead of raising an exception.
+        """
+        lru = LRUDict(limit=2)
+        lock = threading.Lock()
+        errors = []
+        found = []
+
+        def work(offset):
+            try:
+                for number in range(2000):
+                    with lock:
+                        lru[(offset, number)] = number
+                    with lock:
+                        found.append(lru.touch((offset, number)))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(found), 16000)
+        self.assertFalse(lru.touch('missing'))
+        self.assertLessEqual(len(lru), 2)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_utils.test_metrics
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+from unittest import TestCase
+from magrathea.utils.metrics import Metrics
+
+
+class TestMagratheaUtilsMetrics(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.utils.metrics`
+    """
+
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Pass spans and timed functions of a disabled :py:class:`~magrathea.utils.metrics.Metrics` registry.
+
+        Test is passed if nothing is recorded.
+        """
+        with self.metrics.span('render'):
+            pass
+        self.assertEqual(self.metrics.timed('fetch')(lambda value: value * 2)(21), 42)
+        self.assertEqual(self.metrics.phases, [])
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Pass spans and timed functions of an enabled :py:class:`~magrathea.utils.metrics.Metrics` registry.
+
+        Test is passed if counts, totals and histograms are recorded per phase, even if an exception is raised.
+        """
+        self.metrics.enabled = True
+
+        @self.metrics.timed('fetch')
+        def fetch():
+            raise IOError('gone')
+
+        for __ in range(3):
+            with self.metrics.span('render'):
+                pass
+        with self.assertRaises(IOError):
+            fetch()
+        self.metrics.record('parse', 0.05)
+        self.assertEqual([phase.name for phase in self.metrics.phases], ['fetch', 'parse', 'render'])
+        fetch_phase, parse_phase, render_phase = self.metrics.phases
+        self.assertEqual(fetch_phase.count, 1)
+        self.assertEqual(render_phase.count, 3)
+        self.assertEqual(sum(render_phase.histogram), 3)
+        self.assertEqual(parse_phase.histogram, [0, 0, 0, 1, 0, 0, 0])
+        self.assertAlmostEqual(parse_phase.mean, 0.05)
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Report and reset the phases of a :py:class:`~magrathea.utils.metrics.Metrics` registry.
+
+        Test is passed if the report holds one line per phase, and no phase is left after the reset.
+        """
+        self.metrics.record('render', 0.002)
+        self.metrics.record('fetch', 1.5)
+        lines = self.metrics.report().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('fetch'))
+        self.assertEqual(lines[2].split()[:2], ['render', '1'])
+        self.metrics.reset()
+        self.assertEqual(self.metrics.phases, [])
@@ -45,6 +45,17 @@ class NewStyleClassWithArgs(object):
             self.test = kwargs['test']
 
 
+@Singleton
+class FalsyClass(object):
+    """New style class whose instances evaluate to false"""
+
+    def __init__(self, *args, **kwargs):
+        self.test = kwargs.get('test')
+
+    def __len__(self):
+        return 0
+
+
 class TestMagratheaUtilsSingleton(TestCase):
     """
     Unit tests for :py:mod:`magrathea.utils.singleton`
@@ -155,3 +166,16 @@ class TestMagratheaUtilsSingleton(TestCase):
         obj1 = NewStyleClassWithArgs.get_instance(test='foo')
         obj2 = NewStyleClassWithArgs.get_instance(test='bar')
         self.assertEqual(obj2.test, 'foo')
+
+    def test_11(self):
+        """
+        Test Case 11:
+        Get the instance of a decorated class whose instances evaluate to false.
+
+        Test is passed if the instance is created once and reported by ``has_instance`` afterwards.
+        """
+        self.assertFalse(FalsyClass.has_instance())
+        obj1 = FalsyClass.get_instance(test='foo')
+        obj2 = FalsyClass.get_instance(test='bar')
+        self.assertIs(obj1, obj2)
+        self.assertTrue(FalsyClass.has_instance())
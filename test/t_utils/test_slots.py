@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+    test.t_utils.test_slots
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by the RootForum.org team, see AUTHORS.
+    :license: MIT License, see LICENSE for details.
+"""
+import pickle
+from unittest import TestCase
+from magrathea.utils.slots import Slotted
+
+
+class Point(Slotted):
+    """Slotted object for testing purposes"""
+
+    __slots__ = ('x', 'y', 'z')
+
+    _transient = ('z',)
+
+    def __init__(self, x, y, z=None):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class TestMagratheaUtilsSlots(TestCase):
+    """
+    Unit tests for :py:mod:`magrathea.utils.slots`
+    """
+
+    def test_01(self):
+        """
+        Test Case 01:
+        Pickle and unpickle a :py:class:`~magrathea.utils.slots.Slotted` object with all protocols.
+
+        Test is passed if the object has no ``__dict__`` and its attributes survive the round trip.
+        """
+        point = Point(1, 'two', [3])
+        self.assertFalse(hasattr(point, '__dict__'))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(point, protocol))
+            self.assertEqual((copy.x, copy.y), (1, 'two'))
+
+    def test_02(self):
+        """
+        Test Case 02:
+        Restore a :py:class:`~magrathea.utils.slots.Slotted` object from a short tuple and a dictionary state.
+
+        Test is passed if known attributes are restored and missing ones are set to ``None``.
+        """
+        point = Point.__new__(Point)
+        point.__setstate__((1, 2))
+        self.assertEqual((point.x, point.y, point.z), (1, 2, None))
+        point = Point.__new__(Point)
+        point.__setstate__({'x': 1, 'z': 3, 'unknown': 4})
+        self.assertEqual((point.x, point.y, point.z), (1, None, 3))
+
+    def test_03(self):
+        """
+        Test Case 03:
+        Pickle a :py:class:`~magrathea.utils.slots.Slotted` object with a transient attribute.
+
+        Test is passed if the transient attribute is unpickled as ``None``.
+        """
+        point = Point(1, 2, {'cached': True})
+        copy = pickle.loads(pickle.dumps(point))
+        self.assertEqual((copy.x, copy.y, copy.z), (1, 2, None))
+        self.assertEqual(point.z, {'cached': True})